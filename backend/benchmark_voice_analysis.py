@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark per-frame cost of voice-likeness analysis before and after VoiceAnalyzer"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.voice_analysis import VoiceAnalyzer
+
+FRAME_SAMPLES = 240  # 30ms at 8kHz
+ITERATIONS = 3000
+
+
+def legacy_is_voice_like(frame: bytes) -> bool:
+    """Original per-frame implementation (numpy import, rfftfreq and band masks on every call)"""
+    import numpy as np
+
+    audio_data = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+    energy = np.mean(audio_data ** 2)
+    if energy < 500:
+        return False
+    if energy > 50000000:
+        return False
+    max_amplitude = np.max(np.abs(audio_data))
+    if max_amplitude > 28000:
+        return False
+    zero_crossings = np.sum(np.diff(np.sign(audio_data)) != 0)
+    zcr = zero_crossings / len(audio_data)
+    if zcr < 0.02 or zcr > 0.4:
+        return False
+    fft = np.fft.rfft(audio_data)
+    freqs = np.fft.rfftfreq(len(audio_data), 1/8000)
+    magnitude = np.abs(fft)
+    fundamental = np.sum(magnitude[(freqs >= 85) & (freqs <= 255)])
+    formant1 = np.sum(magnitude[(freqs >= 300) & (freqs <= 900)])
+    formant2 = np.sum(magnitude[(freqs >= 900) & (freqs <= 2500)])
+    formant3 = np.sum(magnitude[(freqs >= 2500) & (freqs <= 3400)])
+    total_energy = np.sum(magnitude)
+    if total_energy == 0:
+        return False
+    voice_ratio = (fundamental + formant1 + formant2 + formant3) / total_energy
+    high_freq_ratio = np.sum(magnitude[freqs > 3400]) / total_energy
+    low_freq_ratio = np.sum(magnitude[freqs < 85]) / total_energy
+    spectral_centroid = np.sum(freqs * magnitude) / total_energy
+    return (voice_ratio > 0.4 and high_freq_ratio < 0.4 and
+            low_freq_ratio < 0.3 and 500 < spectral_centroid < 2500)
+
+
+def make_frames(count: int) -> np.ndarray:
+    """Voiced test frames (harmonics plus noise) that pass the cheap energy/ZCR gates"""
+    rng = np.random.default_rng(0)
+    t = np.arange(FRAME_SAMPLES) / 8000
+    frames = np.empty((count, FRAME_SAMPLES), dtype=np.int16)
+    for i in range(count):
+        pitch = rng.uniform(100, 250)
+        signal = sum(rng.uniform(500, 3000) / h * np.sin(2 * np.pi * pitch * h * t) for h in range(1, 8))
+        frames[i] = np.clip(signal + rng.normal(0, 100, FRAME_SAMPLES), -32768, 32767)
+    return frames
+
+
+def per_frame_us(func, frames: np.ndarray, batch_size: int) -> float:
+    """Average microseconds per frame"""
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        func(frames[i:i + batch_size])
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def main():
+    print("Voice analysis benchmark")
+    print("="*50)
+
+    frames = make_frames(ITERATIONS)
+    frame_bytes = [frame.tobytes() for frame in frames]
+    analyzer = VoiceAnalyzer(FRAME_SAMPLES, 8000)
+
+    # Decisions must be identical
+    legacy = np.array([legacy_is_voice_like(frame) for frame in frame_bytes])
+    assert np.array_equal(legacy, analyzer.voice_like(frames)), "Decisions differ"
+    print(f"✓ Identical decisions ({legacy.mean() * 100:.0f}% voice-like)")
+
+    start = time.perf_counter()
+    for frame in frame_bytes:
+        legacy_is_voice_like(frame)
+    legacy_us = (time.perf_counter() - start) / len(frame_bytes) * 1e6
+    print(f"\nBefore (per-frame _is_voice_like): {legacy_us:7.1f} µs/frame")
+
+    for batch_size in (1, 3, 8, 32):
+        cost = per_frame_us(analyzer.voice_like, frames, batch_size)
+        print(f"After  (VoiceAnalyzer, batch {batch_size:>2}):   {cost:7.1f} µs/frame ({legacy_us / cost:.1f}x)")
+
+    print("\n" + "="*50)
+
+
+if __name__ == "__main__":
+    main()
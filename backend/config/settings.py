@@ -27,6 +27,117 @@ CORS_ORIGINS = ["*"]  # Allow all origins (not secure, but as requested)
 VAD_CONFIG = {
     "min_speech_duration": 2400,  # 300ms minimum to avoid cutting off short utterances
     "pre_speech_buffer_size": 3200,  # 200ms to capture speech onset reliably
+    "accumulator_size": 16000,  # 1s of 8kHz 16-bit audio awaiting frame alignment
+}
+
+# Streaming transcription
+STREAMING_CONFIG = {
+    "upstream_packet_ms": min(max(int(os.getenv("UPSTREAM_PACKET_MS", "100")), 50), 200),  # Audio coalesced per Deepgram message (50-200ms)
+    "keepalive_interval_seconds": 5,  # KeepAlive control messages while no audio is streamed
+    "suspend_after_idle_seconds": float(os.getenv("STT_SUSPEND_AFTER_IDLE", "20")),  # Release the connection after this long without user speech
+}
+
+# Maximum wait for the final result after finalize() (seconds)
+DEEPGRAM_FINALIZE_TIMEOUT = float(os.getenv("DEEPGRAM_FINALIZE_TIMEOUT", "1.0"))
+
+# Pre-warmed Deepgram streaming connections
+DEEPGRAM_POOL_CONFIG = {
+    "warm_size": int(os.getenv("DEEPGRAM_POOL_SIZE", "2")),  # Idle connections kept ready
+    "max_age_seconds": 600,  # Recycle connections older than this
+    "health_check_interval": 10,  # Seconds between idle connection checks
+}
+
+# Per-session audio ingestion queue between the websocket reader and VAD
+INGEST_CONFIG = {
+    "max_queue_chunks": 64,  # ~5s of 85ms browser messages
+    "max_queue_bytes": 160000,  # 10s of 8kHz 16-bit audio, hard cap even during speech
+}
+
+# Shared VAD engine - batches frames from all sessions on a worker thread
+VAD_ENGINE_CONFIG = {
+    "enabled": os.getenv("VAD_ENGINE_ENABLED", "true").lower() == "true",
+    "max_queue_size": 1024,  # Pending submissions before sessions fall back to inline VAD
+    "max_batch_frames": 256,  # Frames evaluated per batch
+    "max_batch_latency_ms": 2.0,  # How long the worker waits to fill a batch
+}
+
+# Content-addressed TTS audio cache (memory LRU in front of a disk tier under AUDIO_DIR)
+TTS_CACHE_CONFIG = {
+    "enabled": os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true",
+    "memory_bytes": int(os.getenv("TTS_CACHE_MEMORY_MB", "32")) * 1024 * 1024,  # In-memory byte budget
+    "disk_bytes": int(os.getenv("TTS_CACHE_DISK_MB", "256")) * 1024 * 1024,  # On-disk size cap
+    "disk_dir": AUDIO_DIR / "cache",
+    "pin_seconds": 300,  # Files handed out as URLs survive disk eviction until fetched, at most this long
+}
+
+# Sentence-pipelined TTS for streamed responses
+TTS_PIPELINE_CONFIG = {
+    "max_parallel": int(os.getenv("TTS_MAX_PARALLEL", "2")),  # Segments synthesized ahead of playback
+    "first_clause_min_chars": 20,  # First segment may end at a clause once it is this long
+    "min_segment_chars": 40,  # Later sentences shorter than this are merged with the next
+    "max_segment_chars": 250,  # Run-on text is split at a clause/word boundary past this
+    # Server side of binary-frame audio delivery (tts_streaming in audio_config). The bundled
+    # frontend plays audio URLs only, so this stays off until a client that reads frames is deployed
+    "binary_streaming": os.getenv("TTS_BINARY_STREAMING", "false").lower() == "true",
+}
+
+# Pooled async ElevenLabs HTTP client
+ELEVENLABS_CLIENT_CONFIG = {
+    "base_url": os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io"),
+    "max_connections": 16,  # Pooled keep-alive connections
+    "warm_connections": int(os.getenv("ELEVENLABS_WARM_CONNECTIONS", "2")),  # Opened at startup
+    "keepalive_expiry": 60.0,  # Seconds an idle pooled connection is kept
+    "keep_warm_interval": 20.0,  # Ping while idle so connections stay open
+}
+
+# Text-in streaming TTS (one ElevenLabs stream-input websocket per assistant turn)
+TTS_STREAM_INPUT_CONFIG = {
+    "default_input": os.getenv("TTS_INPUT", "segments"),  # "segments" or "text_stream", per session via audio_config
+    "chunk_length_schedule": [50, 90, 120, 150],  # Characters ElevenLabs buffers before each generation
+}
+
+# Dedicated TTS scheduler shared by all sessions
+TTS_SCHEDULER_CONFIG = {
+    "max_concurrency": int(os.getenv("TTS_MAX_CONCURRENCY", "8")),  # Concurrent ElevenLabs requests
+    "reserved_slots": 2,  # Slots only greetings and first chunks may use
+}
+
+# Gemini streaming runs on its own worker threads, bridged to the event loop
+LLM_STREAM_CONFIG = {
+    "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "32")),  # Concurrent streaming calls
+    "max_queue": 64,  # Chunks buffered per call before the worker waits for the consumer
+}
+
+# Conversation history sent to the LLM: recent turns verbatim, older ones as a running summary
+CONVERSATION_MEMORY_CONFIG = {
+    "budget_tokens": int(os.getenv("CONVERSATION_BUDGET_TOKENS", "1000")),  # Verbatim recent messages
+    "summary_tokens": 250,  # Running summary of everything older
+    "min_recent_messages": 2,  # Always kept verbatim, even over budget
+}
+
+# Retrieval over agent knowledge (only the passages relevant to a turn go into the prompt)
+KNOWLEDGE_CONFIG = {
+    "inline_max_chars": 2000,  # Smaller knowledge bases are kept whole in the system instruction
+    "chunk_chars": 600,  # Passage size
+    "top_k": 4,  # Passages injected per turn
+    "bm25_k1": 1.2,
+    "bm25_b": 0.75,
+    "ingest_workers": int(os.getenv("KNOWLEDGE_INGEST_WORKERS", "2")),  # Processes parsing uploaded documents
+    "max_upload_bytes": 20 * 1024 * 1024,
+    "max_documents": 10,  # Per agent
+}
+
+# Pre-rendered clips that cover the silence before a response's first audio
+FILLER_CLIPS_CONFIG = {
+    "enabled": os.getenv("FILLER_CLIPS_ENABLED", "true").lower() == "true",
+    "phrases": {
+        "acknowledge": ["Mm-hmm.", "Okay."],  # Response is slow to start
+        "lookup": ["Let me check that.", "One moment."],  # Turn likely needs a lookup/tool call
+        "repeat": ["Sorry, could you repeat that?"],  # Speech could not be transcribed
+    },
+    "slow_first_audio": 0.8,  # Seconds without response audio before acknowledging
+    "lookup_keywords": ["check", "look up", "find", "search", "availability", "available", "book",
+                        "schedule", "status", "order", "account", "price", "how much"],
 }
 
 # Model Configuration
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Local stand-in for the ElevenLabs TTS API, for offline testing
+
+Run it directly and point the backend at it:
+
+    python fake_elevenlabs_server.py --port 8765
+    ELEVENLABS_BASE_URL=http://127.0.0.1:8765 ELEVENLABS_API_KEY=fake python main.py
+
+Audio is deterministic filler bytes derived from the request text.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+
+CHUNK_BYTES = 1024
+FIRST_BYTE_DELAY = 0.02  # Seconds before the first audio chunk
+CHUNK_DELAY = 0.005  # Seconds between audio chunks
+FAIL_AT_END = False  # Stream-input sessions error out at end of stream instead of speaking the remainder
+
+app = FastAPI(title="Fake ElevenLabs")
+app.state.requests = []
+
+
+def fake_audio(text: str) -> bytes:
+    """Deterministic audio bytes for text (~400 bytes per character, like 128kbps mp3)"""
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    return (seed * (len(text) * 400 // len(seed) + 1))[:len(text) * 400]
+
+
+@app.get("/v1/models")
+async def models():
+    return [{"model_id": "eleven_turbo_v2", "can_do_text_to_speech": True}]
+
+
+@app.post("/v1/text-to-speech/{voice_id}")
+async def text_to_speech(voice_id: str, request: Request):
+    body = await request.json()
+    app.state.requests.append(("convert", voice_id, body, dict(request.query_params)))
+    await asyncio.sleep(FIRST_BYTE_DELAY)
+    return Response(fake_audio(body["text"]), media_type="audio/mpeg")
+
+
+@app.post("/v1/text-to-speech/{voice_id}/stream")
+async def text_to_speech_stream(voice_id: str, request: Request):
+    body = await request.json()
+    app.state.requests.append(("stream", voice_id, body, dict(request.query_params)))
+    audio = fake_audio(body["text"])
+
+    async def chunks():
+        await asyncio.sleep(FIRST_BYTE_DELAY)
+        for offset in range(0, len(audio), CHUNK_BYTES):
+            yield audio[offset:offset + CHUNK_BYTES]
+            await asyncio.sleep(CHUNK_DELAY)
+
+    return StreamingResponse(chunks(), media_type="audio/mpeg")
+
+
+@app.websocket("/v1/text-to-speech/{voice_id}/stream-input")
+async def text_to_speech_stream_input(websocket: WebSocket, voice_id: str):
+    """Text-in streaming: buffers text per chunk_length_schedule and answers with base64 audio"""
+    await websocket.accept()
+    begin = json.loads(await websocket.receive_text())
+    session = {"begin": begin, "text": [], "spoken": []}
+    app.state.requests.append(("stream-input", voice_id, session, dict(websocket.query_params)))
+    schedule = begin.get("generation_config", {}).get("chunk_length_schedule", [50])
+    buffered = ""
+    generations = 0
+
+    async def send_audio(text):
+        await asyncio.sleep(FIRST_BYTE_DELAY)
+        session["spoken"].append(text)
+        await websocket.send_json({
+            "audio": base64.b64encode(fake_audio(text)).decode(),
+            "isFinal": None,
+            "alignment": {"chars": list(text), "charStartTimesMs": [i * 50 for i in range(len(text))],
+                          "charDurationsMs": [50] * len(text)},
+        })
+
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            text = message.get("text", "")
+            if text == "":
+                # End of stream: synthesize the remainder and finish
+                if FAIL_AT_END:
+                    await websocket.send_json({"message": "Internal server error", "error": "internal_error", "code": 1011})
+                    await websocket.close(code=1011)
+                    return
+                if buffered.strip():
+                    await send_audio(buffered)
+                await websocket.send_json({"audio": None, "isFinal": True})
+                await websocket.close()
+                return
+            session["text"].append(text)
+            buffered += text
+            if message.get("flush") or len(buffered) >= schedule[min(generations, len(schedule) - 1)]:
+                await send_audio(buffered)
+                buffered = ""
+                generations += 1
+    except WebSocketDisconnect:
+        session["disconnected"] = True
+
+
+class FakeElevenLabsServer:
+    """Runs the fake API on a background thread (for test scripts)"""
+
+    def __init__(self, port: int = 0):
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def requests(self):
+        return app.state.requests
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    print(f"Fake ElevenLabs API at http://127.0.0.1:{args.port}")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
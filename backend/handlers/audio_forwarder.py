@@ -0,0 +1,47 @@
+"""Coalescing upstream audio forwarder for streaming transcription"""
+from utils.helpers import timestamp
+
+
+class AudioForwarder:
+    """Forwards a growing utterance buffer upstream exactly once, in coalesced packets.
+
+    The forwarder remembers how many bytes of the utterance buffer have
+    already been sent, so every sample goes upstream once no matter how many
+    times the caller asks to forward. Audio is held back until at least one
+    packet's worth is pending, unless the caller flushes (e.g. at speech end).
+    """
+
+    def __init__(self, packet_bytes: int):
+        self.packet_bytes = packet_bytes
+        self.sent_offset = 0  # Bytes of the current utterance already sent
+
+        # Statistics (whole session)
+        self.bytes_sent = 0
+        self.messages_sent = 0
+
+    async def forward(self, transcriber, buffer: bytearray, flush: bool = False) -> bool:
+        """Send the unsent tail of buffer if a full packet is pending (or always when flushing).
+
+        Returns False if the send failed; the tail stays unsent so it can be
+        replayed on a new connection.
+        """
+        pending = len(buffer) - self.sent_offset
+        if pending <= 0 or (pending < self.packet_bytes and not flush):
+            return True
+        start = self.sent_offset
+        packet = bytes(memoryview(buffer)[start:])
+        self.sent_offset = len(buffer)
+        if not await transcriber.send_audio(packet):
+            self.sent_offset = start
+            return False
+        self.bytes_sent += len(packet)
+        self.messages_sent += 1
+        return True
+
+    def reset(self):
+        """Start tracking a new utterance"""
+        self.sent_offset = 0
+
+    def log_stats(self):
+        """Print forwarding statistics"""
+        print(f"{timestamp()} 📊 Upstream audio: {self.bytes_sent} bytes in {self.messages_sent} messages")
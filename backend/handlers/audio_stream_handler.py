@@ -1,12 +1,20 @@
 """Audio stream handler with Voice Activity Detection"""
 import asyncio
+import random
 import time
+from collections import deque
 from typing import Optional
 from fastapi import WebSocket
+import numpy as np
 import webrtcvad
-from config.settings import VAD_CONFIG
-from services.deepgram_service import DeepgramStreamingTranscriber
+from config.settings import INGEST_CONFIG, STREAMING_CONFIG, VAD_CONFIG
+from handlers.audio_forwarder import AudioForwarder
+from handlers.vad_engine import detect_speech, vad_engine
+from services.deepgram_service import deepgram_pool
+from utils.audio_buffer import AudioRingBuffer
 from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
+from utils.voice_analysis import VoiceAnalyzer
 
 
 class AudioStreamHandler:
@@ -18,6 +26,7 @@ class AudioStreamHandler:
         self.is_running = True
         self.is_listening_for_user = True
         self.interrupt_callback = None  # Callback for interruptions
+        self.unheard_callback = None  # Callback for speech that produced no transcript
         self.is_agent_speaking = False  # Track if agent audio is playing
         self.is_interrupting = False  # Track if user is interrupting agent
         
@@ -26,6 +35,8 @@ class AudioStreamHandler:
         # Use mode 2 for balanced speech detection (mode 3 can filter out valid speech)
         # Mode 2 provides good balance between filtering noise and preserving speech
         self.vad.set_mode(2)
+        # Shared batched VAD worker (None runs VAD inline on the event loop)
+        self.vad_engine = vad_engine
         
         # Voice Activity Detection parameters
         self.speech_buffer = bytearray()  # Buffer for current speech segment
@@ -39,13 +50,16 @@ class AudioStreamHandler:
         
         # Pre-speech circular buffer
         self.pre_speech_buffer_size = VAD_CONFIG["pre_speech_buffer_size"]
-        self.pre_speech_buffer = bytearray()
+        self.pre_speech_buffer = AudioRingBuffer(self.pre_speech_buffer_size)
         
         # WebRTC VAD frame configuration
         # WebRTC VAD works with 10, 20, or 30ms frames at 8, 16, 32, or 48 kHz
         self.frame_duration_ms = 30  # Use 30ms frames
         self.frame_size = int(8000 * self.frame_duration_ms / 1000) * 2  # bytes for 30ms at 8kHz, 16-bit
         
+        # Spectral analysis kernel precomputed for this frame size
+        self.voice_analyzer = VoiceAnalyzer(self.frame_size // 2, 8000)
+        
         # Adjusted thresholds for WebRTC VAD
         self.speech_start_frames = 2  # 60ms of speech to start (2 * 30ms)
         self.speech_prefetch_frames = 10  # ~300ms of silence (10 * 30ms) - not used anymore
@@ -54,8 +68,8 @@ class AudioStreamHandler:
         # Minimum speech duration
         self.min_speech_duration = VAD_CONFIG["min_speech_duration"]
         
-        # Audio accumulator for frame alignment
-        self.audio_accumulator = bytearray()
+        # Audio accumulator for frame alignment (frames are read as zero-copy views)
+        self.audio_accumulator = AudioRingBuffer(VAD_CONFIG["accumulator_size"], self.frame_size)
         
         # Remove speculative processing - keeping it simple
         # When VAD detects end of speech, we'll use whatever we have from Deepgram
@@ -64,29 +78,71 @@ class AudioStreamHandler:
         self.transcript_queue = asyncio.Queue()
         self.processing_task = None
         
+        # Audio ingestion queue - decouples websocket reads from VAD and upstream latency
+        self.ingest_queue = deque()
+        self.ingest_queue_bytes = 0
+        self.ingest_event = asyncio.Event()
+        self.max_ingest_chunks = INGEST_CONFIG["max_queue_chunks"]
+        self.max_ingest_bytes = INGEST_CONFIG["max_queue_bytes"]
+        self.ingest_stats = {
+            "max_depth": 0,
+            "dropped_chunks": 0,
+            "dropped_frames": 0,
+            "coalesced_chunks": 0,
+        }
+        
         # Performance tracking
         self.speech_start_time = None
         
         # Streaming transcription
         self.streaming_transcriber = None
         self.is_streaming = False
+        self.connect_task = None
+        self.idle_task = None
+        self.is_suspended = False  # Connection released after an idle period
+        self.last_user_activity = time.time()  # Last time user speech kept the connection busy
+        self.finalizing = False  # An utterance is being flushed and finalized - never suspend meanwhile
+        self.suspend_after_idle = STREAMING_CONFIG["suspend_after_idle_seconds"]
+        self.connect_lock = asyncio.Lock()  # Serializes borrowing a connection from the pool
+        # Upstream forwarding - each sample of the utterance is sent exactly once
+        self.audio_forwarder = AudioForwarder(STREAMING_CONFIG["upstream_packet_ms"] * 16)  # 16 bytes per ms at 8kHz 16-bit
         self.connection_retries = 0
         self.max_retries = 3
-        self.reconnect_delay = 1.0  # seconds
+        self.reconnect_delay = 0.2  # seconds, base of the jittered exponential backoff
+        self.reconnect_count = 0
+        self.reconnect_latency = LatencyHistogram("deepgram_reconnect")
         
     def set_interrupt_callback(self, callback):
         """Set the callback function for interruptions"""
         self.interrupt_callback = callback
         
+    def set_unheard_callback(self, callback):
+        """Set the callback function for speech that could not be transcribed"""
+        self.unheard_callback = callback
+        
     async def start(self):
         """Start the audio processing task"""
         self.processing_task = asyncio.create_task(self._process_audio_stream())
+        # Borrow a warm Deepgram connection now so the first utterance doesn't wait for the handshake
+        self.connect_task = asyncio.create_task(self._acquire_transcriber())
+        self.idle_task = asyncio.create_task(self._monitor_idle())
         
     async def stop(self):
         """Stop audio processing"""
         self.is_running = False
         if self.processing_task:
             self.processing_task.cancel()
+        if self.connect_task and not self.connect_task.done():
+            self.connect_task.cancel()
+        if self.idle_task:
+            self.idle_task.cancel()
+        print(f"{timestamp()} 📊 Audio ingest: max depth {self.ingest_stats['max_depth']}, "
+              f"dropped {self.ingest_stats['dropped_frames']} frames, coalesced {self.ingest_stats['coalesced_chunks']} chunks")
+        self.ingest_queue.clear()
+        self.ingest_queue_bytes = 0
+        self.audio_forwarder.log_stats()
+        if self.reconnect_count:
+            print(f"{timestamp()} 📊 Deepgram reconnects: {self.reconnect_count} ({self.reconnect_latency.summary()})")
         # Stop streaming transcription if active
         if self.is_streaming and self.streaming_transcriber:
             await self._stop_streaming_transcription()
@@ -101,276 +157,292 @@ class AudioStreamHandler:
             print(f"{timestamp()} ⚠️  Invalid audio data length: {len(audio_data)} bytes (not 16-bit aligned)")
             return
             
-        # Add incoming audio to accumulator
-        self.audio_accumulator.extend(audio_data)
-        
-        # Process accumulated audio in chunks suitable for WebRTC VAD
-        while len(self.audio_accumulator) >= self.frame_size:
-            # Extract frame
-            frame = bytes(self.audio_accumulator[:self.frame_size])
-            self.audio_accumulator = self.audio_accumulator[self.frame_size:]
-            
-            # Always add to pre-speech buffer (circular buffer)
-            self._add_to_pre_speech_buffer(frame)
-            
-            # Run WebRTC VAD on the frame
-            try:
-                is_speech = self.vad.is_speech(frame, 8000)
-            except Exception as e:
-                print(f"{timestamp()} ⚠️  VAD error: {e}")
-                is_speech = False
-            
-            # Voice Activity Detection logic using WebRTC VAD
-            if is_speech:
-                # Enhanced voice detection for interruption
-                is_voice_like = self._is_voice_like(frame)
-                
-                # --- INTERRUPTION DETECTION ---
-                if self.is_agent_speaking and not self.is_interrupting:
-                    if is_voice_like:
-                        # Voice-like audio detected, increment counter
-                        self.interruption_speech_counter += 1
-                        if self.interruption_speech_counter <= 3:  # Only log first few frames to avoid spam
-                            print(f"{timestamp()} 🎤 Voice-like audio detected ({self.interruption_speech_counter}/{self.min_interruption_frames})")
+        # Add incoming audio to accumulator, draining frames whenever it fills up
+        pending = memoryview(audio_data)
+        while len(pending) > 0:
+            written = self.audio_accumulator.write(pending)
+            pending = pending[written:]
+            await self._process_frames()
+    
+    async def _process_frames(self):
+        """Run VAD over every complete frame in the accumulator as one batch"""
+        # Views of all complete frames (valid until the accumulator is written again)
+        segments = self.audio_accumulator.read_frames()
+        if not segments:
+            return
+        frames = [segment[i:i + self.frame_size]
+                  for segment in segments
+                  for i in range(0, len(segment), self.frame_size)]
+        
+        # One 2D (frames x samples) view of the batch - only copies if the ring wrapped
+        if len(segments) == 1:
+            samples = np.frombuffer(segments[0], dtype=np.int16)
+        else:
+            samples = np.concatenate([np.frombuffer(segment, dtype=np.int16) for segment in segments])
+        samples = samples.reshape(len(frames), -1)
+        
+        is_speech, is_voice_like = await self._analyze_frames(samples)
+        
+        for frame, frame_is_speech, frame_is_voice_like in zip(frames, is_speech, is_voice_like):
+            await self._process_frame(frame, bool(frame_is_speech), bool(frame_is_voice_like))
+    
+    async def _analyze_frames(self, samples: np.ndarray):
+        """Return per-frame (is_speech, is_voice_like) flags, off the event loop when the shared engine is available"""
+        if self.vad_engine:
+            future = self.vad_engine.submit(self.vad, samples)
+            if future is not None:
+                return await future
+        
+        # Run WebRTC VAD on each frame (in order, the VAD keeps internal state)
+        is_speech = detect_speech(self.vad, samples, 8000)
+        
+        # Enhanced voice detection for interruption - vectorized over the speech frames
+        is_voice_like = np.zeros(len(is_speech), dtype=bool)
+        if is_speech.any():
+            is_voice_like[is_speech] = self._voice_like_frames(samples[is_speech])
+        return is_speech, is_voice_like
+    
+    async def _process_frame(self, frame: memoryview, is_speech: bool, is_voice_like: bool):
+        """Advance the speech/interruption state machine by one frame"""
+        # Always add to pre-speech buffer (circular buffer)
+        self._add_to_pre_speech_buffer(frame)
+        
+        # Voice Activity Detection logic using WebRTC VAD
+        if is_speech:
+            # --- INTERRUPTION DETECTION ---
+            if self.is_agent_speaking and not self.is_interrupting:
+                if is_voice_like:
+                    # Voice-like audio detected, increment counter
+                    self.interruption_speech_counter += 1
+                    if self.interruption_speech_counter <= 3:  # Only log first few frames to avoid spam
+                        print(f"{timestamp()} 🎤 Voice-like audio detected ({self.interruption_speech_counter}/{self.min_interruption_frames})")
+                    
+                    # Only interrupt after minimum voice-like duration
+                    if self.interruption_speech_counter >= self.min_interruption_frames:
+                        self.is_interrupting = True
+                        print(f"{timestamp()} 🛑 CONFIRMED voice activity - interrupting agent")
+                        print(f"{timestamp()} 📤 Sending stop_audio_immediately message to frontend")
                         
-                        # Only interrupt after minimum voice-like duration
-                        if self.interruption_speech_counter >= self.min_interruption_frames:
-                            self.is_interrupting = True
-                            print(f"{timestamp()} 🛑 CONFIRMED voice activity - interrupting agent")
-                            print(f"{timestamp()} 📤 Sending stop_audio_immediately message to frontend")
-                            
-                            # Send message to stop audio playback on the frontend
-                            await self.websocket.send_json({
-                                "type": "stop_audio_immediately", 
-                                "timestamp": time.time()
-                            })
-                            
-                            # Cancel backend tasks
-                            if self.interrupt_callback:
-                                await self.interrupt_callback()
+                        # Send message to stop audio playback on the frontend
+                        await self.websocket.send_json({
+                            "type": "stop_audio_immediately", 
+                            "timestamp": time.time()
+                        })
+                        
+                        # Cancel backend tasks
+                        if self.interrupt_callback:
+                            await self.interrupt_callback()
 
-                            # Notify frontend of the interruption
-                            await self.websocket.send_json({
-                                "type": "user_interruption",
-                                "timestamp": time.time()
-                            })
-                            
-                            # CRITICAL: Resume listening immediately so interrupting speech can be processed as new query
-                            self.is_listening_for_user = True
-                            print(f"{timestamp()} ▶️  Listening to interrupting speech (will process as new query)")
-                    else:
-                        # Not voice-like (could be banging, clicking, etc.), reset counter
-                        if self.interruption_speech_counter > 0:
-                            print(f"{timestamp()} 🔇 Non-voice audio detected (banging/clicking?) - resetting interruption counter")
-                        self.interruption_speech_counter = 0
-                elif self.is_agent_speaking and self.is_interrupting:
-                    # Already interrupting, continue processing
-                    pass
-                elif not self.is_agent_speaking:
-                    # Reset interruption counter when agent not speaking
-                    self.interruption_speech_counter = 0
+                        # Notify frontend of the interruption
+                        await self.websocket.send_json({
+                            "type": "user_interruption",
+                            "timestamp": time.time()
+                        })
+                        
+                        # CRITICAL: Resume listening immediately so interrupting speech can be processed as new query
+                        self.is_listening_for_user = True
+                        print(f"{timestamp()} ▶️  Listening to interrupting speech (will process as new query)")
                 else:
-                    print(f"{timestamp()} 🔍 DEBUG: Speech detected but no interruption (agent_speaking={self.is_agent_speaking}, interrupting={self.is_interrupting})")
+                    # Not voice-like (could be banging, clicking, etc.), reset counter
+                    if self.interruption_speech_counter > 0:
+                        print(f"{timestamp()} 🔇 Non-voice audio detected (banging/clicking?) - resetting interruption counter")
+                    self.interruption_speech_counter = 0
+            elif self.is_agent_speaking and self.is_interrupting:
+                # Already interrupting, continue processing
+                pass
+            elif not self.is_agent_speaking:
+                # Reset interruption counter when agent not speaking
+                self.interruption_speech_counter = 0
+            else:
+                print(f"{timestamp()} 🔍 DEBUG: Speech detected but no interruption (agent_speaking={self.is_agent_speaking}, interrupting={self.is_interrupting})")
 
-                # --- REGULAR SPEECH DETECTION ---
-                self.speech_counter += 1
-                self.silence_counter = 0
+            # --- REGULAR SPEECH DETECTION ---
+            self.speech_counter += 1
+            self.silence_counter = 0
+            
+            # Use faster detection for interruptions vs normal speech
+            required_frames = 1 if self.is_agent_speaking else self.speech_start_frames
+            
+            if not self.is_speaking and self.speech_counter >= required_frames:
+                # Start of speech detected
+                self.is_speaking = True
+                self.speech_start_time = time.time()
+                self.last_user_activity = self.speech_start_time
+                print(f"{timestamp()} 🎤 Speech started (WebRTC VAD)")
                 
-                # Use faster detection for interruptions vs normal speech
-                required_frames = 1 if self.is_agent_speaking else self.speech_start_frames
+                # User resumed speaking - clear any pending state
                 
-                if not self.is_speaking and self.speech_counter >= required_frames:
-                    # Start of speech detected
-                    self.is_speaking = True
-                    self.speech_start_time = time.time()
-                    print(f"{timestamp()} 🎤 Speech started (WebRTC VAD)")
-                    
-                    # User resumed speaking - clear any pending state
-                    
-                    # Add pre-speech buffer to capture beginning of speech
-                    self.speech_buffer.extend(self.pre_speech_buffer)
-                    
-                    # Start streaming transcription immediately
-                    if self.is_listening_for_user:
-                        # Start connection first
-                        await self._start_streaming_transcription()
-                        
-                        # Send audio immediately after connection is established
-                        if self.streaming_transcriber and self.is_streaming:
-                            print(f"{timestamp()} 🎤 Sending initial audio to Deepgram")
-                            # Send all accumulated audio (includes pre-speech buffer)
-                            if len(self.speech_buffer) > 0:
-                                await self.streaming_transcriber.send_audio(bytes(self.speech_buffer))
-                            # Send current frame
-                            await self.streaming_transcriber.send_audio(frame)
-                    
-                    await self.websocket.send_json({
-                        "type": "speech_start",
-                        "timestamp": time.time()
-                    })
+                # Add pre-speech buffer to capture beginning of speech
+                self.pre_speech_buffer.copy_to(self.speech_buffer)
                 
-                if self.is_speaking:
-                    # Add frame to speech buffer
-                    self.speech_buffer.extend(frame)
+                # Start streaming transcription immediately
+                if self.is_listening_for_user:
+                    # Start connection first
+                    await self._start_streaming_transcription()
                     
-                    # Stream audio to Deepgram in real-time
-                    if self.is_streaming and self.streaming_transcriber:
-                        await self.streaming_transcriber.send_audio(frame)
-            else:
-                # Silence detected - reset interruption counter
-                if self.interruption_speech_counter > 0:
-                    print(f"{timestamp()} 🔇 Silence detected - resetting interruption counter ({self.interruption_speech_counter} frames)")
-                self.interruption_speech_counter = 0
+                    # Send all accumulated audio (pre-speech buffer ends with the current frame)
+                    if self.streaming_transcriber and self.is_streaming:
+                        print(f"{timestamp()} 🎤 Sending initial audio to Deepgram")
+                        await self._forward_audio(flush=True)
+                
+                await self.websocket.send_json({
+                    "type": "speech_start",
+                    "timestamp": time.time()
+                })
+            
+            elif self.is_speaking:
+                # Add frame to speech buffer (the onset frame is already in the pre-speech copy)
+                self.speech_buffer.extend(frame)
                 
-                self.silence_counter += 1
-                self.speech_counter = 0
+                # Stream audio to Deepgram in real-time
+                await self._forward_audio()
+        else:
+            # Silence detected - reset interruption counter
+            if self.interruption_speech_counter > 0:
+                print(f"{timestamp()} 🔇 Silence detected - resetting interruption counter ({self.interruption_speech_counter} frames)")
+            self.interruption_speech_counter = 0
+            
+            self.silence_counter += 1
+            self.speech_counter = 0
+            
+            if self.is_speaking:
+                # Continue adding to buffer during short pauses
+                self.speech_buffer.extend(frame)
                 
-                if self.is_speaking:
-                    # Continue adding to buffer during short pauses
-                    self.speech_buffer.extend(frame)
-                    
-                    # Stream audio to Deepgram
-                    if self.is_streaming and self.streaming_transcriber:
-                        await self.streaming_transcriber.send_audio(frame)
-                    
-                    # Don't do speculative processing anymore - wait for VAD to confirm speech end
+                # Stream audio to Deepgram
+                await self._forward_audio()
+                
+                # Don't do speculative processing anymore - wait for VAD to confirm speech end
+                
+                # Confirm speech ended after ~800ms total silence
+                if self.silence_counter >= self.speech_confirm_frames:
+                    self.is_speaking = False
+                    self.speech_confirmed = True
+                    speech_duration = time.time() - self.speech_start_time
+                    print(f"{timestamp()} ✅ Speech confirmed ended (~300ms silence, duration: {speech_duration:.2f}s)")
                     
-                    # Confirm speech ended after ~800ms total silence
-                    if self.silence_counter >= self.speech_confirm_frames:
-                        self.is_speaking = False
-                        self.speech_confirmed = True
-                        speech_duration = time.time() - self.speech_start_time
-                        print(f"{timestamp()} ✅ Speech confirmed ended (~300ms silence, duration: {speech_duration:.2f}s)")
+                    # Process all speech as queries when listening for user input
+                    if self.is_listening_for_user and len(self.speech_buffer) > self.min_speech_duration:
+                        if self.is_interrupting:
+                            print(f"{timestamp()} 🔄 Processing interrupting speech as new query")
+                            self.is_interrupting = False
                         
-                        # Process all speech as queries when listening for user input
-                        if self.is_listening_for_user and len(self.speech_buffer) > self.min_speech_duration:
-                            if self.is_interrupting:
-                                print(f"{timestamp()} 🔄 Processing interrupting speech as new query")
-                                self.is_interrupting = False
-                            
-                            # Finalize streaming transcription
+                        # Finalize streaming transcription
+                        finalized, final_transcript = False, None
+                        self.finalizing = True
+                        try:
                             if self.is_streaming and self.streaming_transcriber:
+                                # Flush the rest of the utterance before asking for the final result (may reconnect)
+                                await self._forward_audio(flush=True)
+                            if self.is_streaming and self.streaming_transcriber:
+                                finalized = True
                                 final_transcript = await self.streaming_transcriber.finalize()
                                 # Don't stop the connection - keep it alive for next utterance
+                        finally:
+                            self.finalizing = False
+                            self.last_user_activity = time.time()
+                        if finalized:
+                            if final_transcript:
+                                print(f"{timestamp()} 🎯 Final streaming transcript: '{final_transcript}'")
                                 
-                                if final_transcript:
-                                    print(f"{timestamp()} 🎯 Final streaming transcript: '{final_transcript}'")
-                                    
-                                    await self._commit_transcript(final_transcript)
-                                else:
-                                    print(f"{timestamp()} ⚠️  No streaming transcript received")
-                                    await self.websocket.send_json({
-                                        "type": "error",
-                                        "message": "Failed to transcribe audio",
-                                        "timestamp": time.time()
-                                    })
+                                await self._commit_transcript(final_transcript)
                             else:
-                                # Streaming not active - fail fast
-                                print(f"{timestamp()} ❌ Streaming transcription not active - cannot process speech")
+                                print(f"{timestamp()} ⚠️  No streaming transcript received")
                                 await self.websocket.send_json({
                                     "type": "error",
-                                    "message": "Speech recognition unavailable",
+                                    "message": "Failed to transcribe audio",
                                     "timestamp": time.time()
                                 })
-                        elif self.is_interrupting:
-                            # Just reset interruption state if not listening
-                            print(f"{timestamp()} 🔇 Interruption speech ended - not listening for user input")
-                            self.is_interrupting = False
+                                if self.unheard_callback:
+                                    await self.unheard_callback()
                         else:
-                            print(f"{timestamp()} 🔇 Not listening for user input")
-                        
-                        # Clear state
-                        self.speech_buffer.clear()
-                        
-                        await self.websocket.send_json({
-                            "type": "speech_end",
-                            "timestamp": time.time()
-                        })
+                            # Streaming not active - fail fast
+                            print(f"{timestamp()} ❌ Streaming transcription not active - cannot process speech")
+                            await self.websocket.send_json({
+                                "type": "error",
+                                "message": "Speech recognition unavailable",
+                                "timestamp": time.time()
+                            })
+                    elif self.is_interrupting:
+                        # Just reset interruption state if not listening
+                        print(f"{timestamp()} 🔇 Interruption speech ended - not listening for user input")
+                        self.is_interrupting = False
+                    else:
+                        print(f"{timestamp()} 🔇 Not listening for user input")
+                    
+                    # Clear state
+                    self.speech_buffer.clear()
+                    self.audio_forwarder.reset()
+                    self.last_user_activity = time.time()
+                    
+                    await self.websocket.send_json({
+                        "type": "speech_end",
+                        "timestamp": time.time()
+                    })
+
+    async def _forward_audio(self, flush: bool = False):
+        """Send the unsent part of the current utterance to Deepgram in coalesced packets"""
+        self.last_user_activity = time.time()
+        if self.is_listening_for_user and self.is_suspended:
+            # Connection was suspended while idle - resume transparently (e.g. speech that interrupted the agent)
+            await self._acquire_transcriber()
+        if not (self.is_listening_for_user and self.is_streaming and self.streaming_transcriber):
+            return
+        # Connection dropped since the last send - reconnect and replay the unsent tail
+        if not self.streaming_transcriber.is_connected and not await self._reconnect_transcription():
+            return
+        if not await self.audio_forwarder.forward(self.streaming_transcriber, self.speech_buffer, flush):
+            if await self._reconnect_transcription():
+                await self.audio_forwarder.forward(self.streaming_transcriber, self.speech_buffer, flush=True)
+    
+    async def _reconnect_transcription(self) -> bool:
+        """Replace a dropped Deepgram connection, retrying with jittered exponential backoff.
+        
+        Text already recognised on the old connection is carried over so the
+        utterance still produces a full transcript once the unsent audio is replayed.
+        """
+        old_transcriber = self.streaming_transcriber
+        carried_transcript = old_transcriber.get_current_transcript() if old_transcriber else ""
+        self.streaming_transcriber = None
+        self.is_streaming = False
+        if old_transcriber:
+            await deepgram_pool.release(old_transcriber)
+        
+        start_time = time.time()
+        while self.connection_retries < self.max_retries:
+            self.connection_retries += 1
+            delay = self.reconnect_delay * (2 ** (self.connection_retries - 1)) * random.uniform(0.5, 1.5)
+            print(f"{timestamp()} 🔁 Reconnecting to Deepgram (attempt {self.connection_retries}/{self.max_retries}) in {delay * 1000:.0f}ms")
+            await asyncio.sleep(delay)
+            try:
+                if await self._acquire_transcriber():
+                    if carried_transcript:
+                        self.streaming_transcriber.transcript_buffer = carried_transcript + " "
+                    reconnect_time = time.time() - start_time
+                    self.reconnect_count += 1
+                    self.reconnect_latency.record(reconnect_time)
+                    self.connection_retries = 0
+                    print(f"{timestamp()} ✅ Deepgram reconnected in {reconnect_time:.2f}s - replaying {len(self.speech_buffer) - self.audio_forwarder.sent_offset} bytes")
+                    return True
+            except Exception as e:
+                print(f"{timestamp()} ⚠️  Reconnect attempt failed: {type(e).__name__}: {e}")
+        
+        print(f"{timestamp()} ❌ Deepgram reconnect failed after {self.max_retries} attempts")
+        self.connection_retries = 0
+        return False
     
     def _add_to_pre_speech_buffer(self, frame: bytes):
-        """Add frame to circular pre-speech buffer"""
-        self.pre_speech_buffer.extend(frame)
-        # Keep only the last 200ms of audio
-        if len(self.pre_speech_buffer) > self.pre_speech_buffer_size:
-            # Remove oldest data
-            self.pre_speech_buffer = self.pre_speech_buffer[-self.pre_speech_buffer_size:]
+        """Add frame to circular pre-speech buffer (keeps only the last 200ms of audio)"""
+        self.pre_speech_buffer.overwrite(frame)
     
-    def _is_voice_like(self, frame: bytes) -> bool:
-        """Enhanced voice detection using frequency analysis and energy patterns"""
-        import numpy as np
-        
+    def _voice_like_frames(self, samples: np.ndarray) -> np.ndarray:
+        """Vectorized voice detection for a (frames x samples) int16 array, one decision per frame"""
         try:
-            # Convert bytes to numpy array
-            audio_data = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
-            
-            # 1. Energy checks - voice should have moderate energy levels
-            energy = np.mean(audio_data ** 2)
-            if energy < 500:  # Increased minimum threshold to filter out quiet background noise
-                return False
-            if energy > 50000000:  # Too loud for normal voice
-                return False
-            
-            # 2. Check for reasonable amplitude range (voice is usually not clipping)
-            max_amplitude = np.max(np.abs(audio_data))
-            if max_amplitude > 28000:  # Close to clipping, likely not voice
-                return False
-            
-            # 3. Zero-crossing rate - voice has moderate ZCR, not too high (like fricatives) or too low (like tones)
-            zero_crossings = np.sum(np.diff(np.sign(audio_data)) != 0)
-            zcr = zero_crossings / len(audio_data)
-            if zcr < 0.02 or zcr > 0.4:  # Voice typically has ZCR between 0.02-0.4
-                return False
-            
-            # 4. Frequency analysis using FFT
-            fft = np.fft.rfft(audio_data)
-            freqs = np.fft.rfftfreq(len(audio_data), 1/8000)
-            magnitude = np.abs(fft)
-            
-            # Voice frequency bands
-            # Fundamental frequency range (85-255Hz for adult voices)
-            fundamental = np.sum(magnitude[(freqs >= 85) & (freqs <= 255)])
-            # First formant range (300-900Hz)
-            formant1 = np.sum(magnitude[(freqs >= 300) & (freqs <= 900)])
-            # Second formant range (900-2500Hz)
-            formant2 = np.sum(magnitude[(freqs >= 900) & (freqs <= 2500)])
-            # Higher formants (2500-3400Hz)
-            formant3 = np.sum(magnitude[(freqs >= 2500) & (freqs <= 3400)])
-            
-            total_energy = np.sum(magnitude)
-            if total_energy == 0:
-                return False
-            
-            # Calculate ratios
-            voice_energy = fundamental + formant1 + formant2 + formant3
-            voice_ratio = voice_energy / total_energy
-            
-            # Check for too much high-frequency content (clicking, banging)
-            high_freq_energy = np.sum(magnitude[freqs > 3400])
-            high_freq_ratio = high_freq_energy / total_energy
-            
-            # Check for too much very low frequency content (rumbling, thumps)
-            low_freq_energy = np.sum(magnitude[freqs < 85])
-            low_freq_ratio = low_freq_energy / total_energy
-            
-            # 5. Spectral centroid - voice typically has centroid in mid-range
-            spectral_centroid = np.sum(freqs * magnitude) / total_energy if total_energy > 0 else 0
-            
-            # Voice characteristics:
-            # - At least 40% energy in voice frequencies (increased from 30%)
-            # - Less than 40% energy in high frequencies (reduced from 60%)
-            # - Less than 30% energy in very low frequencies
-            # - Spectral centroid between 500-2500 Hz
-            is_voice = (voice_ratio > 0.4 and 
-                       high_freq_ratio < 0.4 and 
-                       low_freq_ratio < 0.3 and
-                       500 < spectral_centroid < 2500)
-            
-            return is_voice
-            
+            return self.voice_analyzer.voice_like(samples)
         except Exception as e:
             print(f"{timestamp()} ⚠️  Voice detection error: {e}")
             # Fallback - be conservative and assume not voice to avoid false positives
-            return False
+            return np.zeros(samples.shape[0], dtype=bool)
     
     
     
@@ -403,6 +475,7 @@ class AudioStreamHandler:
         self.is_interrupting = False
         # Clear any buffered audio
         self.speech_buffer.clear()
+        self.audio_forwarder.reset()
         self.is_speaking = False
         self.silence_counter = 0
         self.speech_counter = 0
@@ -424,11 +497,47 @@ class AudioStreamHandler:
         except asyncio.TimeoutError:
             return None
     
+    def enqueue_audio(self, audio_data: bytes):
+        """Queue incoming audio for the consumer task without waiting on VAD or upstream services"""
+        if not self.is_running:
+            return
+        if len(audio_data) % 2 != 0:
+            print(f"{timestamp()} ⚠️  Invalid audio data length: {len(audio_data)} bytes (not 16-bit aligned)")
+            return
+        self.ingest_queue.append(audio_data)
+        self.ingest_queue_bytes += len(audio_data)
+        
+        # Overflow policy: drop the oldest audio while idle, coalesce during speech
+        while len(self.ingest_queue) > self.max_ingest_chunks or self.ingest_queue_bytes > self.max_ingest_bytes:
+            if self.is_speaking and self.ingest_queue_bytes <= self.max_ingest_bytes:
+                # Mid-utterance - merge the oldest chunks so no speech is lost
+                merged = self.ingest_queue.popleft() + self.ingest_queue.popleft()
+                self.ingest_queue.appendleft(merged)
+                self.ingest_stats["coalesced_chunks"] += 1
+            else:
+                # Not speaking (or over the byte cap) - drop the oldest audio
+                dropped = self.ingest_queue.popleft()
+                self.ingest_queue_bytes -= len(dropped)
+                self.ingest_stats["dropped_frames"] += len(dropped) // self.frame_size
+                if self.ingest_stats["dropped_chunks"] % 100 == 0:
+                    print(f"{timestamp()} ⚠️  Audio ingest queue full - dropping oldest audio ({self.ingest_stats['dropped_frames']} frames dropped so far)")
+                self.ingest_stats["dropped_chunks"] += 1
+        
+        self.ingest_stats["max_depth"] = max(self.ingest_stats["max_depth"], len(self.ingest_queue))
+        self.ingest_event.set()
+    
     async def _process_audio_stream(self):
-        """Dummy task for compatibility"""
-        # All processing now happens in add_audio with VAD
+        """Consume queued audio and run it through VAD and the transcription pipeline"""
         while self.is_running:
-            await asyncio.sleep(1)
+            await self.ingest_event.wait()
+            self.ingest_event.clear()
+            while self.ingest_queue and self.is_running:
+                audio_data = self.ingest_queue.popleft()
+                self.ingest_queue_bytes -= len(audio_data)
+                try:
+                    await self.add_audio(audio_data)
+                except Exception as e:
+                    print(f"{timestamp()} ❌ Audio processing error: {type(e).__name__}: {e}")
     
     async def _ensure_connection(self):
         """Ensure Deepgram connection is active"""
@@ -448,14 +557,8 @@ class AudioStreamHandler:
         try:
             print(f"{timestamp()} 🚀 Starting Deepgram streaming transcription")
             
-            # Create new transcriber with callbacks
-            self.streaming_transcriber = DeepgramStreamingTranscriber(
-                on_transcript=self._on_streaming_transcript,
-                on_interim=self._on_interim_transcript
-            )
-            
-            # Connect to Deepgram
-            connected = await self.streaming_transcriber.connect()
+            # Borrow a connected transcriber from the pool (waits for any borrow already in flight)
+            connected = await self._acquire_transcriber()
             if connected:
                 self.is_streaming = True
                 print(f"{timestamp()} ✅ Streaming transcription active")
@@ -483,16 +586,45 @@ class AudioStreamHandler:
             # Re-raise to fail fast
             raise
     
+    async def _acquire_transcriber(self) -> bool:
+        """Borrow a connected transcriber from the shared pool, returning whether streaming is ready"""
+        async with self.connect_lock:
+            if self.is_streaming and self.streaming_transcriber:
+                return True
+            transcriber = await deepgram_pool.acquire(
+                on_transcript=self._on_streaming_transcript,
+                on_interim=self._on_interim_transcript
+            )
+            if not transcriber.is_connected:
+                await deepgram_pool.release(transcriber)
+                return False
+            self.streaming_transcriber = transcriber
+            self.is_streaming = True
+            self.is_suspended = False
+            return True
+    
+    async def _monitor_idle(self):
+        """Suspend the Deepgram connection while the user is silent (agent talking or idle line)"""
+        while self.is_running:
+            await asyncio.sleep(1)
+            if (self.is_streaming and not self.is_speaking and not self.finalizing
+                    and time.time() - self.last_user_activity > self.suspend_after_idle):
+                print(f"{timestamp()} 💤 No user speech for {self.suspend_after_idle:g}s - suspending Deepgram connection")
+                # Resumes at the next speech onset, which replays the pre-speech buffer
+                await self._stop_streaming_transcription()
+                self.is_suspended = True
+    
     async def _stop_streaming_transcription(self):
-        """Stop streaming transcription"""
+        """Stop streaming transcription and hand the connection back to the pool"""
         if self.streaming_transcriber:
+            # Detach first so audio processing never sends on a connection being released
+            transcriber = self.streaming_transcriber
+            self.streaming_transcriber = None
+            self.is_streaming = False
             try:
-                await self.streaming_transcriber.disconnect()
+                await deepgram_pool.release(transcriber)
             except Exception as e:
                 print(f"{timestamp()} ❌ Error stopping streaming transcription: {e}")
-            finally:
-                self.streaming_transcriber = None
-                self.is_streaming = False
     
     def _on_streaming_transcript(self, transcript: str):
         """Handle streaming transcript updates"""
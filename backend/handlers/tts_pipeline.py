@@ -0,0 +1,86 @@
+"""Ordered TTS pipeline: synthesize segments in parallel, emit them strictly in order"""
+import asyncio
+from typing import AsyncIterator, Callable, List, Optional
+from utils.helpers import timestamp
+
+_END = object()
+
+
+class _Segment:
+    """One text segment and the audio produced for it so far"""
+    __slots__ = ("index", "text", "items", "task")
+
+    def __init__(self, index: int, text: str):
+        self.index = index
+        self.text = text
+        self.items: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def audio(self) -> AsyncIterator:
+        """Items for this segment as they arrive, until synthesis ends"""
+        while True:
+            item = await self.items.get()
+            if item is _END:
+                return
+            yield item
+
+
+class TTSPipeline:
+    """Runs up to ``max_parallel`` syntheses ahead while the consumer plays segments in order.
+
+    ``synthesize(text, index)`` returns an async iterator of audio items
+    (stream chunks, or a single URL); ``index`` lets the caller prioritize
+    the first segment. Each segment's items are buffered as they
+    arrive, so the segment at the head of the line is forwarded live while
+    the following ones are already being generated.
+    """
+
+    def __init__(self, synthesize: Callable[[str, int], AsyncIterator], max_parallel: int = 2):
+        self.synthesize = synthesize
+        self._slots = asyncio.Semaphore(max_parallel)
+        self._segments: List[_Segment] = []
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+
+    def submit(self, text: str):
+        """Start synthesizing the next segment"""
+        if self._closed:
+            raise RuntimeError("TTS pipeline already closed")
+        segment = _Segment(len(self._segments), text)
+        segment.task = asyncio.create_task(self._produce(segment))
+        self._segments.append(segment)
+        self._ready.put_nowait(segment)
+
+    def close(self):
+        """No more segments will be submitted"""
+        if not self._closed:
+            self._closed = True
+            self._ready.put_nowait(_END)
+
+    async def segments(self) -> AsyncIterator[_Segment]:
+        """Segments in submission order; iterate each one's ``audio()`` before moving on"""
+        while True:
+            segment = await self._ready.get()
+            if segment is _END:
+                return
+            yield segment
+
+    def cancel(self):
+        """Abandon every pending synthesis"""
+        self.close()
+        for segment in self._segments:
+            if segment.task and not segment.task.done():
+                segment.task.cancel()
+
+    async def _produce(self, segment: _Segment):
+        try:
+            async with self._slots:
+                async for item in self.synthesize(segment.text, segment.index):
+                    segment.items.put_nowait(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failed segment is skipped rather than stalling the rest of the response
+            print(f"{timestamp()} ❌ TTS segment {segment.index} failed: {e}")
+        finally:
+            segment.items.put_nowait(_END)
@@ -0,0 +1,171 @@
+"""Process-wide batched VAD engine running off the event loop"""
+import asyncio
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+import webrtcvad
+from config.settings import VAD_ENGINE_CONFIG
+from utils.helpers import timestamp
+from utils.voice_analysis import VoiceAnalyzer
+
+
+def detect_speech(vad: webrtcvad.Vad, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Run WebRTC VAD on each row of a (frames x samples) int16 array, in order"""
+    is_speech = np.zeros(samples.shape[0], dtype=bool)
+    for i in range(samples.shape[0]):
+        try:
+            is_speech[i] = vad.is_speech(samples[i].data.cast("B"), sample_rate)
+        except Exception as e:
+            print(f"{timestamp()} ⚠️  VAD error: {e}")
+    return is_speech
+
+
+class _VADRequest:
+    """Frames from one session waiting to be evaluated"""
+    __slots__ = ("vad", "samples", "loop", "future")
+
+    def __init__(self, vad: webrtcvad.Vad, samples: np.ndarray, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.vad = vad
+        self.samples = samples
+        self.loop = loop
+        self.future = future
+
+
+class VADEngine:
+    """Collects pending frames from all sessions and evaluates them in batches on a worker thread.
+
+    webrtcvad and the numpy spectral analysis run on the worker, so the event
+    loop only copies the frames in and applies the results. Each session
+    passes its own webrtcvad.Vad (the VAD keeps per-stream state), while the
+    voice-likeness analysis runs once over the speech frames of the whole batch.
+    """
+
+    def __init__(self, sample_rate: int, frame_samples: int, max_queue_size: int,
+                 max_batch_frames: int, max_batch_latency_ms: float):
+        self.sample_rate = sample_rate
+        self.max_batch_frames = max_batch_frames
+        self.max_batch_latency = max_batch_latency_ms / 1000
+        self.analyzer = VoiceAnalyzer(frame_samples, sample_rate, max_batch_frames)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.batches = 0
+        self.frames = 0
+        self.rejected = 0  # Submissions refused because the queue was full
+
+    def start(self):
+        """Start the worker thread if it isn't running"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="vad-engine", daemon=True)
+            self._thread.start()
+            print(f"{timestamp()} 🧵 VAD engine started (batch ≤{self.max_batch_frames} frames, ≤{self.max_batch_latency * 1000:.1f}ms)")
+
+    def stop(self):
+        """Stop the worker thread after it drains the queue"""
+        with self._lock:
+            if not self._thread:
+                return
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def submit(self, vad: webrtcvad.Vad, samples: np.ndarray) -> Optional[asyncio.Future]:
+        """Queue a session's (frames x samples) array for evaluation.
+
+        Returns a future resolving to ``(is_speech, is_voice_like)`` arrays, or
+        None if the queue is full and the caller should evaluate inline.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Copy - the caller's frames are views into a buffer it will reuse
+        request = _VADRequest(vad, np.array(samples, dtype=np.int16), loop, future)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            self.rejected += 1
+            return None
+        return future
+
+    def _run(self):
+        """Worker loop: gather a batch, evaluate it, hand results back to each session's loop"""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            frame_count = len(request.samples)
+            deadline = time.monotonic() + self.max_batch_latency
+            stopping = False
+
+            # Keep collecting until the batch is full or the latency budget is spent
+            while frame_count < self.max_batch_frames:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                frame_count += len(request.samples)
+
+            self._evaluate(batch)
+            if stopping:
+                return
+
+    def _evaluate(self, batch: List[_VADRequest]):
+        """Evaluate one batch and resolve its futures"""
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+
+        speech_flags = [detect_speech(request.vad, request.samples, self.sample_rate) for request in batch]
+
+        # One spectral pass over the speech frames of every session in the batch
+        voice_flags = [np.zeros(len(flags), dtype=bool) for flags in speech_flags]
+        speech_rows = [request.samples[flags] for request, flags in zip(batch, speech_flags)]
+        if any(len(rows) for rows in speech_rows):
+            try:
+                voice_like = self.analyzer.voice_like(np.concatenate(speech_rows))
+                offset = 0
+                for flags, result, rows in zip(speech_flags, voice_flags, speech_rows):
+                    result[flags] = voice_like[offset:offset + len(rows)]
+                    offset += len(rows)
+            except Exception as e:
+                print(f"{timestamp()} ⚠️  Voice detection error: {e}")
+
+        self.batches += 1
+        self.frames += sum(len(request.samples) for request in batch)
+
+        for request, is_speech, is_voice_like in zip(batch, speech_flags, voice_flags):
+            try:
+                request.loop.call_soon_threadsafe(_resolve, request.future, (is_speech, is_voice_like))
+            except RuntimeError:
+                # Session's event loop already closed
+                pass
+
+
+def _resolve(future: asyncio.Future, result: Tuple[np.ndarray, np.ndarray]):
+    """Set a future's result on its own loop unless the session gave up on it"""
+    if not future.done():
+        future.set_result(result)
+
+
+# Shared engine for every session in this process
+vad_engine = VADEngine(
+    sample_rate=8000,
+    frame_samples=240,  # 30ms frames
+    max_queue_size=VAD_ENGINE_CONFIG["max_queue_size"],
+    max_batch_frames=VAD_ENGINE_CONFIG["max_batch_frames"],
+    max_batch_latency_ms=VAD_ENGINE_CONFIG["max_batch_latency_ms"],
+) if VAD_ENGINE_CONFIG["enabled"] else None
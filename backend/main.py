@@ -5,8 +5,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from config.settings import CORS_ORIGINS
 from routes.audio import router as audio_router
 from routes.websocket import websocket_endpoint
-from routes.agents import router as agents_router
+from routes.agents import router as agents_router, prerender_greetings
 from utils.cleanup import cleanup_audio_files
+from handlers.vad_engine import vad_engine
+from services.deepgram_service import deepgram_pool
+from services.elevenlabs_service import tts_cache, tts_client, tts_flight
+from services.gemini_service import llm_executor
+from services.knowledge_service import shutdown_knowledge_workers
+from services.tts_scheduler import tts_scheduler
 from mcp_client import MCPClient
 from config.settings import MCP_URL
 
@@ -47,6 +53,15 @@ async def startup_event():
     # Start cleanup task
     asyncio.create_task(cleanup_audio_files())
     
+    # Warm Deepgram streaming connections in the background
+    asyncio.create_task(deepgram_pool.start())
+    
+    # Warm pooled ElevenLabs connections in the background
+    asyncio.create_task(tts_client.start())
+    
+    # Render greeting audio for the agents loaded at import
+    prerender_greetings()
+    
     # Initialize MCP client if needed
     global mcp_client
     if MCP_URL:
@@ -72,6 +87,26 @@ async def shutdown_event():
     if mcp_client:
         await mcp_client.close()
         print("✓ MCP client closed")
+    # Close warm Deepgram connections
+    await deepgram_pool.close()
+    # Stop the shared VAD worker
+    if vad_engine:
+        vad_engine.stop()
+        print("✓ VAD engine stopped")
+    # Close pooled ElevenLabs connections
+    await tts_client.close()
+    # TTS cache effectiveness
+    if tts_cache:
+        stats = tts_cache.stats()
+        print(f"✓ TTS cache: {stats['memory_hits']} memory hits, {stats['disk_hits']} disk hits, "
+              f"{stats['misses']} misses, {stats['memory_evictions']}/{stats['disk_evictions']} evictions (memory/disk)")
+    print(f"✓ TTS upstream: {tts_flight.executions} generations, {tts_flight.coalesced} duplicate requests coalesced")
+    # TTS queue wait per priority class
+    tts_scheduler.log_stats()
+    # Abandon queued LLM streams
+    llm_executor.shutdown(wait=False, cancel_futures=True)
+    # Stop knowledge ingestion workers
+    shutdown_knowledge_workers()
     print("="*60 + "\n")
 
 
@@ -1,15 +1,32 @@
 """Agent management routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 from datetime import datetime
+import asyncio
+import hashlib
+import json
 import uuid
+from services.agent_profile import invalidate_agent_profile
+from services.elevenlabs_service import render_tts_audio
+from config.settings import KNOWLEDGE_CONFIG
+from services.knowledge_service import (
+    delete_knowledge_document, drop_agent_knowledge, get_knowledge_document, list_knowledge_documents,
+    schedule_knowledge_index, upload_knowledge_document
+)
+from services.tts_formats import MP3, TTSFormat
+from services.tts_scheduler import TTSPriority
+from utils.document_text import UnsupportedDocument, document_extension
+from utils.helpers import timestamp
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
 # In-memory storage for agents
 agents_db: Dict[str, dict] = {}
 
+# Greeting audio renders in progress: "agent_id:format" -> (fingerprint, task)
+greeting_renders: Dict[str, tuple] = {}
+
 # Agent model
 class AgentBase(BaseModel):
     name: str
@@ -51,6 +68,72 @@ class Agent(AgentBase):
     minutes_spoken: float = 0.0
     knowledge_resources: int = 0
 
+def greeting_fingerprint(agent: dict) -> str:
+    """Identifies the greeting audio an agent should play - changes with greeting, voice or speed"""
+    payload = json.dumps([agent.get("greeting"), agent.get("voice"), agent.get("speed")], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_greeting_audio(agent: dict, tts_format: TTSFormat = MP3) -> Optional[bytes]:
+    """Pre-rendered greeting audio in the given format, if it is current"""
+    stored = agent.get("greeting_audio")
+    if not stored or stored["fingerprint"] != greeting_fingerprint(agent):
+        return None
+    return stored["formats"].get(tts_format.elevenlabs)
+
+
+def schedule_greeting_render(agent: dict, tts_format: TTSFormat = MP3,
+                             priority: TTSPriority = TTSPriority.PREFETCH) -> Optional[asyncio.Task]:
+    """Render the agent's greeting audio in the background and store it with the agent.
+
+    Audio stored for an older greeting, voice or speed is dropped first, so
+    a call never plays a stale greeting. Returns the render task (an
+    in-progress one if there is one), or None if there is nothing to render.
+    """
+    fingerprint = greeting_fingerprint(agent)
+    stored = agent.get("greeting_audio")
+    if not stored or stored["fingerprint"] != fingerprint:
+        stored = agent["greeting_audio"] = {"fingerprint": fingerprint, "formats": {}}
+    if not agent.get("greeting") or tts_format.elevenlabs in stored["formats"]:
+        return None
+    
+    render_key = f"{agent['id']}:{tts_format.elevenlabs}"
+    if render_key in greeting_renders:
+        previous_fingerprint, previous = greeting_renders[render_key]
+        if previous_fingerprint == fingerprint:
+            return previous
+        previous.cancel()
+    
+    async def render():
+        audio = await render_tts_audio(agent["greeting"], priority, agent["id"], tts_format)
+        # The agent may have changed while rendering
+        if audio and agent.get("greeting_audio") is stored:
+            stored["formats"][tts_format.elevenlabs] = audio
+            print(f"{timestamp()} 👋 Greeting audio ready for {agent['name']} ({tts_format.elevenlabs}, {len(audio)} bytes)")
+    
+    def finished(task):
+        if greeting_renders.get(render_key, (None, None))[1] is task:
+            del greeting_renders[render_key]
+    
+    task = asyncio.create_task(render())
+    greeting_renders[render_key] = (fingerprint, task)
+    task.add_done_callback(finished)
+    return task
+
+
+def prerender_greetings():
+    """Render greeting audio for every agent (agents created before the event loop started)"""
+    for agent in agents_db.values():
+        schedule_greeting_render(agent)
+
+
+def cancel_greeting_renders(agent_id: str):
+    """Stop rendering greeting audio for an agent that changed or was deleted"""
+    for render_key, (_, task) in list(greeting_renders.items()):
+        if render_key.startswith(f"{agent_id}:"):
+            task.cancel()
+
+
 @router.get("/", response_model=List[Agent])
 async def get_agents():
     """Get all agents"""
@@ -82,6 +165,13 @@ async def create_agent(agent: AgentCreate):
     # Store in memory
     agents_db[agent_id] = new_agent.dict()
     
+    # Greeting audio is ready before the first call
+    schedule_greeting_render(agents_db[agent_id])
+    
+    # Index knowledge too large to send whole on every turn
+    if agent.custom_knowledge:
+        schedule_knowledge_index(agents_db[agent_id], on_change=lambda: invalidate_agent_profile(agent_id))
+    
     return new_agent
 
 @router.put("/{agent_id}", response_model=Agent)
@@ -105,6 +195,20 @@ async def update_agent(agent_id: str, agent_update: AgentUpdate):
     if "name" in update_data:
         existing_agent["agent_id"] = f"{update_data['name'].replace(' ', '-')}-{agent_id[:8]}"
     
+    # The next turn recompiles the agent's prompt profile
+    invalidate_agent_profile(agent_id)
+    
+    # Re-render greeting audio if the greeting, voice or speed changed
+    stored = existing_agent.get("greeting_audio")
+    if not stored or stored["fingerprint"] != greeting_fingerprint(existing_agent):
+        cancel_greeting_renders(agent_id)
+        schedule_greeting_render(existing_agent)
+    
+    # Re-index knowledge; passages whose text is unchanged are not re-tokenized.
+    # The profile is compiled again once the new index is in place
+    if "custom_knowledge" in update_data:
+        schedule_knowledge_index(existing_agent, on_change=lambda: invalidate_agent_profile(agent_id))
+    
     return existing_agent
 
 @router.delete("/{agent_id}")
@@ -114,8 +218,68 @@ async def delete_agent(agent_id: str):
         raise HTTPException(status_code=404, detail="Agent not found")
     
     del agents_db[agent_id]
+    cancel_greeting_renders(agent_id)
+    invalidate_agent_profile(agent_id)
+    drop_agent_knowledge(agent_id)
     return {"message": "Agent deleted successfully"}
 
+@router.get("/{agent_id}/knowledge")
+async def get_knowledge_documents(agent_id: str):
+    """List an agent's uploaded knowledge documents and their ingestion progress"""
+    if agent_id not in agents_db:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return [document.to_dict() for document in list_knowledge_documents(agent_id)]
+
+@router.get("/{agent_id}/knowledge/{name}")
+async def get_knowledge_document_status(agent_id: str, name: str):
+    """Ingestion progress of one knowledge document"""
+    document = get_knowledge_document(agent_id, name) if agent_id in agents_db else None
+    if document is None:
+        raise HTTPException(status_code=404, detail="Knowledge document not found")
+    return document.to_dict()
+
+@router.put("/{agent_id}/knowledge/{name}", status_code=202)
+async def upload_knowledge(agent_id: str, name: str, request: Request, response: Response):
+    """Upload or replace a knowledge document (the request body is the file).
+
+    Ingestion runs in the background; poll the document for progress.
+    Re-uploading identical content returns 200 without re-ingesting.
+    """
+    if agent_id not in agents_db:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    try:
+        document_extension(name)
+    except UnsupportedDocument as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    if int(request.headers.get("content-length") or 0) > KNOWLEDGE_CONFIG["max_upload_bytes"]:
+        raise HTTPException(status_code=413, detail="Document too large")
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty document")
+    documents = list_knowledge_documents(agent_id)
+    if len(documents) >= KNOWLEDGE_CONFIG["max_documents"] and name not in {document.name for document in documents}:
+        raise HTTPException(status_code=409, detail=f"An agent can have at most {KNOWLEDGE_CONFIG['max_documents']} knowledge documents")
+    if len(data) > KNOWLEDGE_CONFIG["max_upload_bytes"]:
+        raise HTTPException(status_code=413, detail="Document too large")
+    
+    # The next turn recompiles the agent's prompt once the document is indexed
+    document, changed = await upload_knowledge_document(
+        agents_db[agent_id], name, data, on_change=lambda: invalidate_agent_profile(agent_id)
+    )
+    if not changed:
+        response.status_code = 200
+    return document.to_dict()
+
+@router.delete("/{agent_id}/knowledge/{name}")
+async def delete_knowledge(agent_id: str, name: str):
+    """Delete a knowledge document and its passages"""
+    if agent_id not in agents_db:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    if not await delete_knowledge_document(agents_db[agent_id], name):
+        raise HTTPException(status_code=404, detail="Knowledge document not found")
+    invalidate_agent_profile(agent_id)
+    return {"message": "Knowledge document deleted successfully"}
+
 @router.post("/{agent_id}/conversation")
 async def update_agent_stats(agent_id: str, duration_seconds: float):
     """Update agent conversation statistics"""
@@ -1,11 +1,57 @@
 """Audio file serving route"""
 from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from starlette.background import BackgroundTask
 from config.settings import AUDIO_DIR
+from routes.agents import agents_db, get_greeting_audio
+from services import elevenlabs_service
+from services.filler_clips import filler_clips
+from services.tts_formats import format_for_elevenlabs
 
 router = APIRouter()
 
 
+@router.get("/audio/cache/{cache_key}")
+async def get_cached_audio(cache_key: str):
+    """Serve audio from the TTS cache in the format named by the key's suffix"""
+    digest, _, output_format = cache_key.partition(".")
+    tts_format = format_for_elevenlabs(output_format)
+    tts_cache = elevenlabs_service.tts_cache
+    if not digest.isalnum() or tts_format is None or tts_cache is None:
+        return {"error": "Audio file not found"}
+    
+    audio_path = tts_cache.path(cache_key)
+    
+    if audio_path.exists():
+        # Fetched - let disk eviction have it once it has been sent
+        return FileResponse(audio_path, media_type=tts_format.media_type,
+                            background=BackgroundTask(tts_cache.release, cache_key))
+    else:
+        return {"error": "Audio file not found"}
+
+
+@router.get("/audio/greeting/{agent_id}")
+async def get_greeting_audio_file(agent_id: str):
+    """Serve an agent's pre-rendered greeting"""
+    audio = get_greeting_audio(agents_db[agent_id]) if agent_id in agents_db else None
+    
+    if audio:
+        return Response(audio, media_type="audio/mpeg")
+    else:
+        return {"error": "Audio file not found"}
+
+
+@router.get("/audio/filler/{clip_id}")
+async def get_filler_audio(clip_id: str):
+    """Serve a latency-masking clip"""
+    clip = filler_clips.get(clip_id)
+    
+    if clip:
+        return Response(clip.audio, media_type="audio/mpeg")
+    else:
+        return {"error": "Audio file not found"}
+
+
 @router.get("/audio/{audio_id}")
 async def get_audio(audio_id: str):
     """Serve audio files"""
@@ -1,14 +1,41 @@
 """WebSocket route for real-time audio streaming"""
 import asyncio
 import json
-import re
 import time
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Optional
 from fastapi import WebSocket, WebSocketDisconnect
+from config.settings import FILLER_CLIPS_CONFIG, GEMINI_API_KEY, TTS_PIPELINE_CONFIG, TTS_STREAM_INPUT_CONFIG
 from handlers.audio_stream_handler import AudioStreamHandler
-from services.gemini_service import generate_gemini_response_stream
-from services.elevenlabs_service import generate_tts_audio_fast
+from handlers.tts_pipeline import TTSPipeline
+from services.conversation_memory import ConversationMemory
+from services.gemini_service import generate_gemini_response_stream, summarize_conversation
+from services.elevenlabs_service import generate_tts_audio_fast, stream_input_session, stream_tts_audio
+from services.filler_clips import expects_lookup, filler_clips
+from services.tts_formats import MP3, negotiate_tts_format
+from services.tts_scheduler import TTSPriority
+from utils.audio_frames import align_frames, pack_audio_frame
 from utils.helpers import timestamp
-from routes.agents import agents_db
+from utils.text_segmenter import SentenceSegmenter
+from routes.agents import agents_db, get_greeting_audio, schedule_greeting_render
+
+
+def segment_priority(index: int) -> TTSPriority:
+    """The first segment of a response is on the critical path, the rest are not"""
+    return TTSPriority.FIRST_CHUNK if index == 0 else TTSPriority.CONTINUATION
+
+
+async def synthesize_audio_url(text: str, priority: TTSPriority, agent_id: Optional[str]) -> AsyncIterator[str]:
+    """TTS pipeline source for URL delivery - yields the audio URL once generated"""
+    audio_url = await generate_tts_audio_fast(text, priority, agent_id)
+    if audio_url:
+        yield audio_url
+
+
+async def replay_audio(audio: bytes, chunk_bytes: int = 16384) -> AsyncIterator[bytes]:
+    """Stored audio as a chunk stream"""
+    for offset in range(0, len(audio), chunk_bytes):
+        yield audio[offset:offset + chunk_bytes]
 
 
 async def websocket_endpoint(websocket: WebSocket):
@@ -47,10 +74,192 @@ async def websocket_endpoint(websocket: WebSocket):
     audio_handler.set_interrupt_callback(handle_interrupt)
     await audio_handler.start()
     
-    # Track conversation and agent info
-    conversation = []
+    # Track conversation (recent turns verbatim, older ones summarized) and agent info
+    conversation = ConversationMemory(summarize=summarize_conversation if GEMINI_API_KEY else None)
     current_agent = None
     
+    # TTS delivery: audio URLs by default, binary websocket frames when the client opts in
+    tts_streaming = False
+    # TTS input when streaming: sentence segments, or LLM text pushed into one session per turn
+    tts_text_input = TTS_STREAM_INPUT_CONFIG["default_input"] == "text_stream"
+    # Output format for streamed audio, negotiated in audio_config (URL delivery is always mp3)
+    tts_format = negotiate_tts_format(None, 8000, tts_streaming)
+    last_stream_id = 0
+    
+    # Latency-masking clip for the current turn: {"gen_id", "task", "playing"}
+    filler = None
+    # Smoothed time from transcript to first response audio, to tell when a turn will be slow to start
+    first_audio_estimate = None
+    
+    async def stream_tts_to_client(text: str, gen_id: int, kind: str, chunks: Optional[AsyncIterator[bytes]] = None):
+        """Stream TTS audio for text as binary frames tagged with gen_id, returning when the first audio was sent"""
+        nonlocal last_stream_id
+        last_stream_id += 1
+        stream_id = last_stream_id
+        first_audio_at = None
+        completed = False
+        audio_format = tts_format
+        try:
+            if chunks is None:
+                chunks = stream_tts_audio(text, TTSPriority.GREETING if kind == "greeting" else TTSPriority.FIRST_CHUNK,
+                                          current_agent["id"] if current_agent else None, audio_format)
+            # Raw PCM frames must not split a sample
+            async for chunk in align_frames(chunks, audio_format.frame_bytes):
+                if gen_id != current_generation_id:
+                    # Superseded by an interruption - cut the stream off mid-sentence
+                    print(f"{timestamp()} ✂️  Cutting off audio stream {stream_id} (generation {gen_id} != {current_generation_id})")
+                    break
+                if first_audio_at is None:
+                    if kind == "response":
+                        await stop_filler(gen_id)
+                    first_audio_at = time.time()
+                    # Mark that agent is speaking
+                    audio_handler.set_agent_speaking(True)
+                    await websocket.send_json({
+                        "type": "audio_stream_start",
+                        "generation_id": gen_id,
+                        "stream_id": stream_id,
+                        "kind": kind,
+                        "text": text,
+                        "format": audio_format.name,
+                        "sample_rate": audio_format.sample_rate,
+                        "timestamp": first_audio_at
+                    })
+                await websocket.send_bytes(pack_audio_frame(gen_id, stream_id, chunk))
+            else:
+                completed = True
+        finally:
+            if first_audio_at is not None:
+                try:
+                    await websocket.send_json({
+                        "type": "audio_stream_end",
+                        "generation_id": gen_id,
+                        "stream_id": stream_id,
+                        "interrupted": not completed,
+                        "timestamp": time.time()
+                    })
+                except Exception:
+                    pass
+        return first_audio_at
+    
+    def prepare_filler_clips():
+        """Render the agent's clips in the session's format ahead of the first turn"""
+        if FILLER_CLIPS_CONFIG["enabled"] and current_agent:
+            filler_clips.prepare(current_agent, tts_format if tts_streaming else MP3)
+    
+    def start_filler(category: str, gen_id: int, delay: float = 0.0):
+        """Play a clip from the agent's library for this generation - after delay, if real audio has not started"""
+        nonlocal filler
+        state = {"gen_id": gen_id, "task": None, "playing": False}
+        
+        async def play():
+            if delay:
+                await asyncio.sleep(delay)
+            audio_format = tts_format if tts_streaming else MP3
+            clip = filler_clips.pick(current_agent, audio_format, category) if current_agent else None
+            if clip is None or gen_id != current_generation_id:
+                return
+            print(f"{timestamp()} 💬 Filler clip ({category}): '{clip.text}'")
+            state["playing"] = True
+            if tts_streaming:
+                await stream_tts_to_client(clip.text, gen_id, "filler", replay_audio(clip.audio))
+            else:
+                audio_handler.set_agent_speaking(True)
+                await websocket.send_json({
+                    "type": "audio_chunk",
+                    "audio_url": f"/audio/filler/{clip.clip_id}",
+                    "text": clip.text,
+                    "kind": "filler",
+                    "generation_id": gen_id,
+                    "timestamp": time.time()
+                })
+        
+        state["task"] = asyncio.create_task(play())
+        active_tasks.add(state["task"])
+        state["task"].add_done_callback(lambda t: active_tasks.discard(t))
+        filler = state
+    
+    def start_turn_filler(transcript: str, gen_id: int):
+        """Cover the gap before a turn's first audio - at once when it is expected to be long, else only if it is"""
+        slow_first_audio = FILLER_CLIPS_CONFIG["slow_first_audio"]
+        if expects_lookup(transcript):
+            start_filler("lookup", gen_id)
+        elif first_audio_estimate is not None and first_audio_estimate >= slow_first_audio:
+            start_filler("acknowledge", gen_id)
+        else:
+            start_filler("acknowledge", gen_id, delay=slow_first_audio)
+    
+    async def stop_filler(gen_id: int):
+        """Real audio is about to play - drop a pending clip, or tell the client to fade out one already sent"""
+        nonlocal filler
+        if filler is None or filler["gen_id"] != gen_id:
+            return
+        state, filler = filler, None
+        if not state["task"].done():
+            state["task"].cancel()
+            await asyncio.gather(state["task"], return_exceptions=True)
+        if state["playing"]:
+            print(f"{timestamp()} 💬 Stopping filler clip - response audio arrived")
+            await websocket.send_json({
+                "type": "filler_stop",
+                "generation_id": gen_id,
+                "timestamp": time.time()
+            })
+    
+    async def handle_unheard():
+        """Speech ended without a transcript - ask the caller to repeat themselves"""
+        if FILLER_CLIPS_CONFIG["enabled"] and current_agent:
+            start_filler("repeat", current_generation_id)
+    
+    audio_handler.set_unheard_callback(handle_unheard)
+    
+    async def send_greeting_url(gen_id: int, render: Optional[asyncio.Task]):
+        """Point the client at the agent's greeting audio, waiting for its render if it is not stored yet"""
+        agent = current_agent
+        if render is not None:
+            await asyncio.shield(render)
+        if gen_id != current_generation_id or not get_greeting_audio(agent):
+            return
+        # Pause listening while agent speaks greeting
+        audio_handler.pause_listening()
+        # Mark agent as speaking before sending audio
+        audio_handler.set_agent_speaking(True)
+        await websocket.send_json({
+            "type": "greeting_audio",
+            "audio_url": f"/audio/greeting/{agent['id']}?v={agent['greeting_audio']['fingerprint'][:12]}",
+            "timestamp": time.time()
+        })
+    
+    async def deliver_audio(pipeline: TTSPipeline, gen_id: int, streaming: bool):
+        """Send each pipeline segment's audio to the client in order, returning when the first audio was sent"""
+        first_audio_at = None
+        async for segment in pipeline.segments():
+            if gen_id != current_generation_id:
+                print(f"{timestamp()} ⏭️  Skipping remaining audio - generation ID mismatch")
+                break
+            sent_at = None
+            if streaming:
+                sent_at = await stream_tts_to_client(segment.text, gen_id, "response", segment.audio())
+            else:
+                async for audio_url in segment.audio():
+                    if gen_id != current_generation_id:
+                        print(f"{timestamp()} ⏭️  Skipping audio - generation ID mismatch ({gen_id} != {current_generation_id})")
+                        break
+                    await stop_filler(gen_id)
+                    sent_at = time.time()
+                    # Mark that agent is speaking
+                    audio_handler.set_agent_speaking(True)
+                    await websocket.send_json({
+                        "type": "audio_chunk",
+                        "audio_url": audio_url,
+                        "text": segment.text,
+                        "timestamp": sent_at
+                    })
+            if first_audio_at is None and sent_at:
+                first_audio_at = sent_at
+                print(f"{timestamp()} 🎉 First audio sent (segment {segment.index})")
+        return first_audio_at
+    
     # Create a task to continuously check for transcripts
     async def process_transcripts():
         """Continuously check for and process transcripts"""
@@ -80,7 +289,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     print(f"{timestamp()} ⏱️  Starting response pipeline...")
                     
                     # Add to conversation
-                    conversation.append({"role": "user", "content": transcript})
+                    conversation.add("user", transcript)
                     
                     # Pause listening while we process the response
                     audio_handler.pause_listening()
@@ -95,17 +304,69 @@ async def websocket_endpoint(websocket: WebSocket):
                     current_generation_id += 1
                     generation_id = current_generation_id
                     
+                    # Acknowledge the turn if the answer will take a while
+                    if FILLER_CLIPS_CONFIG["enabled"]:
+                        start_turn_filler(transcript, generation_id)
+                    
                     # Stream response with aggressive TTS generation
                     async def stream_response(gen_id: int):
+                        nonlocal first_audio_estimate
                         if gen_id != current_generation_id:
                             return
                         
+                        full_response = ""
+                        pipeline = None
+                        segmenter = None
+                        delivery_task = None
+                        text_session = None
+                        tts_resources = AsyncExitStack()
+                        agent_id = current_agent["id"] if current_agent else None
+                        
+                        def start_segment_pipeline():
+                            """Every sentence (or an early first clause) goes to TTS as soon as it is complete"""
+                            nonlocal segmenter, pipeline, delivery_task
+                            segmenter = SentenceSegmenter(
+                                first_clause_min_chars=TTS_PIPELINE_CONFIG["first_clause_min_chars"],
+                                min_chars=TTS_PIPELINE_CONFIG["min_segment_chars"],
+                                max_chars=TTS_PIPELINE_CONFIG["max_segment_chars"]
+                            )
+                            if tts_streaming:
+                                audio_format = tts_format
+                                synthesize = lambda text, index: stream_tts_audio(
+                                    text, segment_priority(index), agent_id, audio_format
+                                )
+                            else:
+                                synthesize = lambda text, index: synthesize_audio_url(text, segment_priority(index), agent_id)
+                            pipeline = TTSPipeline(
+                                synthesize,
+                                max_parallel=TTS_PIPELINE_CONFIG["max_parallel"]
+                            )
+                            delivery_task = asyncio.create_task(deliver_audio(pipeline, gen_id, tts_streaming))
+                        
+                        async def fall_back_to_segments() -> str:
+                            """Drop a failed text-in session for sentence pipelining, returning the text it has not spoken"""
+                            nonlocal text_session
+                            print(f"{timestamp()} ⚠️  Text-in TTS failed, falling back to sentence segments")
+                            delivery_task.cancel()
+                            await asyncio.gather(delivery_task, return_exceptions=True)
+                            unspoken = text_session.unspoken_text()
+                            text_session = None
+                            await tts_resources.aclose()
+                            start_segment_pipeline()
+                            return unspoken
+                        
                         try:
-                            full_response = ""
-                            first_sentence = ""
-                            first_tts_task = None
                             first_audio_time = None  # Initialize to avoid UnboundLocalError
                             
+                            if tts_streaming and tts_text_input:
+                                # One text-in session for the turn - tokens go to TTS without waiting for sentence ends
+                                text_session = await tts_resources.enter_async_context(stream_input_session(agent_id, tts_format))
+                                delivery_task = asyncio.create_task(
+                                    stream_tts_to_client("", gen_id, "response", text_session.audio())
+                                )
+                            else:
+                                start_segment_pipeline()
+                            
                             # Track timing
                             llm_start = time.time()
                             
@@ -127,58 +388,53 @@ async def websocket_endpoint(websocket: WebSocket):
                                     "timestamp": time.time()
                                 })
                                 
-                                # Generate TTS for first sentence ASAP
-                                if not first_tts_task and re.search(r'[.!?]', full_response):
-                                    # Extract first sentence
-                                    match = re.search(r'^(.*?[.!?])\s*', full_response)
-                                    if match:
-                                        first_sentence = match.group(1)
-                                        print(f"{timestamp()} 🎯 First sentence ready, starting TTS for: '{first_sentence[:50]}...'")
+                                if text_session:
+                                    sent = await text_session.send_text(text_chunk)
+                                    # Audio ending before the turn's text did means the session failed on its receive side
+                                    if sent and not delivery_task.done():
+                                        continue
+                                    # Fall back to sentence pipelining for the rest of the turn, starting with
+                                    # text the session accepted but hasn't spoken yet (plus the chunk it refused)
+                                    unspoken = await fall_back_to_segments()
+                                    text_chunk = unspoken if sent else unspoken + text_chunk
+                                
+                                for segment in segmenter.feed(text_chunk):
+                                    if segmenter.segments_emitted == 1:
+                                        print(f"{timestamp()} 🎯 First segment ready, starting TTS for: '{segment[:50]}...'")
                                         print(f"{timestamp()} 📊 Generation ID: {gen_id}, Current ID: {current_generation_id}")
-                                        first_tts_task = asyncio.create_task(
-                                            generate_tts_audio_fast(first_sentence)
-                                        )
-                                        active_tasks.add(first_tts_task)
-                                        first_tts_task.add_done_callback(lambda t: active_tasks.discard(t))
+                                    pipeline.submit(segment)
                             
-                            # Wait for first TTS if we have one
-                            if first_tts_task:
-                                audio_url = await first_tts_task
-                                if audio_url and gen_id == current_generation_id:
-                                    first_audio_time = time.time() - response_pipeline_start
-                                    print(f"{timestamp()} 🎉 First audio ready in {first_audio_time:.2f}s from user stop")
-                                    
-                                    # Mark that agent is speaking
-                                    audio_handler.set_agent_speaking(True)
-                                    await websocket.send_json({
-                                        "type": "audio_chunk",
-                                        "audio_url": audio_url,
-                                        "text": first_sentence,
-                                        "timestamp": time.time()
-                                    })
-                                elif gen_id != current_generation_id:
-                                    print(f"{timestamp()} ⏭️  Skipping audio - generation ID mismatch ({gen_id} != {current_generation_id})")
+                            if text_session:
+                                # The server synthesizes whatever it still buffers and ends the stream
+                                if await text_session.finish():
+                                    await asyncio.wait([delivery_task])
+                                if not delivery_task.done() or delivery_task.exception():
+                                    # Failed after accepting all the text - synthesize what it never spoke
+                                    unspoken = await fall_back_to_segments()
+                                    for segment in segmenter.feed(unspoken):
+                                        pipeline.submit(segment)
+                            if text_session:
+                                print(f"{timestamp()} 🔊 TTS: {text_session.text_chars} characters streamed to text-in session")
+                            else:
+                                # Whatever followed the last complete sentence
+                                tail = segmenter.flush()
+                                if tail:
+                                    pipeline.submit(tail)
+                                pipeline.close()
+                                print(f"{timestamp()} 🔊 TTS: {segmenter.segments_emitted} segments queued")
                             
-                            # Generate TTS for remaining text if any
-                            remaining_text = full_response[len(first_sentence):].strip()
-                            if remaining_text and remaining_text not in ["", "."]:
-                                print(f"{timestamp()} 🔊 TTS: Generating remaining audio")
-                                remaining_audio_url = await generate_tts_audio_fast(remaining_text)
-                                if remaining_audio_url and gen_id == current_generation_id:
-                                    # Mark that agent is speaking (in case first chunk didn't exist)
-                                    audio_handler.set_agent_speaking(True)
-                                    await websocket.send_json({
-                                        "type": "audio_chunk",
-                                        "audio_url": remaining_audio_url,
-                                        "text": remaining_text,
-                                        "timestamp": time.time()
-                                    })
-                                elif gen_id != current_generation_id:
-                                    print(f"{timestamp()} ⏭️  Skipping remaining audio - generation ID mismatch")
+                            # Wait for all audio to be delivered in order
+                            first_audio_at = await delivery_task
+                            if first_audio_at:
+                                first_audio_time = first_audio_at - response_pipeline_start
+                                first_audio_estimate = (first_audio_time if first_audio_estimate is None
+                                                        else 0.7 * first_audio_estimate + 0.3 * first_audio_time)
                             
                             # Add complete response to conversation
                             if gen_id == current_generation_id:
-                                conversation.append({"role": "assistant", "content": full_response})
+                                conversation.add("assistant", full_response)
+                            # Keep the next prompt within budget; summarizing happens in the background
+                            conversation.refresh()
                             
                             # Send stream complete
                             await websocket.send_json({
@@ -207,6 +463,8 @@ async def websocket_endpoint(websocket: WebSocket):
                                 print(f"    • Total: {total_time:.2f}s\n")
                             else:
                                 print(f"{timestamp()} 📊 No audio generated - text-only response ({total_time:.2f}s)\n")
+                                # No playback ack will follow (a filler clip's was ignored while this was pending)
+                                audio_handler.set_agent_speaking(False)
                             
                             # Resume listening for user input
                             audio_handler.resume_listening()
@@ -221,6 +479,16 @@ async def websocket_endpoint(websocket: WebSocket):
                             })
                             audio_handler.resume_listening()
                             raise
+                        finally:
+                            # Stop synthesizing and delivering audio for an abandoned response
+                            if pipeline:
+                                pipeline.cancel()
+                            if delivery_task and not delivery_task.done():
+                                delivery_task.cancel()
+                            # A clip still waiting to play has nothing left to cover
+                            if filler and filler["gen_id"] == gen_id and not filler["playing"]:
+                                filler["task"].cancel()
+                            await tts_resources.aclose()
                     
                     # Cancel any existing stream task if it's still running
                     if active_stream_task and not active_stream_task.done():
@@ -273,7 +541,25 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 if data.get("type") == "audio_config":
                     # Client is configuring audio settings
-                    print(f"{timestamp()} ⚙️  Audio config received")
+                    tts_streaming = bool(data.get("tts_streaming", False))
+                    if tts_streaming and not TTS_PIPELINE_CONFIG["binary_streaming"]:
+                        # The ack below tells the client to expect audio URLs instead
+                        print(f"{timestamp()} ⚠️  Client asked for binary audio frames, but TTS_BINARY_STREAMING is off")
+                        tts_streaming = False
+                    tts_text_input = data.get("tts_input", TTS_STREAM_INPUT_CONFIG["default_input"]) == "text_stream"
+                    call_sample_rate = int(data.get("sampleRate") or data.get("sample_rate") or 8000)
+                    tts_format = negotiate_tts_format(data.get("tts_format"), call_sample_rate, tts_streaming)
+                    print(f"{timestamp()} ⚙️  Audio config received (TTS delivery: {'stream' if tts_streaming else 'url'}, "
+                          f"input: {'text_stream' if tts_streaming and tts_text_input else 'segments'}, "
+                          f"format: {tts_format.elevenlabs})")
+                    # Tell the client what it will actually receive
+                    await websocket.send_json({
+                        "type": "audio_config_ack",
+                        "tts_streaming": tts_streaming,
+                        "tts_format": tts_format.describe(),
+                        "timestamp": time.time()
+                    })
+                    prepare_filler_clips()
                     
                 elif data.get("type") == "agent_config":
                     # Client is setting agent configuration
@@ -281,6 +567,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     if agent_id and agent_id in agents_db:
                         current_agent = agents_db[agent_id]
                         print(f"{timestamp()} 🤖 Agent configured: {current_agent['name']}")
+                        prepare_filler_clips()
                     
                 elif data.get("type") == "call_started":
                     # User started the call - send greeting if configured
@@ -288,7 +575,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     
                     if current_agent and current_agent.get("greeting"):
                         # Add greeting to conversation history
-                        conversation.append({"role": "assistant", "content": current_agent["greeting"]})
+                        conversation.add("assistant", current_agent["greeting"])
                         
                         # Send greeting to frontend
                         await websocket.send_json({
@@ -297,25 +584,38 @@ async def websocket_endpoint(websocket: WebSocket):
                             "timestamp": time.time()
                         })
                         
-                        # Generate TTS for greeting
-                        greeting_audio_url = await generate_tts_audio_fast(current_agent["greeting"])
-                        if greeting_audio_url:
-                            # Pause listening while agent speaks greeting
+                        # Greeting audio is normally pre-rendered when the agent is saved
+                        greeting_format = tts_format if tts_streaming else MP3
+                        greeting_audio = get_greeting_audio(current_agent, greeting_format)
+                        greeting_render = None
+                        if greeting_audio is None:
+                            # Not rendered yet (or not in this format) - render it now, which also serves later calls
+                            print(f"{timestamp()} ⚠️  No pre-rendered greeting ({greeting_format.elevenlabs}), rendering now")
+                            greeting_render = schedule_greeting_render(current_agent, greeting_format, TTSPriority.GREETING)
+                        
+                        if tts_streaming:
+                            # Stream greeting audio in the background so the receive loop keeps reading
+                            # (a live stream joins the render's upstream generation)
                             audio_handler.pause_listening()
-                            # Mark agent as speaking before sending audio
-                            audio_handler.set_agent_speaking(True)
-                            await websocket.send_json({
-                                "type": "greeting_audio",
-                                "audio_url": greeting_audio_url,
-                                "timestamp": time.time()
-                            })
+                            greeting_task = asyncio.create_task(stream_tts_to_client(
+                                current_agent["greeting"], current_generation_id, "greeting",
+                                replay_audio(greeting_audio) if greeting_audio else None
+                            ))
+                        else:
+                            greeting_task = asyncio.create_task(send_greeting_url(current_generation_id, greeting_render))
+                        active_tasks.add(greeting_task)
+                        greeting_task.add_done_callback(lambda t: active_tasks.discard(t))
                     
                 elif data.get("type") == "audio_playback_complete":
                     # Frontend finished playing audio
-                    print(f"{timestamp()} 🔇 Audio playback complete")
-                    audio_handler.set_agent_speaking(False)
-                    # Resume listening after any audio playback (greeting or response)
-                    audio_handler.resume_listening()
+                    if data.get("kind") == "filler" and active_stream_task and not active_stream_task.done():
+                        # Only the clip covering the gap has finished - the response audio is still to come
+                        print(f"{timestamp()} 💬 Filler clip playback complete, response still pending")
+                    else:
+                        print(f"{timestamp()} 🔇 Audio playback complete")
+                        audio_handler.set_agent_speaking(False)
+                        # Resume listening after any audio playback (greeting or response)
+                        audio_handler.resume_listening()
                     
                 elif data.get("type") == "interrupt":
                     # Cancel all active tasks
@@ -328,17 +628,19 @@ async def websocket_endpoint(websocket: WebSocket):
                     current_generation_id += 1  # Increment ID to invalidate old responses
                     
             elif "bytes" in message:
-                # Binary audio data
+                # Binary audio data - queued so reads never wait on VAD or upstream latency
                 audio_data = message["bytes"]
-                await audio_handler.add_audio(audio_data)
+                audio_handler.enqueue_audio(audio_data)
                     
     except WebSocketDisconnect:
         print(f"{timestamp()} 🔌 Client disconnected")
         transcript_task.cancel()
+        conversation.close()
         await audio_handler.stop()
     except Exception as e:
         print(f"{timestamp()} ❌ WebSocket error: {type(e).__name__}: {e}")
         import traceback
         traceback.print_exc()
         transcript_task.cancel()
+        conversation.close()
         await audio_handler.stop()
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Compiled per-agent prompt profiles for Gemini"""
+import hashlib
+import inspect
+import json
+from typing import Dict, List, Optional
+import google.generativeai as genai
+from config.settings import GEMINI_MODEL
+from services.knowledge_service import inline_knowledge
+from utils.helpers import timestamp
+
+DEFAULT_PERSONA = "You are a conversational voice assistant."
+
+VOICE_INSTRUCTIONS = [
+    "Respond as a real person having a natural conversation. Do NOT identify yourself as an AI or language model.",
+    "Your output will be converted to speech, so write EXACTLY what should be spoken.",
+    "Do NOT write symbols like *, =, #, etc. Spell them out if needed (e.g., 'asterisk', 'equals', 'hashtag').",
+    "Keep responses conversational and natural. Avoid formal or robotic language.",
+    "Do NOT apologize for delays or processing time - the user experiences instant responses.",
+    "Be concise. This is a voice conversation, not a text chat.",
+]
+
+BEHAVIOR_INSTRUCTIONS = {
+    "professional": "Be professional, courteous, and helpful while maintaining focus.",
+    "character": "Maintain your character and persona throughout the conversation.",
+    "chatty": "Be friendly and conversational, as if speaking with a close companion.",
+    "concise": "Provide quick, straightforward answers without unnecessary details.",
+    "empathetic": "Be caring and compassionate, showing emotional intelligence.",
+}
+
+RETRIEVED_KNOWLEDGE_INSTRUCTION = "Relevant excerpts from your knowledge base are included with each user message."
+GUARDRAILS_INSTRUCTION = "IMPORTANT: Only use information from the provided knowledge base. Do not make up or guess information."
+
+# Newer SDKs take the system instruction on the model; older ones get it as a fixed opening exchange
+SUPPORTS_SYSTEM_INSTRUCTION = "system_instruction" in inspect.signature(genai.GenerativeModel.__init__).parameters
+INSTRUCTION_ACK = "Understood."
+SUMMARY_PREAMBLE = "Summary of the call so far:"
+
+
+def build_system_instruction(agent_config: Optional[dict]) -> str:
+    """System instruction for an agent (or the default assistant)"""
+    if not agent_config:
+        return "\n".join([DEFAULT_PERSONA, "", "IMPORTANT INSTRUCTIONS:"] + [f"- {line}" for line in VOICE_INSTRUCTIONS])
+
+    parts = [agent_config.get("system_prompt", DEFAULT_PERSONA), "\n\nIMPORTANT INSTRUCTIONS:"]
+    parts.extend(f"\n- {line}" for line in VOICE_INSTRUCTIONS)
+    behavior = BEHAVIOR_INSTRUCTIONS.get(agent_config.get("behavior", "professional"))
+    if behavior:
+        parts.append(f"\n{behavior}")
+    # Uploaded documents, and knowledge too large to send every turn, are retrieved per turn (see knowledge_service)
+    retrieved = agent_config.get("knowledge_resources", 0) > 0
+    if agent_config.get("custom_knowledge"):
+        if inline_knowledge(agent_config):
+            parts.append(f"\n\nKnowledge base:\n{agent_config['custom_knowledge']}")
+        else:
+            retrieved = True
+    if retrieved:
+        parts.append(f"\n\n{RETRIEVED_KNOWLEDGE_INSTRUCTION}")
+    if agent_config.get("guardrails_enabled"):
+        parts.append(f"\n\n{GUARDRAILS_INSTRUCTION}")
+    return "".join(parts)
+
+
+class AgentProfile:
+    """Everything about an agent's prompt that stays fixed between turns, built once per agent version.
+
+    Turns are sent as structured contents after the system instruction, so
+    the instruction is an identical prefix on every request rather than
+    text re-assembled around the history each turn.
+    """
+
+    def __init__(self, agent_config: Optional[dict]):
+        self.agent_id = agent_config.get("id") if agent_config else None
+        self.system_instruction = build_system_instruction(agent_config)
+        if SUPPORTS_SYSTEM_INSTRUCTION:
+            self.model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=self.system_instruction)
+            self.prefix = []
+        else:
+            self.model = genai.GenerativeModel(GEMINI_MODEL)
+            self.prefix = [
+                {"role": "user", "parts": [self.system_instruction]},
+                {"role": "model", "parts": [INSTRUCTION_ACK]},
+            ]
+
+    def contents(self, history: List[dict], user_message: str, passages: Optional[List[str]] = None,
+                 summary: str = "") -> List[dict]:
+        """Multi-turn contents for a request: the fixed prefix, a summary of earlier turns, recent turns,
+        then the new user message (preceded by any retrieved knowledge passages)"""
+        contents = [dict(turn, parts=list(turn["parts"])) for turn in self.prefix]
+        messages = list(history)
+        if summary:
+            messages.insert(0, {"role": "user", "content": f"{SUMMARY_PREAMBLE}\n{summary}"})
+        if passages:
+            excerpts = "\n\n".join(passages)
+            messages.append({"role": "user", "content": f"Knowledge base excerpts:\n{excerpts}"})
+        messages.append({"role": "user", "content": user_message})
+        for message in messages:
+            role = "user" if message["role"] == "user" else "model"
+            if contents and contents[-1]["role"] == role:
+                # Gemini expects alternating roles - merge consecutive messages from one side
+                contents[-1]["parts"].append(message["content"])
+            else:
+                contents.append({"role": role, "parts": [message["content"]]})
+        return contents
+
+
+# Compiled profiles by agent id; configs without an id are keyed by their content
+_profiles: Dict[str, AgentProfile] = {}
+DEFAULT_PROFILE_KEY = "default:assistant"
+
+
+def profile_key(agent_config: Optional[dict]) -> str:
+    """Cache key for a profile - never shared between the default assistant and an id-less config"""
+    if not agent_config:
+        return DEFAULT_PROFILE_KEY
+    if agent_config.get("id"):
+        return agent_config["id"]
+    content = json.dumps(agent_config, sort_keys=True, default=str)
+    return "config:" + hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_agent_profile(agent_config: Optional[dict]) -> AgentProfile:
+    """The agent's compiled profile, building it on first use"""
+    key = profile_key(agent_config)
+    profile = _profiles.get(key)
+    if profile is None:
+        profile = _profiles[key] = AgentProfile(agent_config)
+        print(f"{timestamp()} 🧩 Compiled prompt profile for {agent_config.get('name') if agent_config else 'default assistant'} "
+              f"({len(profile.system_instruction)} chars)")
+    return profile
+
+
+def invalidate_agent_profile(agent_id: str):
+    """Drop an agent's profile after it changed; the next turn recompiles it"""
+    _profiles.pop(agent_id, None)
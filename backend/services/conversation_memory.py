@@ -0,0 +1,128 @@
+"""Token-budgeted conversation history for the LLM prompt"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+from config.settings import CONVERSATION_MEMORY_CONFIG
+from utils.helpers import timestamp
+
+# Role and turn markup around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# (previous summary, messages to fold in) -> updated summary
+Summarizer = Callable[[str, List[dict]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count: about four characters per token, and at least one per word"""
+    return max((len(text) + 3) // 4, len(text.split()))
+
+
+def message_tokens(message: dict) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def recent_messages(messages: List[dict], budget_tokens: int = CONVERSATION_MEMORY_CONFIG["budget_tokens"],
+                    min_messages: int = CONVERSATION_MEMORY_CONFIG["min_recent_messages"]) -> List[dict]:
+    """The newest messages that fit in the budget (at least min_messages)"""
+    used, start = 0, len(messages)
+    while start > 0:
+        used += message_tokens(messages[start - 1])
+        if used > budget_tokens and len(messages) - start >= min_messages:
+            break
+        start -= 1
+    return messages[start:]
+
+
+def clip_summary(summary: str, max_tokens: int) -> str:
+    """Keep the newest part of a summary that fits in max_tokens"""
+    if estimate_tokens(summary) <= max_tokens:
+        return summary
+    words = summary.split()
+    while words and estimate_tokens(" ".join(words)) > max_tokens:
+        words = words[max(len(words) // 10, 1):]
+    return "... " + " ".join(words)
+
+
+class ConversationMemory:
+    """One call's conversation, sized for the LLM prompt.
+
+    Recent messages are kept verbatim while they fit in ``budget_tokens``.
+    After each turn, ``refresh()`` moves the oldest ones out and folds them
+    into a running summary in the background, so the prompt stays about
+    the same size however long the call runs. Messages waiting to be folded
+    stay in ``history()``, so nothing drops out of the prompt while the
+    summary is being written.
+    """
+
+    def __init__(self, summarize: Optional[Summarizer] = None,
+                 budget_tokens: int = CONVERSATION_MEMORY_CONFIG["budget_tokens"],
+                 summary_tokens: int = CONVERSATION_MEMORY_CONFIG["summary_tokens"],
+                 min_recent_messages: int = CONVERSATION_MEMORY_CONFIG["min_recent_messages"]):
+        self.summarize = summarize
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.min_recent_messages = min_recent_messages
+        self.summary = ""
+        self.messages: List[dict] = []  # Verbatim, oldest first
+        self.recent_tokens = 0
+        self._folding: List[dict] = []  # Moved out of messages, not yet in the summary
+        self._refresh: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.messages_added = 0
+        self.summaries = 0
+
+    def add(self, role: str, content: str):
+        """Record a message ("user" or "assistant")"""
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        self.recent_tokens += message_tokens(message)
+        self.messages_added += 1
+
+    def history(self) -> List[dict]:
+        """Messages not yet covered by the summary, oldest first"""
+        return self._folding + self.messages
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Approximate size of the summary plus history"""
+        return estimate_tokens(self.summary) + sum(message_tokens(message) for message in self.history())
+
+    def refresh(self):
+        """Fold messages beyond the budget into the summary, off the critical path (call after each turn)"""
+        while self.recent_tokens > self.budget_tokens and len(self.messages) > self.min_recent_messages:
+            message = self.messages.pop(0)
+            self.recent_tokens -= message_tokens(message)
+            self._folding.append(message)
+        if self._folding and (self._refresh is None or self._refresh.done()):
+            self._refresh = asyncio.create_task(self._fold())
+
+    def _fold_verbatim(self, messages: List[dict]) -> str:
+        """Summary without an LLM: the transcript itself, clipped to the summary budget"""
+        lines = [f"{'User' if message['role'] == 'user' else 'Agent'}: {message['content']}" for message in messages]
+        return " ".join(filter(None, [self.summary] + lines))
+
+    async def _fold(self):
+        while self._folding:
+            batch = list(self._folding)
+            summary = None
+            if self.summarize:
+                try:
+                    summary = await self.summarize(self.summary, batch)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"{timestamp()} ⚠️  Conversation summary failed, keeping transcript excerpt: {e}")
+            self.summary = clip_summary(summary or self._fold_verbatim(batch), self.summary_tokens)
+            del self._folding[:len(batch)]
+            self.summaries += 1
+            print(f"{timestamp()} 🧠 Folded {len(batch)} messages into the conversation summary "
+                  f"(prompt history now ~{self.prompt_tokens} tokens)")
+
+    async def wait_refreshed(self):
+        """Wait for a background summary refresh to finish"""
+        if self._refresh:
+            await asyncio.gather(self._refresh, return_exceptions=True)
+
+    def close(self):
+        if self._refresh:
+            self._refresh.cancel()
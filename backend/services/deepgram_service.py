@@ -5,8 +5,9 @@ import ssl
 import os
 from typing import Callable
 from deepgram import DeepgramClient, DeepgramClientOptions, LiveOptions, LiveResultResponse, LiveTranscriptionEvents
-from config.settings import DEEPGRAM_API_KEY
+from config.settings import DEEPGRAM_API_KEY, DEEPGRAM_FINALIZE_TIMEOUT, DEEPGRAM_POOL_CONFIG, STREAMING_CONFIG
 from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
 
 # Fix SSL certificate issues on macOS
 try:
@@ -18,6 +19,9 @@ except ImportError:
     print("⚠️  certifi not installed - SSL verification may fail")
     print("  Run: pip install certifi")
 
+# Time from sending finalize() to receiving the final result
+finalize_latency = LatencyHistogram("deepgram_finalize")
+
 # Configure Deepgram client
 if DEEPGRAM_API_KEY:
     try:
@@ -37,17 +41,49 @@ else:
     deepgram_client = None
 
 
+def build_live_options() -> LiveOptions:
+    """Default streaming options for 8kHz call audio"""
+    return LiveOptions(
+        model="nova-2",
+        language="en-US",
+        punctuate=True,
+        smart_format=True,
+        encoding="linear16",
+        sample_rate=8000,
+        channels=1,
+        endpointing=False,  # We handle our own endpointing with VAD
+        interim_results=True,  # Get partial results for lower latency
+        utterance_end_ms=2000,  # Safety fallback (2s)
+        vad_events=False,  # We use our own VAD
+        filler_words=False,  # Remove filler words for cleaner transcripts
+        diarize=False,  # Disable speaker detection for speed
+    )
+
+
 class DeepgramStreamingTranscriber:
     """Handle streaming transcription with Deepgram"""
     
-    def __init__(self, on_transcript: Callable[[str], None], on_interim: Callable[[str], None] = None):
+    def __init__(self, on_transcript: Callable[[str], None] = None, on_interim: Callable[[str], None] = None,
+                 options: LiveOptions = None):
         self.on_transcript = on_transcript
         self.on_interim = on_interim  # Callback for interim results
+        self.options = options or build_live_options()
         self.connection = None
         self.is_connected = False
+        self.connected_event = asyncio.Event()  # Set by the Open event
+        self.connected_at = None
         self.transcript_buffer = ""
         self.interim_transcript = ""  # Track current interim transcript
+        self.finalize_future = None  # Pending finalize request, if any
+        self.unfinalized_audio = False  # Audio sent that Deepgram has not confirmed with a finalize result
         self.keep_alive_task = None
+    
+    def bind(self, on_transcript: Callable[[str], None] = None, on_interim: Callable[[str], None] = None):
+        """Attach (or detach) session callbacks and clear transcript state - used when pooling connections"""
+        self.on_transcript = on_transcript
+        self.on_interim = on_interim
+        self.transcript_buffer = ""
+        self.interim_transcript = ""
         
     async def connect(self):
         """Connect to Deepgram streaming API"""
@@ -66,26 +102,12 @@ class DeepgramStreamingTranscriber:
                 print(f"     • Key length: {len(DEEPGRAM_API_KEY)} chars")
             
             # Configure streaming options
-            options = LiveOptions(
-                model="nova-2",
-                language="en-US",
-                punctuate=True,
-                smart_format=True,
-                encoding="linear16",
-                sample_rate=8000,
-                channels=1,
-                endpointing=False,  # We handle our own endpointing with VAD
-                interim_results=True,  # Get partial results for lower latency
-                utterance_end_ms=2000,  # Safety fallback (2s)
-                vad_events=False,  # We use our own VAD
-                filler_words=False,  # Remove filler words for cleaner transcripts
-                diarize=False,  # Disable speaker detection for speed
-            )
+            options = self.options
             
             print(f"{timestamp()} 📋 Streaming options:")
-            print(f"     • Model: nova-2")
-            print(f"     • Sample rate: 8000 Hz")
-            print(f"     • Encoding: linear16")
+            print(f"     • Model: {options.model}")
+            print(f"     • Sample rate: {options.sample_rate} Hz")
+            print(f"     • Encoding: {options.encoding}")
             
             # Create websocket connection
             print(f"{timestamp()} 🔌 Creating WebSocket connection...")
@@ -114,23 +136,19 @@ class DeepgramStreamingTranscriber:
                     print(f"{timestamp()} 📋 Status code: {e.status_code}")
                 raise
             
-            # Wait for connection to be established
-            max_wait = 2.0  # Maximum 2 seconds to wait
-            wait_time = 0.0
-            while not self.is_connected and wait_time < max_wait:
-                await asyncio.sleep(0.1)
-                wait_time += 0.1
+            # Wait for the Open event (maximum 2 seconds)
+            try:
+                await asyncio.wait_for(self.connected_event.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                pass
             
-            # Send initial audio immediately to prevent timeout
+            # Send a KeepAlive immediately to prevent timeout (instead of billable silent audio)
             if self.is_connected:
-                print(f"{timestamp()} 🎵 Sending initial audio to establish connection")
                 try:
-                    # Generate 200ms of silence (8000 Hz, 16-bit, mono = 3200 bytes)
-                    silence = b'\x00\x00' * 1600  # 3200 bytes of silence
-                    await self.connection.send(silence)
-                    print(f"{timestamp()} ✅ Initial audio sent successfully")
+                    if not await self.connection.keep_alive():
+                        raise Exception("KeepAlive message not sent")
                 except Exception as e:
-                    print(f"{timestamp()} ⚠️  Initial audio failed: {e}")
+                    print(f"{timestamp()} ⚠️  Initial KeepAlive failed: {e}")
                     self.is_connected = False
             
             # Final connection check
@@ -148,11 +166,15 @@ class DeepgramStreamingTranscriber:
             traceback.print_exc()
             return False
     
-    async def send_audio(self, audio_chunk: bytes):
-        """Send audio chunk to Deepgram with error handling"""
+    async def send_audio(self, audio_chunk: bytes) -> bool:
+        """Send audio chunk to Deepgram with error handling, returning whether it was sent"""
         if self.connection and self.is_connected:
             try:
-                await self.connection.send(audio_chunk)
+                # The SDK reports a closed socket by returning False rather than raising
+                if not await self.connection.send(audio_chunk):
+                    raise ConnectionError("Deepgram connection is not open")
+                self.unfinalized_audio = True
+                return True
             except Exception as e:
                 print(f"{timestamp()} ❌ Error sending audio to Deepgram: {e}")
                 # Mark connection as failed
@@ -160,17 +182,27 @@ class DeepgramStreamingTranscriber:
                 # Cancel keep-alive
                 if self.keep_alive_task and not self.keep_alive_task.done():
                     self.keep_alive_task.cancel()
+        return False
     
-    async def finalize(self) -> str:
+    async def finalize(self, timeout: float = None) -> str:
         """Finalize the current utterance and get the final transcript"""
+        if timeout is None:
+            timeout = DEEPGRAM_FINALIZE_TIMEOUT
         if self.connection and self.is_connected:
+            # Resolved by _on_transcript when the result answering this finalize arrives
+            self.finalize_future = asyncio.get_running_loop().create_future()
+            start_time = time.time()
             try:
                 # The SDK v4+ uses finalize() method instead of sending a message
                 await self.connection.finalize()
-                # Wait a shorter time for final results
-                await asyncio.sleep(0.1)
+                await asyncio.wait_for(self.finalize_future, timeout=timeout)
+                finalize_latency.record(time.time() - start_time)
+            except asyncio.TimeoutError:
+                print(f"{timestamp()} ⚠️  Finalize result not received within {timeout * 1000:.0f}ms")
             except Exception as e:
                 print(f"{timestamp()} ❌ Error finalizing transcript: {e}")
+            finally:
+                self.finalize_future = None
         
         # Return only the accumulated transcript buffer
         # Don't append interim as it's usually already included in finals
@@ -194,6 +226,7 @@ class DeepgramStreamingTranscriber:
     async def disconnect(self):
         """Disconnect from Deepgram"""
         self.is_connected = False
+        self.connected_event.clear()
         
         # Cancel keep-alive task
         if self.keep_alive_task and not self.keep_alive_task.done():
@@ -211,6 +244,8 @@ class DeepgramStreamingTranscriber:
         """Handle connection open event"""
         print(f"{timestamp()} ✅ Deepgram streaming connection established")
         self.is_connected = True
+        self.connected_at = time.time()
+        self.connected_event.set()
         # Start keep-alive task
         self.keep_alive_task = asyncio.create_task(self._keep_alive())
     
@@ -234,6 +269,12 @@ class DeepgramStreamingTranscriber:
                     # Callback with the partial transcript
                     if self.on_transcript:
                         self.on_transcript(transcript)
+                
+                # This final result answers our finalize request - the utterance is complete
+                if result.from_finalize:
+                    self.unfinalized_audio = False
+                    if self.finalize_future and not self.finalize_future.done():
+                        self.finalize_future.set_result(None)
             else:
                 # Interim results for lower latency feedback
                 if transcript:
@@ -247,6 +288,7 @@ class DeepgramStreamingTranscriber:
         """Handle connection close event"""
         print(f"{timestamp()} 🔌 Deepgram streaming connection closed")
         self.is_connected = False
+        self.connected_event.clear()
         # Cancel keep-alive task
         if self.keep_alive_task and not self.keep_alive_task.done():
             self.keep_alive_task.cancel()
@@ -257,18 +299,18 @@ class DeepgramStreamingTranscriber:
         print(f"{timestamp()} 📋 Error details: {kwargs}")
     
     async def _keep_alive(self):
-        """Send periodic audio to prevent timeout"""
+        """Send periodic KeepAlive control messages to prevent timeout (no billable audio)"""
         consecutive_failures = 0
         while self.is_connected:
             try:
-                # Send audio every 5 seconds (more frequent than 10s timeout)
-                await asyncio.sleep(5)
+                # Send well within Deepgram's 10s no-data timeout
+                await asyncio.sleep(STREAMING_CONFIG["keepalive_interval_seconds"])
                 if self.is_connected and self.connection:
-                    # Send silent audio to keep connection alive
-                    # 50ms of silence at 8000 Hz (smaller chunk)
-                    silence = b'\x00\x00' * 400
-                    await self.connection.send(silence)
+                    if not await self.connection.keep_alive():
+                        raise Exception("KeepAlive message not sent")
                     consecutive_failures = 0  # Reset on success
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 consecutive_failures += 1
                 print(f"{timestamp()} ⚠️  Keep-alive error ({consecutive_failures}): {e}")
@@ -278,3 +320,147 @@ class DeepgramStreamingTranscriber:
                     break
 
 
+class DeepgramConnectionPool:
+    """Process-level pool of pre-connected streaming transcribers, keyed by LiveOptions.
+
+    Sessions borrow a ready connection when their websocket is accepted, so
+    the first utterance doesn't pay for the TLS and websocket handshake, and
+    hand it back on disconnect. A background task keeps each pool at its warm
+    size, dropping connections that have closed or reached their maximum age.
+    """
+    
+    def __init__(self, warm_size: int, max_age_seconds: float, health_check_interval: float):
+        self.warm_size = warm_size
+        self.max_age_seconds = max_age_seconds
+        self.health_check_interval = health_check_interval
+        self.idle = {}  # options key -> list of idle transcribers
+        self.options = {}  # options key -> LiveOptions
+        self.warming = {}  # options key -> connections currently being opened
+        self.health_task = None
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+    
+    @staticmethod
+    def _key(options: LiveOptions) -> str:
+        return options.to_json()
+    
+    def _is_healthy(self, transcriber: DeepgramStreamingTranscriber) -> bool:
+        return (transcriber.is_connected and transcriber.connected_at is not None
+                and time.time() - transcriber.connected_at < self.max_age_seconds)
+    
+    async def start(self, options: LiveOptions = None):
+        """Warm the pool for the given options and start health checks"""
+        if not deepgram_client or self.warm_size <= 0:
+            return
+        options = options or build_live_options()
+        key = self._key(options)
+        self.options[key] = options
+        self.idle.setdefault(key, [])
+        await self._replenish(key)
+        if not self.health_task:
+            self.health_task = asyncio.create_task(self._health_check())
+        print(f"{timestamp()} ♨️  Deepgram pool warm ({len(self.idle[key])}/{self.warm_size} connections)")
+    
+    async def acquire(self, on_transcript: Callable[[str], None] = None, on_interim: Callable[[str], None] = None,
+                      options: LiveOptions = None) -> DeepgramStreamingTranscriber:
+        """Borrow a connected transcriber, connecting a fresh one if none are warm"""
+        options = options or build_live_options()
+        key = self._key(options)
+        self.options.setdefault(key, options)
+        idle = self.idle.setdefault(key, [])
+        
+        transcriber = None
+        while idle:
+            candidate = idle.pop()
+            if self._is_healthy(candidate):
+                transcriber = candidate
+                break
+            self.recycled += 1
+            asyncio.create_task(candidate.disconnect())
+        
+        if transcriber:
+            self.hits += 1
+            transcriber.bind(on_transcript, on_interim)
+        else:
+            self.misses += 1
+            transcriber = DeepgramStreamingTranscriber(on_transcript, on_interim, options)
+            await transcriber.connect()
+        
+        # Top the pool back up without blocking the caller
+        if deepgram_client:
+            asyncio.create_task(self._replenish(key))
+        return transcriber
+    
+    async def release(self, transcriber: DeepgramStreamingTranscriber):
+        """Return a transcriber to the pool, or close it if unhealthy or the pool is full.
+
+        Deepgram may still hold audio from this session; its results must not
+        reach the next session to borrow the connection. Such a connection is
+        finalized first and only re-pooled once Deepgram confirms the flush.
+        """
+        key = self._key(transcriber.options)
+        idle = self.idle.setdefault(key, [])
+        if self._is_healthy(transcriber) and len(idle) < self.warm_size:
+            transcriber.bind(None, None)
+            if transcriber.unfinalized_audio:
+                await transcriber.finalize()
+            if (not transcriber.unfinalized_audio and self._is_healthy(transcriber)
+                    and len(idle) < self.warm_size):
+                transcriber.bind(None, None)
+                idle.append(transcriber)
+                return
+            print(f"{timestamp()} ♻️  Closing Deepgram connection with unflushed audio instead of re-pooling it")
+            self.recycled += 1
+        await transcriber.disconnect()
+    
+    async def _replenish(self, key: str):
+        """Open connections until the pool for key is back at its warm size"""
+        idle = self.idle.setdefault(key, [])
+        while len(idle) + self.warming.get(key, 0) < self.warm_size:
+            self.warming[key] = self.warming.get(key, 0) + 1
+            try:
+                transcriber = DeepgramStreamingTranscriber(options=self.options[key])
+                connected = await transcriber.connect()
+            finally:
+                self.warming[key] -= 1
+            if not connected:
+                print(f"{timestamp()} ⚠️  Deepgram pool could not open a warm connection")
+                await transcriber.disconnect()
+                return
+            idle.append(transcriber)
+    
+    async def _health_check(self):
+        """Periodically drop dead or expired idle connections and replenish"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                for key, idle in self.idle.items():
+                    for transcriber in [t for t in idle if not self._is_healthy(t)]:
+                        idle.remove(transcriber)
+                        self.recycled += 1
+                        await transcriber.disconnect()
+                    await self._replenish(key)
+            except Exception as e:
+                print(f"{timestamp()} ⚠️  Deepgram pool health check error: {e}")
+    
+    async def close(self):
+        """Stop health checks and close every idle connection"""
+        if self.health_task:
+            self.health_task.cancel()
+            self.health_task = None
+        for idle in self.idle.values():
+            while idle:
+                await idle.pop().disconnect()
+        print(f"{timestamp()} 📊 Deepgram pool: {self.hits} hits, {self.misses} misses, {self.recycled} recycled")
+        print(f"{timestamp()} 📊 {finalize_latency.summary()}")
+
+
+# Shared pool of warm streaming connections
+deepgram_pool = DeepgramConnectionPool(
+    warm_size=DEEPGRAM_POOL_CONFIG["warm_size"],
+    max_age_seconds=DEEPGRAM_POOL_CONFIG["max_age_seconds"],
+    health_check_interval=DEEPGRAM_POOL_CONFIG["health_check_interval"],
+)
@@ -0,0 +1,181 @@
+"""Async ElevenLabs TTS client on a long-lived pooled HTTP connection"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Optional
+import httpx
+from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
+
+
+class _RequestTrace:
+    """Connection events for one request, collected through httpcore's trace hook"""
+
+    def __init__(self):
+        self.new_connection = False
+        self.handshake_started = None
+        self.handshake_seconds = 0.0
+
+    async def __call__(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.started":
+            self.new_connection = True
+            self.handshake_started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self.handshake_started is not None:
+                self.handshake_seconds = time.perf_counter() - self.handshake_started
+
+
+class ElevenLabsClient:
+    """Text-to-speech over one shared httpx.AsyncClient.
+
+    Connections to the API are kept alive and reused between sentences, so
+    only the first request (or one after an idle timeout) pays for the TCP and
+    TLS handshake. ``start()`` opens a few connections up front and keeps them
+    warm while the server is idle.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://api.elevenlabs.io",
+                 max_connections: int = 16, warm_connections: int = 2,
+                 keepalive_expiry: float = 60.0, keep_warm_interval: float = 20.0):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.warm_connections = warm_connections
+        self.keep_warm_interval = keep_warm_interval
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"xi-api-key": api_key} if api_key else {},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(
+                connect=5.0,   # Establishing a connection
+                read=30.0,     # Long sentences take a while to synthesize
+                write=5.0,
+                pool=10.0      # Waiting for a free pooled connection
+            )
+        )
+        self._keep_warm_task = None
+        self._last_request_at = 0.0
+
+        # Statistics
+        self.requests = 0
+        self.new_connections = 0
+        self.handshake_time = LatencyHistogram("elevenlabs_handshake")
+        self.first_byte_time = LatencyHistogram("elevenlabs_first_byte")
+
+    @property
+    def reused_connections(self) -> int:
+        return self.requests - self.new_connections
+
+    async def start(self):
+        """Open warm connections and keep them alive in the background"""
+        if not self.api_key:
+            return
+        await self.warm(self.warm_connections)
+        if self.keep_warm_interval and not self._keep_warm_task:
+            self._keep_warm_task = asyncio.create_task(self._keep_warm())
+
+    async def warm(self, count: int = 1):
+        """Establish count connections with lightweight requests made in parallel"""
+        results = await asyncio.gather(*[self._ping() for _ in range(count)], return_exceptions=True)
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            print(f"{timestamp()} ⚠️  ElevenLabs warm-up failed: {failures[0]}")
+        else:
+            print(f"{timestamp()} 🔥 ElevenLabs: {count} connection(s) warm")
+
+    async def _ping(self):
+        trace = _RequestTrace()
+        response = await self.client.get("/v1/models", extensions={"trace": trace})
+        response.raise_for_status()
+        self._record(trace, count_request=False)
+
+    async def _keep_warm(self):
+        """Touch the pool when idle so the server does not close the connections"""
+        while True:
+            await asyncio.sleep(self.keep_warm_interval)
+            if time.monotonic() - self._last_request_at < self.keep_warm_interval:
+                continue
+            try:
+                await self._ping()
+            except Exception as e:
+                print(f"{timestamp()} ⚠️  ElevenLabs keep-warm failed: {e}")
+
+    def _record(self, trace: _RequestTrace, count_request: bool = True):
+        if count_request:
+            self.requests += 1
+            self._last_request_at = time.monotonic()
+            if trace.new_connection:
+                self.new_connections += 1
+        if trace.new_connection:
+            self.handshake_time.record(trace.handshake_seconds)
+
+    def _request(self, text: str, model_id: str, voice_settings: Dict, output_format: Optional[str],
+                 optimize_streaming_latency: Optional[int]) -> Dict:
+        params = {}
+        if output_format:
+            params["output_format"] = output_format
+        if optimize_streaming_latency is not None:
+            params["optimize_streaming_latency"] = optimize_streaming_latency
+        return {
+            "params": params,
+            "json": {"text": text, "model_id": model_id, "voice_settings": voice_settings},
+        }
+
+    async def synthesize(self, text: str, voice_id: str, model_id: str, voice_settings: Dict,
+                         output_format: Optional[str] = None) -> bytes:
+        """Generate the complete audio for text"""
+        trace = _RequestTrace()
+        start_time = time.perf_counter()
+        response = await self.client.post(
+            f"/v1/text-to-speech/{voice_id}",
+            extensions={"trace": trace},
+            **self._request(text, model_id, voice_settings, output_format, None)
+        )
+        self._record(trace)
+        response.raise_for_status()
+        self.first_byte_time.record(time.perf_counter() - start_time)
+        return response.content
+
+    async def stream(self, text: str, voice_id: str, model_id: str, voice_settings: Dict,
+                     output_format: Optional[str] = None,
+                     optimize_streaming_latency: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield audio chunks as the response body arrives"""
+        trace = _RequestTrace()
+        start_time = time.perf_counter()
+        async with self.client.stream(
+            "POST",
+            f"/v1/text-to-speech/{voice_id}/stream",
+            extensions={"trace": trace},
+            **self._request(text, model_id, voice_settings, output_format, optimize_streaming_latency)
+        ) as response:
+            self._record(trace)
+            if response.status_code != 200:
+                await response.aread()
+                response.raise_for_status()
+            first_chunk = True
+            async for chunk in response.aiter_bytes():
+                if first_chunk:
+                    first_chunk = False
+                    self.first_byte_time.record(time.perf_counter() - start_time)
+                yield chunk
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "handshake": self.handshake_time.summary(),
+            "first_byte": self.first_byte_time.summary(),
+        }
+
+    async def close(self):
+        if self._keep_warm_task:
+            self._keep_warm_task.cancel()
+            self._keep_warm_task = None
+        await self.client.aclose()
+        print(f"{timestamp()} 📊 ElevenLabs connections: {self.requests} requests, "
+              f"{self.reused_connections} reused, {self.new_connections} new")
+        print(f"{timestamp()} 📊 {self.handshake_time.summary()}")
+        print(f"{timestamp()} 📊 {self.first_byte_time.summary()}")
@@ -1,10 +1,26 @@
 """ElevenLabs TTS service integration"""
 import asyncio
+import hashlib
+import json
 import time
 import uuid
-from elevenlabs import generate, save, Voice, VoiceSettings
-from config.settings import ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL, AUDIO_DIR
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from config.settings import (ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL, ELEVENLABS_CLIENT_CONFIG,
+                             AUDIO_DIR, TTS_CACHE_CONFIG, TTS_STREAM_INPUT_CONFIG)
+from services.elevenlabs_client import ElevenLabsClient
+from services.elevenlabs_stream_input import StreamInputSession, stream_input_url
+from services.tts_formats import MP3, TTSFormat
+from services.tts_scheduler import TTSPriority, tts_scheduler
+from utils.audio_cache import AudioCache
 from utils.helpers import timestamp
+from utils.single_flight import SingleFlight
+
+# Use the fastest settings (lower stability for faster generation)
+VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+# Cached audio is replayed in chunks of this size when streaming
+CACHED_STREAM_CHUNK_BYTES = 16384
 
 # Configure ElevenLabs
 if ELEVENLABS_API_KEY:
@@ -12,12 +28,55 @@ if ELEVENLABS_API_KEY:
 else:
     print("✗ Warning: ELEVENLABS_API_KEY not found")
 
+# Shared pooled client - connections stay warm between sentences and calls
+tts_client = ElevenLabsClient(
+    ELEVENLABS_API_KEY,
+    base_url=ELEVENLABS_CLIENT_CONFIG["base_url"],
+    max_connections=ELEVENLABS_CLIENT_CONFIG["max_connections"],
+    warm_connections=ELEVENLABS_CLIENT_CONFIG["warm_connections"],
+    keepalive_expiry=ELEVENLABS_CLIENT_CONFIG["keepalive_expiry"],
+    keep_warm_interval=ELEVENLABS_CLIENT_CONFIG["keep_warm_interval"],
+)
+
+# Shared TTS audio cache
+tts_cache = AudioCache(
+    TTS_CACHE_CONFIG["disk_dir"],
+    memory_bytes=TTS_CACHE_CONFIG["memory_bytes"],
+    disk_bytes=TTS_CACHE_CONFIG["disk_bytes"],
+    pin_seconds=TTS_CACHE_CONFIG["pin_seconds"],
+) if TTS_CACHE_CONFIG["enabled"] else None
+
+# Concurrent identical requests (e.g. a burst of calls to one agent) share one upstream generation
+tts_flight = SingleFlight()
+
+
+def tts_cache_key(text: str, voice_id: str = ELEVENLABS_VOICE_ID, model: str = ELEVENLABS_MODEL,
+                  settings: dict = VOICE_SETTINGS, output_format: str = MP3.elevenlabs) -> str:
+    """Content hash identifying the audio ElevenLabs would generate, suffixed with its output format"""
+    payload = json.dumps([text, voice_id, model, settings, output_format], sort_keys=True, ensure_ascii=False)
+    return f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.{output_format}"
 
-async def generate_tts_audio_fast(text: str) -> str:
+
+async def generate_tts_audio_fast(text: str, priority: TTSPriority = TTSPriority.FIRST_CHUNK,
+                                  agent_id: Optional[str] = None) -> str:
     """Generate TTS audio using ElevenLabs API with optimizations"""
     if not ELEVENLABS_API_KEY:
         return None
     
+    # Serve repeated phrases (greetings, short replies) without an upstream call
+    cache_key = tts_cache_key(text)
+    if tts_cache:
+        # Pinned until the client fetches it, so disk eviction can't 404 the URL mid-turn
+        cached_path = await tts_cache.get_file(cache_key, pin=True)
+        if cached_path:
+            print(f"{timestamp()} ⚡ TTS: Cache hit for '{text[:50]}...'")
+            return f"/audio/cache/{cache_key}"
+    
+    return await tts_flight.do(cache_key, lambda: _generate_audio_url(text, cache_key, priority, agent_id))
+
+
+async def _generate_audio_url(text: str, cache_key: str, priority: TTSPriority, agent_id: Optional[str]) -> str:
+    """Synthesize text upstream and return the URL of the saved audio"""
     try:
         start_time = time.time()
         
@@ -27,36 +86,109 @@ async def generate_tts_audio_fast(text: str) -> str:
         
         print(f"{timestamp()} 🔊 TTS: Generating audio for '{text[:50]}...'")
         
-        # Use the fastest settings
-        voice_settings = VoiceSettings(
-            stability=0.5,  # Lower for faster generation
-            similarity_boost=0.75
-        )
-        
-        # Run the blocking ElevenLabs API call in a thread pool
-        loop = asyncio.get_event_loop()
-        audio = await loop.run_in_executor(
-            None,  # Use default thread pool
-            lambda: generate(
-                api_key=ELEVENLABS_API_KEY,
-                text=text,
-                voice=Voice(
-                    voice_id=ELEVENLABS_VOICE_ID,
-                    settings=voice_settings
-                ),
-                model=ELEVENLABS_MODEL
-            )
-        )
-        
-        # Save audio to file
-        await loop.run_in_executor(None, save, audio, str(audio_path))
+        # Pooled async request, admitted in priority order
+        async with tts_scheduler.slot(priority, agent_id):
+            audio = await tts_client.synthesize(text, ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL, VOICE_SETTINGS)
         
         generation_time = time.time() - start_time
         print(f"{timestamp()} ✓ TTS: Complete in {generation_time:.2f}s")
         
+        # Cache entry doubles as the served file, unless it is too large for the disk tier
+        if tts_cache and await tts_cache.put(cache_key, audio, pin=True):
+            return f"/audio/cache/{cache_key}"
+        
+        # Save audio to file
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, audio_path.write_bytes, audio)
+        
         # Return URL path for the audio file
         return f"/audio/{audio_id}"
         
     except Exception as e:
         print(f"{timestamp()} ❌ TTS error: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def stream_tts_audio(text: str, priority: TTSPriority = TTSPriority.FIRST_CHUNK,
+                           agent_id: Optional[str] = None, tts_format: TTSFormat = MP3) -> AsyncIterator[bytes]:
+    """Stream TTS audio chunks in the session's output format from ElevenLabs as they are generated"""
+    if not ELEVENLABS_API_KEY:
+        return
+    
+    cache_key = tts_cache_key(text, output_format=tts_format.elevenlabs)
+    if tts_cache:
+        cached = await tts_cache.get(cache_key)
+        if cached is not None:
+            print(f"{timestamp()} ⚡ TTS: Cache hit for '{text[:50]}...'")
+            for offset in range(0, len(cached), CACHED_STREAM_CHUNK_BYTES):
+                yield cached[offset:offset + CACHED_STREAM_CHUNK_BYTES]
+            return
+    
+    async for chunk in tts_flight.stream(cache_key, lambda: _stream_upstream(text, cache_key, priority, agent_id, tts_format)):
+        yield chunk
+
+
+async def _stream_upstream(text: str, cache_key: str, priority: TTSPriority,
+                           agent_id: Optional[str], tts_format: TTSFormat) -> AsyncIterator[bytes]:
+    """Stream text from ElevenLabs, caching the audio once the stream completes"""
+    start_time = time.time()
+    first_chunk = True
+    received = []
+    
+    # The stream occupies a TTS slot until it completes
+    async with tts_scheduler.slot(priority, agent_id):
+        print(f"{timestamp()} 🔊 TTS: Streaming audio for '{text[:50]}...'")
+        
+        chunks = tts_client.stream(
+            text, ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL, VOICE_SETTINGS,
+            output_format=tts_format.elevenlabs,
+            optimize_streaming_latency=3  # Favour time-to-first-byte
+        )
+        async for chunk in chunks:
+            if first_chunk:
+                first_chunk = False
+                print(f"{timestamp()} ✓ TTS: First audio bytes in {time.time() - start_time:.2f}s")
+            received.append(chunk)
+            yield chunk
+    
+    print(f"{timestamp()} ✓ TTS: Stream complete in {time.time() - start_time:.2f}s")
+    
+    # Only complete streams are cached - a stream abandoned by every listener never gets here
+    if tts_cache:
+        await tts_cache.put(cache_key, b"".join(received))
+
+
+async def render_tts_audio(text: str, priority: TTSPriority = TTSPriority.PREFETCH, agent_id: Optional[str] = None,
+                           tts_format: TTSFormat = MP3) -> Optional[bytes]:
+    """Synthesize text ahead of time and return the complete audio, or None if it failed"""
+    if not ELEVENLABS_API_KEY:
+        return None
+    try:
+        audio = b"".join([chunk async for chunk in stream_tts_audio(text, priority, agent_id, tts_format)])
+    except Exception as e:
+        print(f"{timestamp()} ❌ TTS render error: {str(e)}")
+        return None
+    return audio or None
+
+
+@asynccontextmanager
+async def stream_input_session(agent_id: Optional[str] = None,
+                               tts_format: TTSFormat = MP3) -> AsyncIterator[StreamInputSession]:
+    """Text-in streaming TTS session for one assistant turn, closed on exit (including interruption)"""
+    session = StreamInputSession(
+        stream_input_url(
+            ELEVENLABS_CLIENT_CONFIG["base_url"], ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL,
+            output_format=tts_format.elevenlabs,
+            optimize_streaming_latency=3  # Favour time-to-first-byte
+        ),
+        ELEVENLABS_API_KEY,
+        VOICE_SETTINGS,
+        chunk_length_schedule=TTS_STREAM_INPUT_CONFIG["chunk_length_schedule"]
+    )
+    # The session is first-chunk audio for its whole turn
+    async with tts_scheduler.slot(TTSPriority.FIRST_CHUNK, agent_id):
+        session.start()
+        try:
+            yield session
+        finally:
+            await session.close()
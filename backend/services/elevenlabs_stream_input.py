@@ -0,0 +1,157 @@
+"""ElevenLabs text-in streaming TTS: one websocket session per assistant turn"""
+import asyncio
+import base64
+import json
+import time
+from typing import AsyncIterator, Dict, List, Optional
+import websockets
+from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
+
+# Time from the first text sent to the first audio received, across sessions
+stream_input_first_audio = LatencyHistogram("elevenlabs_stream_input_first_audio")
+
+
+def stream_input_url(base_url: str, voice_id: str, model_id: str, output_format: Optional[str] = None,
+                     optimize_streaming_latency: Optional[int] = None) -> str:
+    """Websocket URL for the stream-input endpoint of an http(s) API base URL"""
+    ws_base = base_url.rstrip("/").replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+    url = f"{ws_base}/v1/text-to-speech/{voice_id}/stream-input?model_id={model_id}"
+    if output_format:
+        url += f"&output_format={output_format}"
+    if optimize_streaming_latency is not None:
+        url += f"&optimize_streaming_latency={optimize_streaming_latency}"
+    return url
+
+
+class StreamInputSession:
+    """Pushes LLM text into ElevenLabs as it is generated and yields audio as it is produced.
+
+    ``start()`` connects in the background so the handshake overlaps the LLM's
+    first token. ``send_text()`` forwards chunks (waiting for the connection
+    if needed), ``finish()`` marks the end of the turn, and ``audio()``
+    yields decoded audio until the server's final message. ``close()`` tears
+    the session down immediately, e.g. on interruption.
+
+    The server buffers text per ``chunk_length_schedule``, so text it has
+    accepted may not be spoken yet. ``unspoken_text()`` is what a fallback
+    still has to synthesize if the session fails mid-turn.
+    """
+
+    def __init__(self, url: str, api_key: str, voice_settings: Dict,
+                 chunk_length_schedule: Optional[List[int]] = None, connect_timeout: float = 5.0):
+        self.url = url
+        self.api_key = api_key
+        self.voice_settings = voice_settings
+        self.chunk_length_schedule = chunk_length_schedule or [50, 90, 120, 150]
+        self.connect_timeout = connect_timeout
+        self.websocket = None
+        self.closed = False
+        self._connect_task: Optional[asyncio.Task] = None
+        self._first_text_at = None
+        self._sent: List[str] = []
+
+        # Characters covered by alignment of audio already handed to the consumer
+        self.spoken_chars = 0
+
+        # Statistics
+        self.connect_time = None
+        self.first_audio_latency = None
+        self.text_chars = 0
+        self.audio_bytes = 0
+
+    def start(self):
+        """Begin connecting without waiting for it"""
+        if not self._connect_task:
+            self._connect_task = asyncio.create_task(self._connect())
+
+    async def _connect(self):
+        start_time = time.perf_counter()
+        self.websocket = await asyncio.wait_for(websockets.connect(self.url), self.connect_timeout)
+        # Beginning of stream: voice settings, auth and the server-side buffering schedule
+        await self.websocket.send(json.dumps({
+            "text": " ",
+            "voice_settings": self.voice_settings,
+            "generation_config": {"chunk_length_schedule": self.chunk_length_schedule},
+            "xi_api_key": self.api_key,
+        }))
+        self.connect_time = time.perf_counter() - start_time
+        print(f"{timestamp()} 🔗 TTS stream-input session open in {self.connect_time * 1000:.0f}ms")
+
+    async def _ready(self):
+        if self.closed:
+            raise ConnectionError("TTS stream-input session closed")
+        self.start()
+        await self._connect_task
+        if self.closed:
+            raise ConnectionError("TTS stream-input session closed")
+
+    async def send_text(self, text: str) -> bool:
+        """Forward a chunk of LLM text; returns False if the session failed"""
+        if not text:
+            return True
+        try:
+            await self._ready()
+            if self._first_text_at is None:
+                self._first_text_at = time.perf_counter()
+            await self.websocket.send(json.dumps({"text": text, "try_trigger_generation": True}))
+            self._sent.append(text)
+            self.text_chars += len(text)
+            return True
+        except Exception as e:
+            print(f"{timestamp()} ❌ TTS stream-input send failed: {e}")
+            return False
+
+    async def finish(self) -> bool:
+        """No more text for this turn - the server synthesizes what is buffered and ends the stream"""
+        try:
+            await self._ready()
+            await self.websocket.send(json.dumps({"text": ""}))
+            return True
+        except Exception as e:
+            print(f"{timestamp()} ❌ TTS stream-input finish failed: {e}")
+            return False
+
+    async def audio(self) -> AsyncIterator[bytes]:
+        """Audio chunks as the server produces them, until the final message"""
+        await self._ready()
+        try:
+            async for message in self.websocket:
+                data = json.loads(message)
+                if data.get("audio"):
+                    chunk = base64.b64decode(data["audio"])
+                    if self.first_audio_latency is None and self._first_text_at is not None:
+                        self.first_audio_latency = time.perf_counter() - self._first_text_at
+                        stream_input_first_audio.record(self.first_audio_latency)
+                        print(f"{timestamp()} ✓ TTS: First streamed-input audio {self.first_audio_latency:.2f}s after first text")
+                    self.audio_bytes += len(chunk)
+                    yield chunk
+                    # Each audio message is aligned to the characters it speaks
+                    alignment = data.get("alignment") or {}
+                    self.spoken_chars += len(alignment.get("chars") or [])
+                if data.get("isFinal"):
+                    return
+                if data.get("error"):
+                    raise RuntimeError(f"ElevenLabs stream-input error: {data}")
+        except websockets.exceptions.ConnectionClosedOK:
+            return
+
+    def unspoken_text(self) -> str:
+        """Text sent but not yet confirmed spoken, from the start of the first unspoken word"""
+        text = "".join(self._sent)
+        start = min(self.spoken_chars, len(text))
+        if 0 < start < len(text) and not text[start].isspace() and not text[start - 1].isspace():
+            # Cut mid-word - repeat the whole word rather than lose part of it
+            start = max(text.rfind(" ", 0, start) + 1, 0)
+        return text[start:]
+
+    async def close(self):
+        """Close the session immediately (interruption or end of turn)"""
+        self.closed = True
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
+        if self.websocket:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
@@ -0,0 +1,87 @@
+"""Library of short pre-rendered clips ("mm-hmm", "let me check that") that mask response latency"""
+import asyncio
+import re
+from typing import Dict, List, Optional, Tuple
+from config.settings import FILLER_CLIPS_CONFIG
+from services.elevenlabs_service import render_tts_audio, tts_cache_key
+from services.tts_formats import TTSFormat
+from services.tts_scheduler import TTSPriority
+from utils.helpers import timestamp
+
+
+class FillerClip:
+    """One rendered phrase"""
+    __slots__ = ("clip_id", "category", "text", "audio")
+
+    def __init__(self, clip_id: str, category: str, text: str, audio: bytes):
+        self.clip_id = clip_id
+        self.category = category
+        self.text = text
+        self.audio = audio
+
+
+class FillerClipLibrary:
+    """Per-agent clips, rendered once in the background and kept in memory.
+
+    Clips are rendered for an agent's voice and speed in each output format
+    a session asks for; agents that sound the same share one set. ``pick()``
+    never waits - until a set is rendered it simply returns None.
+    """
+
+    def __init__(self, phrases: Dict[str, List[str]]):
+        self.phrases = phrases
+        self._clips: Dict[Tuple, Dict[str, List[FillerClip]]] = {}
+        self._by_id: Dict[str, FillerClip] = {}
+        self._renders: Dict[Tuple, asyncio.Task] = {}
+        self._next: Dict[Tuple, int] = {}
+
+    @staticmethod
+    def _key(agent: dict, tts_format: TTSFormat) -> Tuple:
+        return (agent.get("voice"), agent.get("speed"), tts_format.elevenlabs)
+
+    def prepare(self, agent: dict, tts_format: TTSFormat) -> Optional[asyncio.Task]:
+        """Start rendering the agent's clips in this format unless they exist or are rendering"""
+        key = self._key(agent, tts_format)
+        if key in self._clips:
+            return None
+        if key not in self._renders:
+            task = asyncio.create_task(self._render(key, agent["id"], tts_format))
+            self._renders[key] = task
+            task.add_done_callback(lambda _: self._renders.pop(key, None))
+        return self._renders[key]
+
+    async def _render(self, key: Tuple, agent_id: str, tts_format: TTSFormat):
+        clips: Dict[str, List[FillerClip]] = {}
+        for category, texts in self.phrases.items():
+            for text in texts:
+                audio = await render_tts_audio(text, TTSPriority.PREFETCH, agent_id, tts_format)
+                if audio:
+                    clip = FillerClip(tts_cache_key(text, output_format=tts_format.elevenlabs), category, text, audio)
+                    clips.setdefault(category, []).append(clip)
+                    self._by_id[clip.clip_id] = clip
+        if clips:
+            self._clips[key] = clips
+            print(f"{timestamp()} 💬 Filler clips ready ({tts_format.elevenlabs}): "
+                  f"{sum(len(c) for c in clips.values())} clips")
+
+    def pick(self, agent: dict, tts_format: TTSFormat, category: str) -> Optional[FillerClip]:
+        """A clip for the category, rotating so the same phrase is not repeated back to back"""
+        key = self._key(agent, tts_format)
+        choices = self._clips.get(key, {}).get(category)
+        if not choices:
+            return None
+        turn = self._next.get((key, category), 0)
+        self._next[(key, category)] = turn + 1
+        return choices[turn % len(choices)]
+
+    def get(self, clip_id: str) -> Optional[FillerClip]:
+        return self._by_id.get(clip_id)
+
+
+def expects_lookup(transcript: str, keywords: List[str] = FILLER_CLIPS_CONFIG["lookup_keywords"]) -> bool:
+    """Whether a turn probably needs a lookup or tool call before the agent can answer"""
+    text = transcript.lower()
+    return any(re.search(rf"\b{re.escape(keyword)}\b", text) for keyword in keywords)
+
+
+filler_clips = FillerClipLibrary(FILLER_CLIPS_CONFIG["phrases"])
@@ -1,86 +1,108 @@
 """Google Gemini AI service integration"""
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
 import google.generativeai as genai
-from config.settings import GEMINI_API_KEY, GEMINI_MODEL
+from config.settings import CONVERSATION_MEMORY_CONFIG, GEMINI_API_KEY, GEMINI_MODEL, LLM_STREAM_CONFIG
+from services.agent_profile import get_agent_profile
+from services.conversation_memory import ConversationMemory, recent_messages
+from services.knowledge_service import retrieve_knowledge
+from utils.async_bridge import iterate_in_thread
 from utils.helpers import timestamp
 
 # Configure Gemini API
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
     print(f"✓ Gemini API Key configured")
-    model = genai.GenerativeModel(GEMINI_MODEL)
 else:
     print("✗ Warning: GEMINI_API_KEY not found in environment variables")
-    model = None
 
+# The SDK's streaming call blocks on every token, so it runs on these threads instead of the event loop
+llm_executor = ThreadPoolExecutor(max_workers=LLM_STREAM_CONFIG["max_concurrency"], thread_name_prefix="llm")
 
-async def generate_gemini_response_stream(user_message: str, conversation: list, agent_config: dict = None):
+
+def cancel_stream(response):
+    """Abort a streaming call's RPC so its worker stops waiting for the next token"""
+    rpc = getattr(response, "_iterator", None)
+    if hasattr(rpc, "cancel"):
+        rpc.cancel()
+
+
+def stream_content(model: genai.GenerativeModel, contents: list):
+    """Stream a Gemini response as an async iterator of chunks without blocking the event loop.
+
+    Closing the iterator (or cancelling the task consuming it) cancels the call.
+    """
+    return iterate_in_thread(
+        lambda: model.generate_content(contents, stream=True),
+        max_queue=LLM_STREAM_CONFIG["max_queue"],
+        name="gemini-stream",
+        executor=llm_executor,
+        cancel=cancel_stream
+    )
+
+
+SUMMARY_INSTRUCTION = (
+    "You keep the running summary of a phone call between a user and a voice agent. "
+    "Update the summary with the new messages below. Keep names, numbers, dates, decisions, "
+    "what the user wants and anything still unresolved; drop small talk. "
+    "Write at most {words} words of plain text and reply with the summary only."
+)
+
+# Summaries don't need an agent's persona
+_summary_model: Optional[genai.GenerativeModel] = None
+
+
+async def summarize_conversation(summary: str, messages: List[dict]) -> str:
+    """Fold messages into a conversation's running summary"""
+    global _summary_model
+    if not GEMINI_API_KEY:
+        raise RuntimeError("Gemini is not configured")
+    if _summary_model is None:
+        _summary_model = genai.GenerativeModel(GEMINI_MODEL)
+    transcript = "\n".join(f"{'User' if m['role'] == 'user' else 'Agent'}: {m['content']}" for m in messages)
+    instruction = SUMMARY_INSTRUCTION.format(words=int(CONVERSATION_MEMORY_CONFIG["summary_tokens"] * 0.7))
+    prompt = f"{instruction}\n\nCurrent summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"
+    response = stream_content(_summary_model, prompt)
+    try:
+        return "".join([chunk.text async for chunk in response if chunk.text]).strip()
+    finally:
+        await response.aclose()
+
+
+async def generate_gemini_response_stream(user_message: str, conversation: Union[ConversationMemory, list],
+                                          agent_config: dict = None):
     """Generate streaming response using Google Gemini API"""
-    if not model:
+    if not GEMINI_API_KEY:
         yield "I'm sorry, but the AI model is not configured. Please check your API keys."
         return
     
+    response = None
     try:
         start_time = time.time()
         
-        # Build system prompt based on agent configuration
-        if agent_config:
-            # Build base prompt from agent settings
-            system_prompt = agent_config.get("system_prompt", "You are a conversational voice assistant.")
-            
-            # Add natural conversation instructions
-            system_prompt += "\n\nIMPORTANT INSTRUCTIONS:"
-            system_prompt += "\n- Respond as a real person having a natural conversation. Do NOT identify yourself as an AI or language model."
-            system_prompt += "\n- Your output will be converted to speech, so write EXACTLY what should be spoken."
-            system_prompt += "\n- Do NOT write symbols like *, =, #, etc. Spell them out if needed (e.g., 'asterisk', 'equals', 'hashtag')."
-            system_prompt += "\n- Keep responses conversational and natural. Avoid formal or robotic language."
-            system_prompt += "\n- Do NOT apologize for delays or processing time - the user experiences instant responses."
-            system_prompt += "\n- Be concise. This is a voice conversation, not a text chat."
-            
-            # Add behavior-specific instructions
-            behavior = agent_config.get("behavior", "professional")
-            if behavior == "professional":
-                system_prompt += "\nBe professional, courteous, and helpful while maintaining focus."
-            elif behavior == "character":
-                system_prompt += "\nMaintain your character and persona throughout the conversation."
-            elif behavior == "chatty":
-                system_prompt += "\nBe friendly and conversational, as if speaking with a close companion."
-            elif behavior == "concise":
-                system_prompt += "\nProvide quick, straightforward answers without unnecessary details."
-            elif behavior == "empathetic":
-                system_prompt += "\nBe caring and compassionate, showing emotional intelligence."
-            
-            # Add custom knowledge if available
-            if agent_config.get("custom_knowledge"):
-                system_prompt += f"\n\nKnowledge base:\n{agent_config['custom_knowledge']}"
-            
-            # Add guardrails if enabled
-            if agent_config.get("guardrails_enabled"):
-                system_prompt += "\n\nIMPORTANT: Only use information from the provided knowledge base. Do not make up or guess information."
-            
-            prompt = system_prompt + "\n\n"
-        else:
-            # Default prompt if no agent config
-            prompt = "You are a conversational voice assistant.\n\n"
-            prompt += "IMPORTANT INSTRUCTIONS:\n"
-            prompt += "- Respond as a real person having a natural conversation. Do NOT identify yourself as an AI or language model.\n"
-            prompt += "- Your output will be converted to speech, so write EXACTLY what should be spoken.\n"
-            prompt += "- Do NOT write symbols like *, =, #, etc. Spell them out if needed (e.g., 'asterisk', 'equals', 'hashtag').\n"
-            prompt += "- Keep responses conversational and natural. Avoid formal or robotic language.\n"
-            prompt += "- Do NOT apologize for delays or processing time - the user experiences instant responses.\n"
-            prompt += "- Be concise. This is a voice conversation, not a text chat.\n\n"
+        # Static prefix (system instruction, model) is compiled once per agent version
+        profile = get_agent_profile(agent_config)
         
-        # Minimal conversation history (last 4 messages for speed)
-        for msg in conversation[-4:]:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            prompt += f"{role}: {msg['content']}\n"
+        # Recent turns within the token budget and a summary of the rest, without the message being answered
+        if isinstance(conversation, ConversationMemory):
+            summary, history = conversation.summary, conversation.history()
+        else:
+            summary, history = "", recent_messages(conversation)
+        if history and history[-1] == {"role": "user", "content": user_message}:
+            history = history[:-1]
         
-        prompt += f"User: {user_message}\nAssistant:"
+        # Only the knowledge passages relevant to this turn (the previous question helps with follow-ups)
+        passages = []
+        if agent_config:
+            previous = next((m["content"] for m in reversed(history) if m["role"] == "user"), "")
+            passages = retrieve_knowledge(agent_config.get("id"), f"{previous} {user_message}")
+        contents = profile.contents(history, user_message, passages, summary)
         
         print(f"{timestamp()} 🤖 LLM: Generating response for '{user_message}'")
         
         # Generate streaming response
-        response = model.generate_content(prompt, stream=True)
+        response = stream_content(profile.model, contents)
         
         first_token_time = None
         buffer = ""
@@ -88,7 +110,7 @@ async def generate_gemini_response_stream(user_message: str, conversation: list,
         prefix_buffer = ""  # Buffer to check for "Assistant:" prefix
         prefix_cleaned = False
         
-        for chunk in response:
+        async for chunk in response:
             if chunk.text:
                 if first_token_time is None:
                     first_token_time = time.time() - start_time
@@ -129,4 +151,8 @@ async def generate_gemini_response_stream(user_message: str, conversation: list,
                 
     except Exception as e:
         print(f"{timestamp()} ❌ LLM error: {str(e)}")
-        yield "I'm sorry, I encountered an error while processing your request."
\ No newline at end of file
+        yield "I'm sorry, I encountered an error while processing your request."
+    finally:
+        # Cancels the call if the consumer stopped early (e.g. the user interrupted)
+        if response is not None:
+            await response.aclose()
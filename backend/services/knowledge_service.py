@@ -0,0 +1,222 @@
+"""Per-agent knowledge retrieval and background ingestion of uploaded documents"""
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from config.settings import KNOWLEDGE_CONFIG
+from utils.bm25_index import BM25Index, chunk_text
+from utils.document_text import prepare_document
+from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
+
+# Document id of the agent's own custom_knowledge text in its index
+CUSTOM_KNOWLEDGE_DOCUMENT = "custom_knowledge"
+
+# Retrieval index per agent id
+knowledge_indexes: Dict[str, BM25Index] = {}
+
+# Uploaded documents per agent id, by name
+knowledge_documents: Dict[str, Dict[str, "KnowledgeDocument"]] = {}
+
+retrieval_latency = LatencyHistogram("knowledge_retrieval", buckets_ms=(0.5, 1, 2, 5, 10, 25, 50))
+
+# Index writes run here one at a time, in submission order, so a later upload or delete always wins
+index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="knowledge-index")
+
+# Parsing and tokenizing are pure-Python CPU work; worker processes keep them off the server's GIL
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _parse_workers() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn, not fork: the server process has running threads
+        _parse_pool = ProcessPoolExecutor(max_workers=KNOWLEDGE_CONFIG["ingest_workers"],
+                                          mp_context=multiprocessing.get_context("spawn"))
+    return _parse_pool
+
+
+class KnowledgeDocument:
+    """An uploaded document and its ingestion progress"""
+    __slots__ = ("name", "size", "content_hash", "status", "progress", "chunks", "chunks_reused", "error",
+                 "updated_at", "task")
+
+    def __init__(self, name: str, size: int, content_hash: str):
+        self.name = name
+        self.size = size
+        self.content_hash = content_hash
+        self.status = "queued"  # queued -> parsing -> indexing -> ready, or failed
+        self.progress = 0.0
+        self.chunks = 0
+        self.chunks_reused = 0
+        self.error: Optional[str] = None
+        self.updated_at = datetime.now()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def document_id(self) -> str:
+        return f"file:{self.name}"
+
+    def set_status(self, status: str, progress: float):
+        self.status = status
+        self.progress = progress
+        self.updated_at = datetime.now()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "size": self.size,
+            "content_hash": self.content_hash,
+            "chunks": self.chunks,
+            "chunks_reused": self.chunks_reused,
+            "error": self.error,
+            "updated_at": self.updated_at,
+        }
+
+
+def knowledge_index_for(agent_id: str) -> BM25Index:
+    index = knowledge_indexes.get(agent_id)
+    if index is None:
+        index = knowledge_indexes[agent_id] = BM25Index(k1=KNOWLEDGE_CONFIG["bm25_k1"], b=KNOWLEDGE_CONFIG["bm25_b"])
+    return index
+
+
+def inline_knowledge(agent_config: dict) -> bool:
+    """Small knowledge bases go into the system instruction whole instead of being retrieved"""
+    return len(agent_config.get("custom_knowledge") or "") <= KNOWLEDGE_CONFIG["inline_max_chars"]
+
+
+def _index_custom_knowledge(index: BM25Index, agent: dict):
+    """Re-chunk the agent's custom_knowledge; unchanged passages keep their tokenization"""
+    start_time = time.time()
+    if inline_knowledge(agent):
+        index.remove_document(CUSTOM_KNOWLEDGE_DOCUMENT)
+        return
+    chunks = chunk_text(agent["custom_knowledge"], KNOWLEDGE_CONFIG["chunk_chars"])
+    reused = index.set_document(CUSTOM_KNOWLEDGE_DOCUMENT, chunks)
+    print(f"{timestamp()} 📚 Indexed knowledge for {agent.get('name')}: {index.chunk_count} passages "
+          f"({len(chunks) - reused} new) in {(time.time() - start_time) * 1000:.0f}ms")
+
+
+def schedule_knowledge_index(agent: dict, on_change: Optional[Callable] = None) -> asyncio.Future:
+    """Index the agent's custom_knowledge off the event loop; turns use the previous index until it is done.
+
+    ``on_change`` is called on the event loop once indexing finishes.
+    """
+    # The index is looked up here so a worker finishing after drop_agent_knowledge() updates an orphan
+    index = knowledge_index_for(agent["id"])
+    future = asyncio.get_running_loop().run_in_executor(index_executor, _index_custom_knowledge, index, agent)
+    if on_change:
+        future.add_done_callback(lambda _: on_change())
+    return future
+
+
+def _count_resources(agent: dict):
+    agent["knowledge_resources"] = sum(1 for document in knowledge_documents.get(agent["id"], {}).values()
+                                       if document.status == "ready")
+
+
+async def _ingest(agent: dict, document: KnowledgeDocument, data: bytes, on_change: Optional[Callable]):
+    """Parse, chunk and tokenize in a worker process, then index on the index thread"""
+    loop = asyncio.get_running_loop()
+    index = knowledge_index_for(agent["id"])
+    start_time = time.time()
+    try:
+        document.set_status("parsing", 0.1)
+        # submit() starts worker processes on first use, so it runs off the event loop too
+        parsing = await loop.run_in_executor(None, lambda: _parse_workers().submit(
+            prepare_document, data, document.name, KNOWLEDGE_CONFIG["chunk_chars"]
+        ))
+        chunks, terms = await asyncio.wrap_future(parsing)
+        if not chunks:
+            raise ValueError("No text found in document")
+        document.chunks = len(chunks)
+        document.set_status("indexing", 0.6)
+        document.chunks_reused = await loop.run_in_executor(
+            index_executor, index.set_document, document.document_id, chunks, terms
+        )
+        document.set_status("ready", 1.0)
+        print(f"{timestamp()} 📚 Ingested '{document.name}' for {agent.get('name')}: {len(chunks)} passages "
+              f"({document.chunks_reused} unchanged) in {time.time() - start_time:.2f}s")
+    except asyncio.CancelledError:
+        raise  # Replaced by a newer upload, or deleted
+    except Exception as e:
+        document.error = str(e) or type(e).__name__
+        document.set_status("failed", 1.0)
+        print(f"{timestamp()} ❌ Failed to ingest '{document.name}': {document.error}")
+        # Don't keep answering from the version this upload was meant to replace
+        await loop.run_in_executor(index_executor, index.remove_document, document.document_id)
+    _count_resources(agent)
+    if on_change:
+        on_change()
+
+
+async def upload_knowledge_document(agent: dict, name: str, data: bytes,
+                                    on_change: Optional[Callable] = None) -> Tuple[KnowledgeDocument, bool]:
+    """Queue an uploaded document for ingestion, replacing any document with the same name.
+
+    Returns the document and whether it changed; re-uploading identical
+    content is a no-op. ``on_change`` is called once ingestion finishes.
+    """
+    loop = asyncio.get_running_loop()
+    content_hash = await loop.run_in_executor(None, lambda: hashlib.sha256(data).hexdigest())
+    documents = knowledge_documents.setdefault(agent["id"], {})
+    existing = documents.get(name)
+    if existing and existing.content_hash == content_hash and existing.status != "failed":
+        return existing, False
+    if existing and existing.task:
+        existing.task.cancel()
+    document = documents[name] = KnowledgeDocument(name, len(data), content_hash)
+    document.task = asyncio.create_task(_ingest(agent, document, data, on_change))
+    return document, True
+
+
+def list_knowledge_documents(agent_id: str) -> List[KnowledgeDocument]:
+    return list(knowledge_documents.get(agent_id, {}).values())
+
+
+def get_knowledge_document(agent_id: str, name: str) -> Optional[KnowledgeDocument]:
+    return knowledge_documents.get(agent_id, {}).get(name)
+
+
+async def delete_knowledge_document(agent: dict, name: str) -> bool:
+    """Stop ingesting a document and remove its passages; returns whether it existed"""
+    document = knowledge_documents.get(agent["id"], {}).pop(name, None)
+    if document is None:
+        return False
+    if document.task:
+        document.task.cancel()
+    index = knowledge_indexes.get(agent["id"])
+    if index:
+        await asyncio.get_running_loop().run_in_executor(index_executor, index.remove_document, document.document_id)
+    _count_resources(agent)
+    return True
+
+
+def retrieve_knowledge(agent_id: str, query: str, k: int = KNOWLEDGE_CONFIG["top_k"]) -> List[str]:
+    """The passages most relevant to the query"""
+    index = knowledge_indexes.get(agent_id)
+    if index is None or not query.strip():
+        return []
+    start_time = time.perf_counter()
+    passages = [text for _, text, _ in index.search(query, k)]
+    retrieval_latency.record(time.perf_counter() - start_time)
+    return passages
+
+
+def drop_agent_knowledge(agent_id: str):
+    for document in knowledge_documents.pop(agent_id, {}).values():
+        if document.task:
+            document.task.cancel()
+    knowledge_indexes.pop(agent_id, None)
+
+
+def shutdown_knowledge_workers():
+    index_executor.shutdown(wait=False, cancel_futures=True)
+    if _parse_pool:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
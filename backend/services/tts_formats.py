@@ -0,0 +1,66 @@
+"""TTS output formats a session can negotiate, and their ElevenLabs equivalents"""
+from typing import Optional
+
+# Sample rates ElevenLabs can return raw PCM at
+PCM_SAMPLE_RATES = (8000, 16000, 22050, 24000, 44100, 48000)
+
+
+class TTSFormat:
+    """One negotiated output format"""
+    __slots__ = ("name", "elevenlabs", "media_type", "sample_rate", "frame_bytes")
+
+    def __init__(self, name: str, elevenlabs: str, media_type: str, sample_rate: int, frame_bytes: int = 1):
+        self.name = name  # Name used in the websocket protocol
+        self.elevenlabs = elevenlabs  # ElevenLabs output_format parameter
+        self.media_type = media_type
+        self.sample_rate = sample_rate
+        self.frame_bytes = frame_bytes  # Binary frames carry whole samples of this size
+
+    def describe(self) -> dict:
+        """Negotiated format as sent to the client"""
+        return {
+            "format": self.name,
+            "sample_rate": self.sample_rate,
+            "media_type": self.media_type,
+            "channels": 1,
+        }
+
+
+MP3 = TTSFormat("mp3", "mp3_44100_128", "audio/mpeg", 44100)
+ULAW_8000 = TTSFormat("ulaw", "ulaw_8000", "audio/basic", 8000)
+OPUS = TTSFormat("opus", "opus_48000_64", "audio/ogg", 48000)
+
+
+def pcm_format(sample_rate: int) -> TTSFormat:
+    """16-bit little-endian mono PCM at the closest rate ElevenLabs supports"""
+    rate = min(PCM_SAMPLE_RATES, key=lambda supported: abs(supported - sample_rate))
+    return TTSFormat("pcm", f"pcm_{rate}", f"audio/L16;rate={rate}", rate, frame_bytes=2)
+
+
+def format_for_elevenlabs(output_format: str) -> Optional[TTSFormat]:
+    """The format behind an ElevenLabs output_format name, or None if unknown"""
+    codec, _, rate = output_format.partition("_")
+    if codec == "pcm" and rate.isdigit():
+        return pcm_format(int(rate))
+    for tts_format in (MP3, ULAW_8000, OPUS):
+        if tts_format.elevenlabs == output_format:
+            return tts_format
+    return None
+
+
+def negotiate_tts_format(requested: Optional[str], call_sample_rate: int, streaming: bool) -> TTSFormat:
+    """Pick the output format for a session from its audio_config.
+
+    Raw formats only make sense over binary frames, so URL delivery (played
+    by the browser's audio element) always gets mp3.
+    """
+    if not streaming or not requested:
+        return MP3
+    requested = requested.lower()
+    if requested in ("pcm", "pcm16", "linear16"):
+        return pcm_format(call_sample_rate)
+    if requested in ("ulaw", "mulaw", "μ-law", "ulaw_8000"):
+        return ULAW_8000
+    if requested == "opus":
+        return OPUS
+    return MP3
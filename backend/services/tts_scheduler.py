@@ -0,0 +1,124 @@
+"""Priority-aware admission of TTS work"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Deque, Dict, Optional
+from config.settings import TTS_SCHEDULER_CONFIG
+from utils.helpers import timestamp
+from utils.metrics import LatencyHistogram
+
+class TTSPriority(IntEnum):
+    """Scheduling classes, most urgent first"""
+    GREETING = 0  # Caller is waiting in silence for the call to start
+    FIRST_CHUNK = 1  # First audio of a response - on the critical latency path
+    CONTINUATION = 2  # Later segments, already covered by audio that is playing
+    PREFETCH = 3  # Speculative work nobody is waiting for yet
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, priority: TTSPriority):
+        self.future = future
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+
+
+class TTSScheduler:
+    """Admits TTS requests in priority order under one concurrency limit.
+
+    Requests hold a ``slot()`` while they talk to the TTS provider.
+    Greetings and first chunks may use every slot; continuation and prefetch
+    work is limited to ``max_concurrency - reserved_slots`` so urgent audio
+    never queues behind bulk synthesis. Within a priority class, agents are
+    served round-robin so one busy agent cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int, reserved_slots: int):
+        self.max_concurrency = max_concurrency
+        self.reserved_slots = min(reserved_slots, max_concurrency - 1)
+        self._active = 0
+        # Per priority: agent -> waiters, in round-robin order
+        self._queues: Dict[TTSPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in TTSPriority
+        }
+
+        # Statistics
+        self.queue_wait = {
+            priority: LatencyHistogram(f"tts_queue_wait_{priority.name.lower()}") for priority in TTSPriority
+        }
+
+    def _limit(self, priority: TTSPriority) -> int:
+        """Slots a request of this priority may occupy"""
+        if priority <= TTSPriority.FIRST_CHUNK:
+            return self.max_concurrency
+        return self.max_concurrency - self.reserved_slots
+
+    def queued(self) -> int:
+        return sum(len(waiters) for queue in self._queues.values() for waiters in queue.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: TTSPriority, agent_id: Optional[str] = None):
+        """Hold one TTS slot for the duration of the block"""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), priority)
+        agent_queue = self._queues[priority].setdefault(agent_id or "default", deque())
+        agent_queue.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted a slot just as we were cancelled - hand it back
+                self._release()
+            raise
+        self.queue_wait[priority].record(time.monotonic() - waiter.enqueued_at)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grant free slots to the most urgent waiters"""
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue  # Cancelled while queued
+            self._active += 1
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        for priority in TTSPriority:
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            if self._active >= self._limit(priority):
+                return None  # Less urgent classes have no more room than this one
+            agent_id, waiters = next(iter(queue.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                queue.move_to_end(agent_id)  # Next request from this agent waits its turn
+            else:
+                del queue[agent_id]
+            return waiter
+        return None
+
+    def log_stats(self):
+        for priority in TTSPriority:
+            if self.queue_wait[priority].count:
+                print(f"{timestamp()} 📊 {self.queue_wait[priority].summary()}")
+
+
+# Shared scheduler for all TTS work in this process
+tts_scheduler = TTSScheduler(
+    max_concurrency=TTS_SCHEDULER_CONFIG["max_concurrency"],
+    reserved_slots=TTS_SCHEDULER_CONFIG["reserved_slots"],
+)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test compiled agent prompt profiles and multi-turn contents (offline)"""
+import asyncio
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.gemini_service as gemini_service
+from routes import agents
+from services.agent_profile import DEFAULT_PERSONA, INSTRUCTION_ACK, SUPPORTS_SYSTEM_INSTRUCTION, get_agent_profile
+
+
+class RecordingModel:
+    """Captures the contents sent to Gemini"""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, contents, stream=False):
+        self.requests.append(contents)
+        return iter([type("Chunk", (), {"text": "Sure thing."})()])
+
+
+async def test():
+    print("Testing agent prompt profiles")
+    print("="*50)
+    gemini_service.GEMINI_API_KEY = "test"
+    created = await agents.create_agent(agents.AgentCreate(
+        name="Support", system_prompt="You are Sam from support.", behavior="concise",
+        custom_knowledge="Opening hours: 9 to 5.", guardrails_enabled=True
+    ))
+    agent = agents.agents_db[created.id]
+
+    # 1. The system instruction carries the agent's settings
+    print("\n1. Compiling...")
+    profile = get_agent_profile(agent)
+    instruction = profile.system_instruction
+    assert instruction.startswith("You are Sam from support.\n\nIMPORTANT INSTRUCTIONS:\n- Respond as a real person")
+    assert "Provide quick, straightforward answers" in instruction
+    assert "Knowledge base:\nOpening hours: 9 to 5." in instruction and instruction.endswith("guess information.")
+    assert get_agent_profile(agent) is profile
+    print(f"   ✓ {len(instruction)} char instruction, compiled once")
+
+    # 2. Turns are structured contents behind a fixed prefix
+    print("\n2. Multi-turn contents...")
+    model = profile.model = RecordingModel()
+    conversation = [
+        {"role": "assistant", "content": "Hi, this is Sam."},
+        {"role": "user", "content": "When are you open?"},
+        {"role": "assistant", "content": "Nine to five."},
+        {"role": "user", "content": "And on weekends?"},
+    ]
+    reply = "".join([chunk async for chunk in gemini_service.generate_gemini_response_stream(
+        "And on weekends?", conversation, agent)])
+    assert reply == "Sure thing."
+    contents = model.requests[-1]
+    roles = [turn["role"] for turn in contents]
+    assert all(a != b for a, b in zip(roles, roles[1:])), roles
+    assert contents[-1] == {"role": "user", "parts": ["And on weekends?"]}  # Sent once, not duplicated
+    if not SUPPORTS_SYSTEM_INSTRUCTION:
+        assert contents[0] == {"role": "user", "parts": [instruction]}
+        assert contents[1]["parts"][0] == INSTRUCTION_ACK
+    print(f"   ✓ Roles: {roles}")
+
+    # 3. The prefix is identical across turns
+    print("\n3. Stable prefix...")
+    conversation += [{"role": "assistant", "content": "Closed on weekends."}, {"role": "user", "content": "Thanks!"}]
+    async for _ in gemini_service.generate_gemini_response_stream("Thanks!", conversation, agent):
+        pass
+    assert model.requests[-1][0] == contents[0]
+    print("   ✓ Same opening content on every turn")
+
+    # 4. Updating the agent recompiles the profile
+    print("\n4. Invalidation...")
+    await agents.update_agent(created.id, agents.AgentUpdate(custom_knowledge="Opening hours: 8 to 6."))
+    updated = get_agent_profile(agent)
+    assert updated is not profile and "8 to 6" in updated.system_instruction
+    await agents.update_agent_stats(created.id, 30)  # Not an agent change
+    assert get_agent_profile(agent) is updated
+    print("   ✓ Recompiled after update_agent")
+
+    # 5. Configs without an id never share a profile with the default assistant or each other
+    print("\n5. Id-less configs...")
+    pirate = {"name": "Pirate", "system_prompt": "You are a pirate.", "behavior": "character"}
+    assert get_agent_profile(pirate).system_instruction.startswith("You are a pirate.")
+    assert get_agent_profile(None).system_instruction.startswith(DEFAULT_PERSONA)
+    assert get_agent_profile(dict(pirate)) is get_agent_profile(pirate)
+    robot = dict(pirate, system_prompt="You are a robot.")
+    assert get_agent_profile(robot).system_instruction.startswith("You are a robot.")
+    print("   ✓ Keyed by content, default assistant kept separate")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test the AudioRingBuffer against the old bytearray slicing behaviour"""
+import os
+import random
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.audio_buffer import AudioRingBuffer
+
+
+def test():
+    print("Testing AudioRingBuffer")
+    print("="*50)
+
+    frame_size = 480
+    rng = random.Random(0)
+
+    # 1. Batched frame reads match the old accumulator slicing
+    print("\n1. Comparing frame extraction with bytearray accumulator...")
+    old_accumulator = bytearray()
+    ring = AudioRingBuffer(4000, frame_size)
+    old_frames, new_frames = [], []
+    for _ in range(500):
+        chunk = bytes(rng.getrandbits(8) for _ in range(rng.choice([2, 160, 480, 1360, 2000])))
+        old_accumulator.extend(chunk)
+        while len(old_accumulator) >= frame_size:
+            old_frames.append(bytes(old_accumulator[:frame_size]))
+            old_accumulator = old_accumulator[frame_size:]
+        pending = memoryview(chunk)
+        while len(pending) > 0:
+            written = ring.write(pending)
+            pending = pending[written:]
+            for segment in ring.read_frames():
+                assert len(segment) % frame_size == 0, "Segment not frame aligned"
+                new_frames.extend(bytes(segment[i:i + frame_size]) for i in range(0, len(segment), frame_size))
+    assert old_frames == new_frames, "Frame sequence differs"
+    assert len(ring) == len(old_accumulator)
+    print(f"   ✓ {len(new_frames)} identical frames")
+
+    # 2. Circular pre-speech buffer keeps the same tail
+    print("\n2. Comparing circular pre-speech buffer...")
+    old_pre_speech = bytearray()
+    pre_speech = AudioRingBuffer(3200)
+    for frame in new_frames[:200]:
+        old_pre_speech.extend(frame)
+        if len(old_pre_speech) > 3200:
+            old_pre_speech = old_pre_speech[-3200:]
+        pre_speech.overwrite(frame)
+        copied = bytearray()
+        pre_speech.copy_to(copied)
+        assert copied == old_pre_speech, "Pre-speech contents differ"
+    print("   ✓ Pre-speech contents identical")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Test token-budgeted conversation memory with a background running summary (offline)"""
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.gemini_service as gemini_service
+from services.agent_profile import SUMMARY_PREAMBLE, get_agent_profile
+from services.conversation_memory import ConversationMemory, estimate_tokens, message_tokens, recent_messages
+
+BUDGET = 300
+SUMMARY_DELAY = 0.05  # Seconds the fake summarizer takes
+
+
+class FakeSummarizer:
+    """Keeps the facts it is told about, like an LLM summary would"""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, summary, messages):
+        self.calls.append(len(messages))
+        await asyncio.sleep(SUMMARY_DELAY)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        facts = [m["content"] for m in messages if "order" in m["content"]]
+        return " ".join(filter(None, [summary] + facts))
+
+
+class RecordingModel:
+    """Captures the contents sent to Gemini"""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, contents, stream=False):
+        self.requests.append(contents)
+        return iter([type("Chunk", (), {"text": "Okay."})()])
+
+
+def turn(i: int):
+    user = f"Question {i}: could you tell me a little more about option {i} and how it compares to the others?"
+    if i == 1:
+        user = "My order number is 4417 and it arrived damaged."
+    return user, f"Sure. Option {i} is a solid choice for most people, and it is usually available the same week."
+
+
+async def test():
+    print("Testing conversation memory")
+    print("="*50)
+
+    # 1. Token estimates and the budgeted window
+    print("\n1. Budgeted window...")
+    assert estimate_tokens("") == 0 and estimate_tokens("one two three") == 4
+    messages = [{"role": "user", "content": "word " * 100}] * 10
+    window = recent_messages(messages, budget_tokens=260, min_messages=1)
+    assert len(window) == 2 and sum(message_tokens(m) for m in window) <= 260
+    assert len(recent_messages(messages, budget_tokens=10, min_messages=2)) == 2
+    print(f"   ✓ {len(window)} of {len(messages)} messages fit in 260 tokens")
+
+    # 2. A long call keeps a bounded prompt and the important early fact
+    print("\n2. Long call...")
+    summarizer = FakeSummarizer()
+    memory = ConversationMemory(summarize=summarizer, budget_tokens=BUDGET, summary_tokens=100)
+    sizes = []
+    slowest_refresh = 0.0
+    for i in range(1, 41):
+        user, reply = turn(i)
+        memory.add("user", user)
+        memory.add("assistant", reply)
+        start = time.perf_counter()
+        memory.refresh()
+        slowest_refresh = max(slowest_refresh, time.perf_counter() - start)
+        sizes.append(memory.prompt_tokens)
+        await asyncio.sleep(0.02)  # The next turn starts before the summary is necessarily done
+    await memory.wait_refreshed()
+    assert memory.recent_tokens <= BUDGET and memory.messages[-1]["content"] == turn(40)[1]
+    assert "4417" in memory.summary and memory.history() == memory.messages
+    assert max(sizes[10:]) - min(sizes[10:]) < 150, sizes
+    assert slowest_refresh < 0.001
+    print(f"   ✓ 80 messages, prompt history {min(sizes[10:])}-{max(sizes[10:])} tokens, "
+          f"{len(summarizer.calls)} summaries, refresh() at most {slowest_refresh * 1e6:.0f}µs")
+
+    # 3. Messages being folded stay in the prompt until the summary lands
+    print("\n3. During a refresh...")
+    for i in range(41, 45):
+        memory.add("user", turn(i)[0])
+        memory.add("assistant", turn(i)[1])
+    memory.refresh()
+    folding = [m for m in memory.history() if m not in memory.messages]
+    assert folding and memory.history()[0] == folding[0]
+    await memory.wait_refreshed()
+    assert memory.history() == memory.messages
+    print(f"   ✓ {len(folding)} messages kept verbatim until folded")
+
+    # 4. Without a working summarizer the transcript itself is kept, clipped
+    print("\n4. Summarizer failure...")
+    memory = ConversationMemory(summarize=FakeSummarizer(fail=True), budget_tokens=BUDGET, summary_tokens=60)
+    for i in range(1, 21):
+        memory.add("user", turn(i)[0])
+        memory.add("assistant", turn(i)[1])
+        memory.refresh()
+        await memory.wait_refreshed()
+    assert estimate_tokens(memory.summary) <= 62 and memory.summary.startswith("...")
+    assert "Agent:" in memory.summary
+    print(f"   ✓ Fallback summary of {estimate_tokens(memory.summary)} tokens")
+
+    # 5. The prompt carries the summary and recent turns, at a steady size
+    print("\n5. Gemini contents...")
+    gemini_service.GEMINI_API_KEY = "test"
+    profile = get_agent_profile(None)
+    model = profile.model = RecordingModel()
+    memory = ConversationMemory(summarize=FakeSummarizer(), budget_tokens=BUDGET, summary_tokens=100)
+    request_sizes = []
+    for i in range(1, 31):
+        user, _ = turn(i)
+        memory.add("user", user)
+        reply = "".join([chunk async for chunk in gemini_service.generate_gemini_response_stream(user, memory, None)])
+        memory.add("assistant", reply)
+        memory.refresh()
+        await memory.wait_refreshed()
+        contents = model.requests[-1]
+        assert contents[-1]["parts"][-1] == user
+        request_sizes.append(sum(len(part) for content in contents for part in content["parts"]))
+    summary_parts = [part for content in contents for part in content["parts"] if part.startswith(SUMMARY_PREAMBLE)]
+    assert len(summary_parts) == 1 and "4417" in summary_parts[0]
+    assert max(request_sizes[10:]) < 1.3 * min(request_sizes[10:]), request_sizes
+    print(f"   ✓ Request size steady at {min(request_sizes[10:])}-{max(request_sizes[10:])} chars "
+          f"(was {request_sizes[0]} on the first turn)")
+
+    # 6. Closing the call stops a pending refresh
+    print("\n6. Call end...")
+    memory.add("user", "word " * 400)
+    memory.add("assistant", "word " * 400)
+    memory.add("user", "Bye")
+    memory.refresh()
+    memory.close()
+    await memory.wait_refreshed()
+    assert memory._refresh.cancelled()
+    print("   ✓ Pending summary cancelled on close")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Test event-driven finalize against a fake Deepgram connection"""
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from deepgram import LiveResultResponse
+from services.deepgram_service import DeepgramConnectionPool, DeepgramStreamingTranscriber, finalize_latency
+
+
+def make_result(text: str, from_finalize: bool) -> LiveResultResponse:
+    return LiveResultResponse.from_dict({
+        "type": "Results",
+        "channel": {"alternatives": [{"transcript": text, "confidence": 1.0, "words": []}]},
+        "metadata": {"request_id": "test", "model_info": {"name": "", "version": "", "arch": ""}, "model_uuid": ""},
+        "is_final": True,
+        "from_finalize": from_finalize,
+        "speech_final": False,
+        "channel_index": [0, 1],
+        "duration": 1.0,
+        "start": 0.0,
+    })
+
+
+class FakeConnection:
+    """Answers finalize() with a from_finalize result after a delay"""
+
+    def __init__(self, transcriber, delay: float):
+        self.transcriber = transcriber
+        self.delay = delay
+        self.finished = False
+
+    async def send(self, data):
+        return True
+
+    async def finish(self):
+        self.finished = True
+
+    async def finalize(self):
+        async def respond():
+            await asyncio.sleep(self.delay)
+            await self.transcriber._on_transcript(self, make_result("world", True))
+        asyncio.create_task(respond())
+
+
+async def test():
+    print("Testing event-driven finalize")
+    print("="*50)
+
+    transcriber = DeepgramStreamingTranscriber()
+    transcriber.is_connected = True
+
+    print("\n1. Final result arrives after 300ms (old code waited a fixed 100ms)...")
+    transcriber.connection = FakeConnection(transcriber, 0.3)
+    await transcriber._on_transcript(None, make_result("hello", False))
+    final = await transcriber.finalize(timeout=1.0)
+    assert final == "hello world", f"Unexpected transcript: '{final}'"
+    print(f"   ✓ Transcript: '{final}'")
+
+    print("\n2. Fast final result returns without a fixed sleep...")
+    transcriber.connection = FakeConnection(transcriber, 0.01)
+    start = time.time()
+    final = await transcriber.finalize(timeout=1.0)
+    elapsed = time.time() - start
+    assert final == "world" and elapsed < 0.1, f"Took {elapsed:.3f}s"
+    print(f"   ✓ Returned in {elapsed * 1000:.0f}ms")
+
+    print("\n3. Missing final result times out...")
+    transcriber.connection = FakeConnection(transcriber, 5.0)
+    start = time.time()
+    final = await transcriber.finalize(timeout=0.2)
+    assert time.time() - start < 0.3
+    print("   ✓ Timed out")
+
+    print("\n4. Pooled connections are flushed before the next session gets them...")
+    pool = DeepgramConnectionPool(warm_size=2, max_age_seconds=60, health_check_interval=60)
+
+    def pooled(delay):
+        transcriber = DeepgramStreamingTranscriber()
+        transcriber.is_connected = True
+        transcriber.connected_at = time.time()
+        transcriber.connection = FakeConnection(transcriber, delay)
+        return transcriber
+
+    unused = pooled(5.0)
+    await pool.release(unused)
+    assert unused in pool.idle[pool._key(unused.options)], "Connection without audio not re-pooled"
+    previous_results = []
+    flushed = pooled(0.01)
+    flushed.bind(previous_results.append)
+    assert await flushed.send_audio(b"\x00\x00" * 160)
+    await pool.release(flushed)
+    assert flushed in pool.idle[pool._key(flushed.options)] and not flushed.unfinalized_audio
+    assert previous_results == [] and flushed.transcript_buffer == "", "Previous caller's words kept"
+    stuck = pooled(5.0)
+    assert await stuck.send_audio(b"\x00\x00" * 160)
+    await pool.release(stuck)
+    assert stuck not in pool.idle[pool._key(stuck.options)] and stuck.connection is None, "Unflushed connection re-pooled"
+    print("   ✓ Unused and flushed connections re-pooled, unflushed one closed")
+
+    print(f"\n   {finalize_latency.summary()}")
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Test mid-utterance Deepgram reconnect with audio replay (offline, fake connections)"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import handlers.audio_stream_handler as audio_stream_handler
+from deepgram import LiveResultResponse
+from handlers.audio_stream_handler import AudioStreamHandler
+from services.deepgram_service import DeepgramStreamingTranscriber
+
+
+class FakeTranscriber:
+    """Records received audio; the first connection drops after a few messages"""
+
+    def __init__(self, fail_after=None, finalize_delay=0.0):
+        self.is_connected = True
+        self.fail_after = fail_after
+        self.finalize_delay = finalize_delay
+        self.received = bytearray()
+        self.messages = 0
+        self.transcript_buffer = ""
+
+    async def send_audio(self, chunk: bytes) -> bool:
+        if self.fail_after is not None and self.messages >= self.fail_after:
+            self.is_connected = False
+            return False
+        self.messages += 1
+        self.received.extend(chunk)
+        return True
+
+    def get_current_transcript(self) -> str:
+        return "hello" if self.messages else ""
+
+    async def finalize(self) -> str:
+        await asyncio.sleep(self.finalize_delay)
+        return (self.transcript_buffer + "world").strip()
+
+
+class FakeSDKConnection:
+    """Stands in for the SDK's websocket client, whose send() returns False once the socket is gone"""
+
+    def __init__(self, transcriber, fail_after=None):
+        self.transcriber = transcriber
+        self.fail_after = fail_after
+        self.received = bytearray()
+        self.messages = 0
+
+    async def send(self, data) -> bool:
+        if self.fail_after is not None and self.messages >= self.fail_after:
+            return False
+        self.messages += 1
+        self.received.extend(data)
+        return True
+
+    async def finalize(self):
+        result = LiveResultResponse.from_dict({
+            "type": "Results",
+            "channel": {"alternatives": [{"transcript": "world", "confidence": 1.0, "words": []}]},
+            "metadata": {"request_id": "test", "model_info": {"name": "", "version": "", "arch": ""}, "model_uuid": ""},
+            "is_final": True, "from_finalize": True, "speech_final": False,
+            "channel_index": [0, 1], "duration": 1.0, "start": 0.0,
+        })
+        await self.transcriber._on_transcript(self, result)
+
+    async def finish(self):
+        pass
+
+
+def sdk_transcriber(fail_after=None) -> DeepgramStreamingTranscriber:
+    """A real transcriber on a fake SDK connection"""
+    transcriber = DeepgramStreamingTranscriber()
+    transcriber.is_connected = True
+    transcriber.connection = FakeSDKConnection(transcriber, fail_after)
+    transcriber.received = transcriber.connection.received
+    return transcriber
+
+
+class FakePool:
+    def __init__(self, transcribers=None):
+        self.transcribers = transcribers or [FakeTranscriber(fail_after=3), FakeTranscriber()]
+        self.handed_out = []
+        self.released = []
+
+    async def acquire(self, on_transcript=None, on_interim=None):
+        transcriber = self.transcribers.pop(0)
+        self.handed_out.append(transcriber)
+        return transcriber
+
+    async def release(self, transcriber):
+        self.released.append(transcriber)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+
+def voiced_audio(seconds: float) -> bytes:
+    t = np.arange(int(8000 * seconds)) / 8000
+    signal = sum(3000 / h * np.sin(2 * np.pi * 150 * h * t) for h in range(1, 8))
+    return signal.astype(np.int16).tobytes()
+
+
+async def run_utterance(pool: FakePool, suspend_after_idle=None):
+    """Speak one utterance through a handler borrowing from pool (optionally with the idle monitor running)"""
+    audio_stream_handler.deepgram_pool = pool
+    websocket = FakeWebSocket()
+    handler = AudioStreamHandler(websocket, asyncio.get_running_loop())
+    handler.vad_engine = None  # Evaluate inline for a deterministic test
+    handler.reconnect_delay = 0.01
+    if suspend_after_idle is not None:
+        handler.suspend_after_idle = suspend_after_idle
+        handler.idle_task = asyncio.create_task(handler._monitor_idle())
+
+    audio = voiced_audio(1.5) + bytes(16000)  # 1.5s speech, then 1s silence
+    for i in range(0, len(audio), 1360):
+        await handler.add_audio(audio[i:i + 1360])
+    return handler, websocket, audio
+
+
+async def test():
+    print("Testing Deepgram reconnect with replay")
+    print("="*50)
+
+    print("\n1. Transcriber reports a failed send...")
+    pool = FakePool()
+    handler, websocket, audio = await run_utterance(pool)
+    first, second = pool.handed_out
+    utterance_bytes = first.received + second.received
+    print(f"\n   First connection: {len(first.received)} bytes, second: {len(second.received)} bytes")
+    transcript = await handler.transcript_queue.get()
+    assert handler.reconnect_count == 1, "Expected one reconnect"
+    # Exactly once: the two connections together saw one contiguous stretch of the input
+    assert bytes(utterance_bytes) in audio, "Audio lost or duplicated across the reconnect"
+    assert not any(m["type"] == "error" for m in websocket.messages), "Error sent to client"
+    assert transcript == "hello world", f"Unexpected transcript: '{transcript}'"
+    print(f"   ✓ Reconnected once, transcript: '{transcript}'")
+    print(f"   ✓ {handler.reconnect_latency.summary()}")
+
+    # The SDK's send() returns False on a dead socket instead of raising
+    print("\n2. SDK connection send() returns False...")
+    pool = FakePool([sdk_transcriber(fail_after=3), sdk_transcriber()])
+    handler, websocket, audio = await run_utterance(pool)
+    first, second = pool.handed_out
+    assert not first.is_connected, "Failed send not treated as a dropped connection"
+    transcript = await handler.transcript_queue.get()
+    assert handler.reconnect_count == 1, "Expected one reconnect"
+    assert bytes(first.received + second.received) in audio, "Audio lost or duplicated across the reconnect"
+    assert transcript == "world", f"Unexpected transcript: '{transcript}'"
+    print(f"   ✓ Reconnected once, {len(second.received)} bytes replayed on the new connection")
+
+    # Finalize outlasts the idle timeout: the idle monitor must not release the connection under it
+    print("\n3. Idle monitor during a slow finalize...")
+    pool = FakePool([FakeTranscriber(finalize_delay=1.5)])
+    handler, websocket, audio = await run_utterance(pool, suspend_after_idle=0.5)
+    transcript = await handler.transcript_queue.get()
+    handler.is_running = False
+    handler.idle_task.cancel()
+    assert not pool.released and not handler.is_suspended, "Connection suspended mid-finalize"
+    assert transcript == "world", f"Unexpected transcript: '{transcript}'"
+    print(f"   ✓ Connection kept through a 1.5s finalize, transcript: '{transcript}'")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test the pooled async ElevenLabs client against the local fake server"""
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from services.elevenlabs_client import ElevenLabsClient
+
+VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+
+async def test(base_url: str, server: FakeElevenLabsServer):
+    print("Testing ElevenLabs client")
+    print("="*50)
+
+    client = ElevenLabsClient("fake-key", base_url=base_url, warm_connections=2, keep_warm_interval=0)
+
+    # 1. Warm-up opens connections before the first sentence
+    print("\n1. Warming connections...")
+    await client.start()
+    assert client.handshake_time.count == 2
+    print(f"   ✓ {client.handshake_time.summary()}")
+
+    # 2. Sentences reuse the warm connections
+    print("\n2. Sequential sentences...")
+    sentences = [f"This is sentence number {i}." for i in range(10)]
+    for sentence in sentences:
+        audio = await client.synthesize(sentence, "voice", "eleven_turbo_v2", VOICE_SETTINGS)
+        assert audio == fake_audio(sentence)
+    assert client.requests == 10 and client.new_connections == 0, client.stats()
+    body = server.requests[-1][2]
+    assert body["model_id"] == "eleven_turbo_v2" and body["voice_settings"] == VOICE_SETTINGS
+    print(f"   ✓ {client.reused_connections}/{client.requests} requests on reused connections")
+
+    # 3. Streaming bodies arrive chunk by chunk
+    print("\n3. Streaming...")
+    text = "A longer sentence that is streamed back in several chunks as it is generated."
+    start = time.perf_counter()
+    first_chunk_at = None
+    chunks = []
+    async for chunk in client.stream(text, "voice", "eleven_turbo_v2", VOICE_SETTINGS, optimize_streaming_latency=3):
+        if first_chunk_at is None:
+            first_chunk_at = time.perf_counter() - start
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+    assert b"".join(chunks) == fake_audio(text) and len(chunks) > 1
+    assert first_chunk_at < total / 2, "First chunk was not delivered early"
+    assert server.requests[-1][3] == {"optimize_streaming_latency": "3"}
+    print(f"   ✓ {len(chunks)} chunks, first after {first_chunk_at * 1000:.0f}ms of {total * 1000:.0f}ms")
+
+    # 4. Concurrent requests beyond the warm pool open new connections, then reuse them
+    print("\n4. Concurrent burst...")
+    before = client.new_connections
+    await asyncio.gather(*[client.synthesize(f"Burst {i}.", "voice", "eleven_turbo_v2", VOICE_SETTINGS)
+                           for i in range(6)])
+    opened = client.new_connections - before
+    await asyncio.gather(*[client.synthesize(f"Again {i}.", "voice", "eleven_turbo_v2", VOICE_SETTINGS)
+                           for i in range(6)])
+    assert client.new_connections - before == opened, "Second burst opened connections"
+    print(f"   ✓ Burst opened {opened} connection(s), repeat burst opened none")
+
+    await client.close()
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server.base_url, fake_server))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test the latency-masking clip library (offline, local fake ElevenLabs server)"""
+import asyncio
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from services.elevenlabs_client import ElevenLabsClient
+from services.filler_clips import FillerClipLibrary, expects_lookup
+from services.tts_formats import MP3, ULAW_8000
+from utils.single_flight import SingleFlight
+
+PHRASES = {"acknowledge": ["Mm-hmm.", "Okay."], "repeat": ["Sorry, could you repeat that?"]}
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing filler clips")
+    print("="*50)
+
+    elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+    elevenlabs_service.ELEVENLABS_API_KEY = "test"
+    elevenlabs_service.tts_cache = None
+    elevenlabs_service.tts_flight = SingleFlight()
+    library = FillerClipLibrary(PHRASES)
+    agent = {"id": "agent-1", "voice": "Vincent", "speed": "1.0x"}
+
+    # 1. Rendered once in the background, nothing to pick until then
+    print("\n1. Rendering...")
+    render = library.prepare(agent, MP3)
+    assert library.pick(agent, MP3, "acknowledge") is None
+    assert library.prepare(agent, MP3) is render  # Not rendered twice
+    await render
+    assert library.prepare(agent, MP3) is None
+    assert len(server.requests) == 3
+    print("   ✓ 3 clips rendered once")
+
+    # 2. Picks rotate within a category and are served by id
+    print("\n2. Picking...")
+    picks = [library.pick(agent, MP3, "acknowledge").text for _ in range(3)]
+    assert picks == ["Mm-hmm.", "Okay.", "Mm-hmm."], picks
+    clip = library.pick(agent, MP3, "repeat")
+    assert clip.audio == fake_audio("Sorry, could you repeat that?") and library.get(clip.clip_id) is clip
+    assert library.pick(agent, MP3, "lookup") is None
+    print(f"   ✓ Rotation: {picks}")
+
+    # 3. Same voice shares clips, other formats render separately
+    print("\n3. Sharing and formats...")
+    assert library.prepare({"id": "agent-2", "voice": "Vincent", "speed": "1.0x"}, MP3) is None
+    await library.prepare(agent, ULAW_8000)
+    assert library.pick(agent, ULAW_8000, "repeat").clip_id != clip.clip_id
+    assert server.requests[-1][3]["output_format"] == "ulaw_8000"
+    print("   ✓ Shared by voice, rendered per format")
+
+    # 4. Lookup detection
+    print("\n4. Lookup turns...")
+    assert expects_lookup("Can you check my order status?")
+    assert expects_lookup("How much is the premium plan")
+    assert not expects_lookup("Thanks, that's all")
+    assert not expects_lookup("I was booking it myself")  # Whole words only
+    print("   ✓ Keywords matched on word boundaries")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
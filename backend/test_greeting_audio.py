@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test pre-rendered agent greetings (offline, local fake ElevenLabs server)"""
+import asyncio
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from routes import agents
+from routes.audio import get_greeting_audio_file
+from services.elevenlabs_client import ElevenLabsClient
+from services.tts_formats import ULAW_8000
+from utils.single_flight import SingleFlight
+
+
+async def wait_for_renders():
+    while agents.greeting_renders:
+        await asyncio.gather(*[task for _, task in agents.greeting_renders.values()], return_exceptions=True)
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing pre-rendered greetings")
+    print("="*50)
+
+    def upstream_texts():
+        return [body["text"] for _, _, body, _ in server.requests]
+
+    elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+    elevenlabs_service.ELEVENLABS_API_KEY = "test"
+    elevenlabs_service.tts_cache = None  # Stored greeting audio must not depend on the cache
+    elevenlabs_service.tts_flight = SingleFlight()
+
+    # 1. Creating an agent renders its greeting in the background
+    print("\n1. Create...")
+    created = await agents.create_agent(agents.AgentCreate(name="Greeter", greeting="Hello, thanks for calling!"))
+    agent = agents.agents_db[created.id]
+    assert agents.get_greeting_audio(agent) is None  # Not blocking the request
+    await wait_for_renders()
+    assert agents.get_greeting_audio(agent) == fake_audio("Hello, thanks for calling!")
+    response = await get_greeting_audio_file(created.id)
+    assert response.body == fake_audio("Hello, thanks for calling!")
+    print("   ✓ Greeting rendered after create and served from the agent")
+
+    # 2. Unrelated changes keep the audio, greeting/voice/speed changes replace it
+    print("\n2. Update...")
+    server.requests.clear()
+    await agents.update_agent(created.id, agents.AgentUpdate(system_prompt="Be brief."))
+    assert agents.get_greeting_audio(agent) is not None and not agents.greeting_renders
+    await agents.update_agent(created.id, agents.AgentUpdate(speed="1.2x"))
+    assert agents.get_greeting_audio(agent) is None  # Invalidated immediately
+    await agents.update_agent(created.id, agents.AgentUpdate(greeting="Hi! How can I help?"))
+    await wait_for_renders()
+    assert agents.get_greeting_audio(agent) == fake_audio("Hi! How can I help?")
+    print(f"   ✓ Re-rendered on change, stale render superseded (upstream: {upstream_texts()})")
+
+    # 3. Other formats are rendered on demand and kept alongside
+    print("\n3. Per-format audio...")
+    await agents.schedule_greeting_render(agent, ULAW_8000)
+    assert agents.get_greeting_audio(agent, ULAW_8000) is not None
+    assert agents.schedule_greeting_render(agent, ULAW_8000) is None  # Already stored
+    assert server.requests[-1][3]["output_format"] == "ulaw_8000"
+    print("   ✓ μ-law greeting stored next to mp3")
+
+    # 4. Deleting the agent stops its render
+    print("\n4. Delete...")
+    await agents.update_agent(created.id, agents.AgentUpdate(greeting="Goodbye for now."))
+    render = agents.greeting_renders[f"{created.id}:mp3_44100_128"][1]
+    await agents.delete_agent(created.id)
+    await wait_for_renders()
+    assert render.cancelled() and not agents.greeting_renders
+    print("   ✓ Render cancelled")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
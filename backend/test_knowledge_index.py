@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Test knowledge chunking, BM25 retrieval and per-turn passage injection (offline)"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.gemini_service as gemini_service
+from routes import agents
+from services.agent_profile import RETRIEVED_KNOWLEDGE_INSTRUCTION, get_agent_profile
+from services.knowledge_service import knowledge_indexes, retrieve_knowledge
+from utils.bm25_index import BM25Index, chunk_text, tokenize
+
+POLICIES = [
+    "Returns are accepted within 30 days of delivery if the item is unused and in its original packaging.",
+    "Standard shipping takes 3 to 5 business days. Express shipping arrives the next business day.",
+    "Our support line is open Monday to Friday from 9am to 5pm Eastern time.",
+    "Gift cards never expire and can be used on any order, including sale items.",
+    "Warranty claims require the order number and a photo of the damaged product.",
+]
+
+
+class RecordingModel:
+    """Captures the contents sent to Gemini"""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, contents, stream=False):
+        self.requests.append(contents)
+        return iter([type("Chunk", (), {"text": "Sure."})()])
+
+
+def filler_paragraph(rng: random.Random, words: list) -> str:
+    sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(8, 16))).capitalize() + "."
+                 for _ in range(rng.randint(3, 6))]
+    return " ".join(sentences)
+
+
+async def test():
+    print("Testing knowledge retrieval")
+    print("="*50)
+
+    # 1. Chunking keeps sentences whole
+    print("\n1. Chunking...")
+    text = "\n\n".join(POLICIES * 4)
+    chunks = chunk_text(text, max_chars=200)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert tokenize("The customer's Returns") == ["customer", "return"]
+    print(f"   ✓ {len(text)} chars -> {len(chunks)} passages")
+
+    # 2. Ranking
+    print("\n2. Ranking...")
+    index = BM25Index()
+    index.set_document("policies", POLICIES)
+    assert index.search("how many days do I have to return something?", 1)[0][1] == POLICIES[0]
+    assert index.search("when is support open", 1)[0][1] == POLICIES[2]
+    assert index.search("express shipping", 1)[0][1] == POLICIES[1]
+    assert index.search("unrelated zebra", 4) == []
+    print("   ✓ Relevant passage ranked first")
+
+    # 3. Incremental updates only tokenize changed passages
+    print("\n3. Incremental update...")
+    tokenized = index.chunks_tokenized
+    index.set_document("policies", POLICIES[:4] + ["Warranty claims need the order number only."])
+    assert index.chunks_tokenized == tokenized + 1 and index.chunks_reused == 4
+    assert index.search("warranty photo", 1)[0][1] == "Warranty claims need the order number only."
+    assert index.remove_document("policies") and index.chunk_count == 0 and index.search("returns") == []
+    print("   ✓ 1 passage re-tokenized, 4 reused")
+
+    # 4. Retrieval stays in single-digit milliseconds on a large knowledge base
+    print("\n4. Large knowledge base...")
+    rng = random.Random(7)
+    words = [f"term{i}" for i in range(5000)]
+    corpus = "\n\n".join(filler_paragraph(rng, words) for _ in range(4000))
+    start = time.perf_counter()
+    index.set_document("corpus", chunk_text(corpus))
+    build_time = time.perf_counter() - start
+    timings = []
+    for _ in range(300):
+        query = " ".join(rng.choice(words) for _ in range(12))
+        start = time.perf_counter()
+        index.search(query, 4)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    assert p99 < 0.01, f"p99 {p99 * 1000:.1f}ms"
+    print(f"   ✓ {len(corpus) // 1000}KB, {index.chunk_count} passages, built in {build_time:.2f}s, "
+          f"search p50 {timings[len(timings) // 2] * 1000:.2f}ms / p99 {p99 * 1000:.2f}ms")
+
+    # 5. Agents send only the passages relevant to the turn
+    print("\n5. Agent turns...")
+    gemini_service.GEMINI_API_KEY = "test"
+    knowledge = "\n\n".join(POLICIES + [filler_paragraph(rng, words) for _ in range(40)])
+    created = await agents.create_agent(agents.AgentCreate(name="Store", custom_knowledge=knowledge))
+    agent = agents.agents_db[created.id]
+    await asyncio.sleep(0.2)  # Indexed in the background
+    profile = get_agent_profile(agent)
+    assert RETRIEVED_KNOWLEDGE_INSTRUCTION in profile.system_instruction
+    assert "Gift cards" not in profile.system_instruction
+    model = profile.model = RecordingModel()
+    async for _ in gemini_service.generate_gemini_response_stream("Do gift cards expire?", [], agent):
+        pass
+    final_turn = model.requests[-1][-1]
+    assert final_turn["role"] == "user" and final_turn["parts"][-1] == "Do gift cards expire?"
+    excerpts = final_turn["parts"][0]
+    assert excerpts.startswith("Knowledge base excerpts:\n" + POLICIES[3])
+    print(f"   ✓ {len(excerpts)} chars of excerpts instead of {len(knowledge)} chars of knowledge")
+
+    # Updating the knowledge re-indexes it; deleting the agent drops the index
+    tokenized = knowledge_indexes[created.id].chunks_tokenized
+    await agents.update_agent(created.id, agents.AgentUpdate(custom_knowledge=knowledge.replace("never expire", "expire after a year")))
+    compiled_while_indexing = get_agent_profile(agent)
+    await asyncio.sleep(0.2)
+    assert knowledge_indexes[created.id].chunks_tokenized == tokenized + 1
+    assert get_agent_profile(agent) is not compiled_while_indexing, "Profile not recompiled after indexing"
+    assert "expire after a year" in retrieve_knowledge(created.id, "gift card expiry", 1)[0]
+    await agents.delete_agent(created.id)
+    assert created.id not in knowledge_indexes
+    print("   ✓ Re-indexed one changed passage on update, dropped on delete")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Test background ingestion of uploaded knowledge documents (offline)"""
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+import zipfile
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+from routes import agents
+from services.agent_profile import RETRIEVED_KNOWLEDGE_INSTRUCTION, get_agent_profile
+from services.knowledge_service import retrieve_knowledge, shutdown_knowledge_workers
+from utils.document_text import extract_text
+
+HANDBOOK = """# Store handbook
+
+## Returns
+
+Returns are accepted within **30 days** of delivery. See [the returns page](https://example.com/returns).
+
+## Shipping
+
+- Standard shipping takes 3 to 5 business days.
+- Express shipping arrives the next business day.
+"""
+
+
+def docx_bytes(paragraphs: list) -> bytes:
+    """A minimal Word document"""
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    xml = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+           f"<w:body>{body}</w:body></w:document>")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", xml)
+    return buffer.getvalue()
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str) -> dict:
+    statuses = []
+    while True:
+        document = (await client.get(url)).json()
+        if not statuses or statuses[-1] != document["status"]:
+            statuses.append(document["status"])
+        if document["status"] in ("ready", "failed"):
+            document["statuses"] = statuses
+            return document
+        await asyncio.sleep(0.01)
+
+
+async def test():
+    print("Testing knowledge ingestion")
+    print("="*50)
+    app = FastAPI()
+    app.include_router(agents.router)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    created = await agents.create_agent(agents.AgentCreate(name="Store"))
+    agent = agents.agents_db[created.id]
+    base = f"/api/agents/{created.id}/knowledge"
+
+    # 1. Text extraction
+    print("\n1. Extraction...")
+    text = extract_text(HANDBOOK.encode(), "handbook.md")
+    assert "**" not in text and "https" not in text and "#" not in text
+    assert "Returns are accepted within 30 days of delivery. See the returns page." in text
+    assert extract_text(b"<html><script>x()</script><p>Hello&nbsp;there</p><p>Bye</p></html>", "a.html") == "Hello there\n\nBye"
+    assert extract_text(b"item,price\nTea,3\nCake,5\n", "menu.csv") == "item: Tea; price: 3.\n\nitem: Cake; price: 5."
+    assert extract_text(docx_bytes(["Gift cards never expire."]), "cards.docx") == "Gift cards never expire."
+    print("   ✓ Markdown, HTML, CSV and Word documents")
+
+    # 2. Upload, progress and retrieval
+    print("\n2. Upload...")
+    response = await client.put(f"{base}/handbook.md", content=HANDBOOK.encode())
+    assert response.status_code == 202 and response.json()["status"] == "queued"
+    document = await wait_ready(client, f"{base}/handbook.md")
+    assert document["statuses"][-1] == "ready" and document["chunks"] > 0, document
+    assert agent["knowledge_resources"] == 1
+    assert "Express shipping" in retrieve_knowledge(created.id, "express shipping")[0]
+    assert RETRIEVED_KNOWLEDGE_INSTRUCTION in get_agent_profile(agent).system_instruction
+    print(f"   ✓ {' -> '.join(document['statuses'])}, {document['chunks']} passages")
+
+    # 3. Identical content is skipped; changed content reuses unchanged passages
+    print("\n3. Re-upload...")
+    response = await client.put(f"{base}/handbook.md", content=HANDBOOK.encode())
+    assert response.status_code == 200 and response.json()["content_hash"] == document["content_hash"]
+    changed = HANDBOOK.replace("3 to 5", "2 to 4")
+    assert (await client.put(f"{base}/handbook.md", content=changed.encode())).status_code == 202
+    document = await wait_ready(client, f"{base}/handbook.md")
+    assert document["chunks_reused"] == document["chunks"] - 1, document
+    assert "2 to 4" in retrieve_knowledge(created.id, "standard shipping")[0]
+    assert agent["knowledge_resources"] == 1
+    print(f"   ✓ Unchanged upload skipped; edit re-tokenized 1 of {document['chunks']} passages")
+
+    # 4. Rejected and failed uploads
+    print("\n4. Bad uploads...")
+    assert (await client.put(f"{base}/scan.pdf", content=b"%PDF")).status_code == 415
+    assert (await client.put(f"{base}/empty.txt", content=b"")).status_code == 400
+    limit = agents.KNOWLEDGE_CONFIG["max_documents"]
+    agents.KNOWLEDGE_CONFIG["max_documents"] = 1
+    assert (await client.put(f"{base}/extra.txt", content=b"More.")).status_code == 409
+    agents.KNOWLEDGE_CONFIG["max_documents"] = limit
+    assert (await client.put(f"{base}/broken.docx", content=b"not a zip")).status_code == 202
+    document = await wait_ready(client, f"{base}/broken.docx")
+    assert document["status"] == "failed" and "Word document" in document["error"]
+    assert agent["knowledge_resources"] == 1
+    print(f"   ✓ 415/400/409 up front; failed ingestion reported: {document['error']}")
+
+    # 5. A large document is ingested without stalling the event loop
+    print("\n5. Large document...")
+    rng = random.Random(3)
+    words = [f"term{i}" for i in range(5000)]
+    corpus = "\n\n".join(" ".join(rng.choice(words) for _ in range(80)) + "." for _ in range(15000))
+    worst = 0.0
+    start = time.perf_counter()
+    assert (await client.put(f"{base}/corpus.txt", content=corpus.encode())).status_code == 202
+    while (await client.get(f"{base}/corpus.txt")).json()["status"] not in ("ready", "failed"):
+        tick = time.perf_counter()
+        await asyncio.sleep(0.005)
+        worst = max(worst, time.perf_counter() - tick - 0.005)
+    document = (await client.get(f"{base}/corpus.txt")).json()
+    assert document["status"] == "ready", document
+    assert worst < 0.05, f"Event loop blocked for {worst * 1000:.0f}ms"
+    assert agent["knowledge_resources"] == 2
+    print(f"   ✓ {len(corpus) // 1000}KB, {document['chunks']} passages in {time.perf_counter() - start:.1f}s, "
+          f"worst loop lag {worst * 1000:.0f}ms")
+
+    # 6. Deletion
+    print("\n6. Deletion...")
+    assert (await client.delete(f"{base}/handbook.md")).status_code == 200
+    assert retrieve_knowledge(created.id, "express shipping") == []
+    assert agent["knowledge_resources"] == 1
+    assert [d["name"] for d in (await client.get(base)).json()] == ["broken.docx", "corpus.txt"]
+    assert (await client.delete(f"{base}/handbook.md")).status_code == 404
+    await agents.delete_agent(created.id)
+    assert retrieve_knowledge(created.id, "term1") == []
+    print("   ✓ Passages removed with the document and the agent")
+
+    await client.aclose()
+    shutdown_knowledge_workers()
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test the content-addressed TTS cache tiers (offline, local fake ElevenLabs server)"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from routes import audio
+from services.elevenlabs_client import ElevenLabsClient
+from utils.audio_cache import AudioCache
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing TTS cache")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 1. Memory tier LRU with a byte budget
+        print("\n1. Memory LRU eviction...")
+        cache = AudioCache(Path(temp_dir) / "tier", memory_bytes=250, disk_bytes=1000)
+        for key in ("a", "b", "c"):
+            await cache.put(key, key.encode() * 100)
+        assert cache.stats()["memory_entries"] == 2
+        assert cache.memory_evictions == 1
+        assert await cache.get("c") == b"c" * 100
+        assert cache.memory_hits == 1
+        print(f"   ✓ {cache.stats()['memory_bytes']} bytes in memory after {cache.memory_evictions} eviction")
+
+        # 2. Evicted entries come back from disk and are promoted
+        print("\n2. Disk tier hit...")
+        assert await cache.get("a") == b"a" * 100
+        assert cache.disk_hits == 1
+        assert await cache.get("a") == b"a" * 100
+        assert cache.memory_hits == 2
+        assert await cache.get("missing") is None
+        assert cache.misses == 1
+        print("   ✓ Disk hit promoted into memory")
+
+        # 3. Disk tier size cap and restart
+        print("\n3. Disk size cap and reload...")
+        for key in ("d", "e", "f", "g", "h", "i", "j", "k"):
+            await cache.put(key, key.encode() * 100)
+        stats = cache.stats()
+        assert stats["disk_bytes"] <= 1000 and cache.disk_evictions > 0
+        assert len(list(cache.disk_dir.iterdir())) == stats["disk_entries"]
+        reloaded = AudioCache(cache.disk_dir, memory_bytes=250, disk_bytes=1000)
+        assert reloaded.stats()["disk_entries"] == stats["disk_entries"]
+        assert await reloaded.get("k") == b"k" * 100
+        print(f"   ✓ {stats['disk_entries']} files, {stats['disk_bytes']} bytes, {cache.disk_evictions} evicted")
+
+        # 4. Repeated phrases are served without an upstream call
+        print("\n4. Service integration...")
+        elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+        elevenlabs_service.ELEVENLABS_API_KEY = "test"
+
+        def upstream_calls():
+            return [body["text"] for _, _, body, _ in server.requests]
+
+        elevenlabs_service.tts_cache = AudioCache(Path(temp_dir) / "service", memory_bytes=1 << 20, disk_bytes=1 << 20)
+
+        greeting = "Hello! How can I help you today?"
+        first_url = await elevenlabs_service.generate_tts_audio_fast(greeting)
+        second_url = await elevenlabs_service.generate_tts_audio_fast(greeting)
+        assert first_url == second_url and first_url.startswith("/audio/cache/")
+        assert upstream_calls() == [greeting]
+
+        streamed = b"".join([chunk async for chunk in elevenlabs_service.stream_tts_audio(greeting)])
+        assert streamed == fake_audio(greeting)
+        assert upstream_calls() == [greeting], "Streaming a cached phrase called upstream"
+
+        reply = "Sure, one moment."
+        first = b"".join([chunk async for chunk in elevenlabs_service.stream_tts_audio(reply)])
+        second = b"".join([chunk async for chunk in elevenlabs_service.stream_tts_audio(reply)])
+        assert first == second == fake_audio(reply) and upstream_calls() == [greeting, reply]
+
+        # Different voice settings are a different key
+        assert elevenlabs_service.tts_cache_key(reply) != elevenlabs_service.tts_cache_key(
+            reply, settings={"stability": 0.9, "similarity_boost": 0.75})
+        print(f"   ✓ 2 upstream calls for 5 requests ({elevenlabs_service.tts_cache.stats()})")
+
+        # 5. Served files carry their format, and handed-out URLs survive eviction until fetched
+        print("\n5. Formats and pinned URLs...")
+        pcm_key = elevenlabs_service.tts_cache_key(reply, output_format="pcm_16000")
+        assert pcm_key.endswith(".pcm_16000") and first_url.endswith(".mp3_44100_128")
+        await elevenlabs_service.tts_cache.put(pcm_key, b"\x00\x01" * 50)
+        app = FastAPI()
+        app.include_router(audio.router)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        response = await client.get(f"/audio/cache/{pcm_key}")
+        assert response.headers["content-type"] == "audio/L16;rate=16000" and len(response.content) == 100
+        assert (await client.get(first_url)).headers["content-type"] == "audio/mpeg"
+
+        cache = elevenlabs_service.tts_cache = AudioCache(Path(temp_dir) / "pinned", memory_bytes=1 << 20,
+                                                          disk_bytes=len(fake_audio(greeting)) + 3000)
+        url = await elevenlabs_service.generate_tts_audio_fast(greeting)
+        for filler in ("one", "two", "three"):
+            await cache.put(filler, fake_audio(filler))
+        assert cache.disk_evictions > 0
+        assert cache.path(url.rsplit("/", 1)[1]).exists(), "Handed-out URL evicted before it was fetched"
+        response = await client.get(url)
+        assert response.status_code == 200 and response.content == fake_audio(greeting)
+        await cache.put("four", fake_audio("four") * 3)
+        assert not cache.path(url.rsplit("/", 1)[1]).exists(), "Fetched entry still pinned"
+        await client.aclose()
+        print(f"   ✓ {response.headers['content-type']} / audio/L16 served; pinned file kept through "
+              f"{cache.disk_evictions} evictions")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
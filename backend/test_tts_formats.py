@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test per-session TTS output formats (offline, local fake ElevenLabs server)"""
+import asyncio
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from services.elevenlabs_client import ElevenLabsClient
+from services.tts_formats import MP3, OPUS, ULAW_8000, negotiate_tts_format
+from utils.audio_frames import align_frames
+from utils.single_flight import SingleFlight
+
+
+async def odd_chunks(data: bytes, size: int = 1023):
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing TTS output formats")
+    print("="*50)
+
+    # 1. Negotiation from audio_config fields
+    print("\n1. Negotiation...")
+    assert negotiate_tts_format("pcm16", 8000, streaming=True).elevenlabs == "pcm_8000"
+    assert negotiate_tts_format("LINEAR16", 16000, streaming=True).elevenlabs == "pcm_16000"
+    assert negotiate_tts_format("pcm", 11025, streaming=True).elevenlabs == "pcm_8000"  # Nearest supported rate
+    assert negotiate_tts_format("ulaw", 16000, streaming=True) is ULAW_8000
+    assert negotiate_tts_format("opus", 8000, streaming=True) is OPUS
+    assert negotiate_tts_format("flac", 8000, streaming=True) is MP3
+    assert negotiate_tts_format("pcm", 8000, streaming=False) is MP3  # URL delivery plays files
+    print("   ✓ pcm at the call rate, ulaw_8000, opus, mp3 fallback")
+
+    # 2. PCM frames never split a sample
+    print("\n2. Sample alignment...")
+    audio = bytes(range(256)) * 40
+    chunks = [chunk async for chunk in align_frames(odd_chunks(audio), 2)]
+    assert b"".join(chunks) == audio and all(len(chunk) % 2 == 0 for chunk in chunks)
+    print(f"   ✓ {len(chunks)} chunks, all whole 16-bit samples")
+
+    # 3. The format reaches ElevenLabs and is part of the cache key
+    print("\n3. Streaming in each format...")
+    elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+    elevenlabs_service.ELEVENLABS_API_KEY = "test"
+    elevenlabs_service.tts_cache = None  # Every format must reach the fake server
+    elevenlabs_service.tts_flight = SingleFlight()
+    text = "Thanks for calling, how can I help?"
+    for tts_format in (MP3, negotiate_tts_format("pcm", 8000, True), ULAW_8000, OPUS):
+        received = b"".join([chunk async for chunk in elevenlabs_service.stream_tts_audio(text, tts_format=tts_format)])
+        assert received == fake_audio(text)
+        assert server.requests[-1][3]["output_format"] == tts_format.elevenlabs
+    formats = [params["output_format"] for kind, _, _, params in server.requests if kind == "stream"]
+    assert formats == ["mp3_44100_128", "pcm_8000", "ulaw_8000", "opus_48000_64"], formats
+    assert len({elevenlabs_service.tts_cache_key(text, output_format=f) for f in formats}) == 4
+    print(f"   ✓ Upstream formats: {', '.join(formats)}")
+
+    # 4. Text-in sessions request the same format
+    print("\n4. Text-in session...")
+    elevenlabs_service.ELEVENLABS_CLIENT_CONFIG["base_url"] = server.base_url
+    async with elevenlabs_service.stream_input_session("agent-1", ULAW_8000) as session:
+        collector = asyncio.create_task(session.audio().__anext__())
+        await session.send_text("Hello there, thanks for calling.")
+        await session.finish()
+        assert await collector
+    assert server.requests[-1][3]["output_format"] == "ulaw_8000"
+    print("   ✓ Session opened with output_format=ulaw_8000")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Test incremental segmentation and the ordered, bounded-parallel TTS pipeline (offline)"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from handlers.tts_pipeline import TTSPipeline
+from utils.text_segmenter import SentenceSegmenter
+
+RESPONSE = ("Sure, I can definitely help you with booking that appointment. "
+            "Dr. Patel has openings on Tuesday at 3.30 pm and Wednesday morning. "
+            "Yes. Both are in person. "
+            "Would either of those work for you, or should I look further out?")
+
+
+def segment(text: str, chunk_size: int):
+    segmenter = SentenceSegmenter()
+    segments = []
+    for i in range(0, len(text), chunk_size):
+        segments.extend(segmenter.feed(text[i:i + chunk_size]))
+    tail = segmenter.flush()
+    if tail:
+        segments.append(tail)
+    return segments
+
+
+async def test():
+    print("Testing TTS pipeline")
+    print("="*50)
+
+    # 1. Segmentation is independent of how the LLM chunks its output
+    print("\n1. Segmenting streamed text...")
+    reference = segment(RESPONSE, len(RESPONSE))
+    for chunk_size in (1, 3, 7, 20):
+        assert segment(RESPONSE, chunk_size) == reference, f"Segments differ for chunk size {chunk_size}"
+    assert " ".join(reference) == RESPONSE.strip()
+    assert reference[0] == "Sure, I can definitely help you with booking that appointment."
+    assert reference[1].startswith("Dr. Patel") and "3.30 pm" in reference[1]
+    for item in reference:
+        print(f"   • {item}")
+
+    # 2. A long opening sentence starts TTS at the first clause
+    print("\n2. Early first clause...")
+    segmenter = SentenceSegmenter()
+    early = segmenter.feed("Absolutely, I have pulled up your account details, and ")
+    assert early == ["Absolutely, I have pulled up your account details,"], early
+    print(f"   ✓ First segment: '{early[0]}'")
+
+    # 3. Run-on text is split at max_chars
+    segmenter = SentenceSegmenter(max_chars=50)
+    pieces = segmenter.feed("word " * 40)
+    assert pieces and all(len(piece) <= 50 for piece in pieces)
+
+    # 4. Bounded parallelism, strictly ordered emission
+    print("\n3. Ordered emission with bounded parallelism...")
+    rng = random.Random(0)
+    running = 0
+    peak = 0
+
+    async def synthesize(text, index):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            for part in range(3):
+                await asyncio.sleep(rng.uniform(0.001, 0.02))
+                yield f"{text}#{part}"
+        finally:
+            running -= 1
+
+    pipeline = TTSPipeline(synthesize, max_parallel=2)
+    texts = [f"segment {i}" for i in range(12)]
+
+    async def feed():
+        for text in texts:
+            pipeline.submit(text)
+            await asyncio.sleep(0.002)
+        pipeline.close()
+
+    async def play():
+        played = []
+        async for item in pipeline.segments():
+            async for audio in item.audio():
+                played.append(audio)
+        return played
+
+    start = time.perf_counter()
+    _, played = await asyncio.gather(feed(), play())
+    elapsed = time.perf_counter() - start
+    assert played == [f"{text}#{part}" for text in texts for part in range(3)], "Out of order"
+    assert peak == 2, f"Peak parallelism {peak}"
+    print(f"   ✓ {len(played)} chunks in order, peak {peak} concurrent, {elapsed * 1000:.0f}ms")
+
+    # 5. Failed segments are skipped, cancel stops pending work
+    print("\n4. Failure and cancellation...")
+
+    async def flaky(text, index):
+        if text == "bad":
+            raise RuntimeError("upstream error")
+        await asyncio.sleep(0.01)
+        yield text
+
+    pipeline = TTSPipeline(flaky, max_parallel=2)
+    for text in ("one", "bad", "three"):
+        pipeline.submit(text)
+    pipeline.close()
+    played = [audio async for item in pipeline.segments() async for audio in item.audio()]
+    assert played == ["one", "three"]
+
+    async def slow(text, index):
+        await asyncio.sleep(10)
+        yield text
+
+    pipeline = TTSPipeline(slow, max_parallel=2)
+    for text in ("a", "b", "c"):
+        pipeline.submit(text)
+    await asyncio.sleep(0.01)
+    pipeline.cancel()
+    played = [audio async for item in pipeline.segments() async for audio in item.audio()]
+    assert played == []
+    print("   ✓ Failed segment skipped, cancelled pipeline drained")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Test coalescing of concurrent identical TTS requests (offline, local fake ElevenLabs server)"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_elevenlabs_server
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from services.elevenlabs_client import ElevenLabsClient
+from utils.single_flight import SingleFlight
+
+CALLS = 20
+
+
+async def test(server: FakeElevenLabsServer, audio_dir: Path):
+    print("Testing TTS single-flight")
+    print("="*50)
+
+    def upstream_calls():
+        return [body["text"] for _, _, body, _ in server.requests]
+
+    fake_elevenlabs_server.FIRST_BYTE_DELAY = 0.2  # Keep generations in flight long enough to overlap
+    elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+    elevenlabs_service.ELEVENLABS_API_KEY = "test"
+    elevenlabs_service.tts_cache = None  # Exercise coalescing on its own
+    elevenlabs_service.AUDIO_DIR = audio_dir
+    elevenlabs_service.tts_flight = SingleFlight()
+
+    # 1. A burst of calls starting on the same agent
+    print(f"\n1. {CALLS} concurrent greeting requests...")
+    greeting = "Hello! How can I help you today?"
+    urls = await asyncio.gather(*[elevenlabs_service.generate_tts_audio_fast(greeting) for _ in range(CALLS)])
+    assert len(set(urls)) == 1 and urls[0]
+    assert len(list(audio_dir.glob("*.mp3"))) == 1
+    assert upstream_calls() == [greeting], f"{len(upstream_calls())} upstream calls"
+    print(f"   ✓ 1 upstream call, {elevenlabs_service.tts_flight.coalesced} coalesced")
+
+    # 2. A cancelled caller does not cancel the generation for the others
+    print("\n2. Cancelling one waiter...")
+    server.requests.clear()
+    reply = "Sure, one moment."
+    tasks = [asyncio.create_task(elevenlabs_service.generate_tts_audio_fast(reply)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    tasks[0].cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] == results[2] and results[1]
+    assert upstream_calls() == [reply]
+    print("   ✓ Remaining callers got the shared result")
+
+    # 3. Concurrent streams share one upstream stream, late joiners replay from the start
+    print("\n3. Concurrent streams...")
+    server.requests.clear()
+    text = "Let me check that for you."
+    expected = fake_audio(text)
+
+    async def consume(delay):
+        await asyncio.sleep(delay)
+        return b"".join([chunk async for chunk in elevenlabs_service.stream_tts_audio(text)])
+
+    streams = await asyncio.gather(consume(0), consume(0), consume(0.05))
+    assert all(stream == expected for stream in streams)
+    assert upstream_calls() == [text]
+    print("   ✓ 3 listeners, 1 upstream stream")
+
+    # 4. One listener leaving does not cut off the others
+    print("\n4. Interrupted listener...")
+    server.requests.clear()
+
+    async def interrupted():
+        async for _ in elevenlabs_service.stream_tts_audio(text):
+            break
+
+    _, complete = await asyncio.gather(interrupted(), consume(0))
+    assert complete == expected and upstream_calls() == [text]
+    assert elevenlabs_service.tts_flight.in_flight() == 0
+    print("   ✓ Remaining listener received the full stream")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server, tempfile.TemporaryDirectory() as temp_dir:
+        asyncio.run(test(fake_server, Path(temp_dir)))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test text-in streaming TTS sessions against the local fake ElevenLabs server"""
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer, fake_audio
+from services.elevenlabs_stream_input import StreamInputSession, stream_input_url
+
+RESPONSE = ("Sure, I can help with that. Your appointment is booked for Tuesday at three, "
+            "and you will get a confirmation text shortly. Is there anything else?")
+
+
+async def token_stream(text: str, size: int = 6, delay: float = 0.01):
+    """Stand-in for the Gemini token stream"""
+    for i in range(0, len(text), size):
+        await asyncio.sleep(delay)
+        yield text[i:i + size]
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing text-in streaming TTS")
+    print("="*50)
+
+    url = stream_input_url(server.base_url, "voice", "eleven_turbo_v2", optimize_streaming_latency=3)
+    voice_settings = {"stability": 0.5, "similarity_boost": 0.75}
+
+    # 1. Audio starts while the LLM is still generating
+    print("\n1. Overlapping generation and synthesis...")
+    session = StreamInputSession(url, "fake-key", voice_settings, chunk_length_schedule=[50, 90])
+    session.start()
+    received = []
+    first_audio_at = None
+
+    async def collect():
+        nonlocal first_audio_at
+        async for chunk in session.audio():
+            if first_audio_at is None:
+                first_audio_at = time.perf_counter()
+            received.append(chunk)
+
+    collector = asyncio.create_task(collect())
+    async for text in token_stream(RESPONSE):
+        assert await session.send_text(text)
+    llm_done_at = time.perf_counter()
+    assert await session.finish()
+    await collector
+    await session.close()
+
+    _, voice_id, record, params = server.requests[-1]
+    assert "".join(record["text"]) == RESPONSE
+    assert record["begin"]["voice_settings"] == voice_settings and record["begin"]["xi_api_key"] == "fake-key"
+    assert params["optimize_streaming_latency"] == "3"
+    assert first_audio_at < llm_done_at, "No audio before the LLM finished"
+    assert len(b"".join(received)) == len(fake_audio("x" * len(RESPONSE)))
+    print(f"   ✓ {len(received)} audio chunks, first {(llm_done_at - first_audio_at) * 1000:.0f}ms before the LLM finished")
+    print(f"   ✓ Connected in {session.connect_time * 1000:.0f}ms, first audio {session.first_audio_latency * 1000:.0f}ms after first text")
+
+    # 2. Interrupting closes the session mid-turn
+    print("\n2. Interruption...")
+    session = StreamInputSession(url, "fake-key", voice_settings)
+    session.start()
+    assert await session.send_text("This sentence will be cut off before it ends")
+    await session.close()
+    assert not await session.send_text(" and never finishes.")
+    await asyncio.sleep(0.1)
+    assert server.requests[-1][2].get("disconnected"), "Server did not see the session close"
+    print("   ✓ Session closed, further text rejected")
+
+    # 3. A session failing mid-turn reports the text it has not spoken
+    print("\n3. Unspoken text after a failure...")
+    session = StreamInputSession(url, "fake-key", voice_settings, chunk_length_schedule=[50, 500])
+    session.start()
+    received = []
+    collector = asyncio.create_task(collect())
+    async for text in token_stream(RESPONSE[:120]):
+        assert await session.send_text(text)
+    while not received:
+        await asyncio.sleep(0.01)
+    collector.cancel()
+    await session.close()
+    unspoken = session.unspoken_text()
+    spoken = RESPONSE[:120][:len(RESPONSE[:120]) - len(unspoken)]
+    assert 0 < session.spoken_chars < 120 and RESPONSE[:120].endswith(unspoken)
+    assert len(unspoken) >= 120 - session.spoken_chars, "Unspoken text dropped"
+    assert spoken.endswith(" ") or unspoken.startswith(" "), "Fallback resumes mid-word"
+    print(f"   ✓ {session.spoken_chars} of 120 characters spoken, fallback resumes at '{unspoken[:20]}...'")
+
+    # 4. Service session uses the configured base URL and releases its scheduler slot
+    print("\n4. Service session...")
+    elevenlabs_service.ELEVENLABS_CLIENT_CONFIG["base_url"] = server.base_url
+    async with elevenlabs_service.stream_input_session("agent-1") as session:
+        collector = asyncio.create_task(session.audio().__anext__())
+        assert await session.send_text("Hello there, thanks for calling. ")
+        assert await session.send_text("How can I help you today?")
+        await session.finish()
+        assert await collector
+    assert session.closed and elevenlabs_service.tts_scheduler._active == 0
+    print("   ✓ Session closed and slot released on exit")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
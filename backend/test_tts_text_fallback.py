@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Test the text-in TTS fallback in the websocket route (offline, local fake ElevenLabs server)"""
+import asyncio
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_elevenlabs_server
+import routes.websocket as websocket_route
+import services.elevenlabs_service as elevenlabs_service
+from fake_elevenlabs_server import FakeElevenLabsServer
+from fastapi import WebSocketDisconnect
+from services.elevenlabs_client import ElevenLabsClient
+from utils.audio_frames import unpack_audio_frame
+
+RESPONSE = ("Sure, I can help with that. Your appointment is booked for Tuesday at three, "
+            "and you will get a confirmation text shortly. Is there anything else I can do for you?")
+
+
+class FakeAudioHandler:
+    """Stands in for the VAD/Deepgram handler - transcripts are queued by the test"""
+
+    instances = []
+
+    def __init__(self, websocket, loop):
+        FakeAudioHandler.instances.append(self)
+        self.transcript_queue = asyncio.Queue()
+        self.is_listening_for_user = True
+        self.is_agent_speaking = False
+        self.is_interrupting = False
+        self.speech_start_time = None
+
+    def set_interrupt_callback(self, callback):
+        pass
+
+    def set_unheard_callback(self, callback):
+        pass
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def get_transcript(self):
+        return await self.transcript_queue.get()
+
+    def pause_listening(self):
+        self.is_listening_for_user = False
+
+    def resume_listening(self):
+        self.is_listening_for_user = True
+
+    def set_agent_speaking(self, speaking: bool):
+        self.is_agent_speaking = speaking
+
+    def enqueue_audio(self, data: bytes):
+        pass
+
+
+class FakeClient:
+    """The browser end of the call websocket"""
+
+    def __init__(self):
+        self.client = "test"
+        self.incoming = asyncio.Queue()
+        self.messages = []
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+    async def send_bytes(self, data: bytes):
+        self.frames.append(unpack_audio_frame(data))
+
+    def send(self, message: dict):
+        self.incoming.put_nowait({"text": json.dumps(message)})
+
+
+async def gemini_stream(transcript, conversation, agent):
+    """Stand-in for the Gemini token stream"""
+    for i in range(0, len(RESPONSE), 6):
+        await asyncio.sleep(0.01)
+        yield RESPONSE[i:i + 6]
+
+
+def words(text: str) -> list:
+    """Segments are trimmed, so compare text word by word"""
+    return text.split()
+
+
+async def test(server: FakeElevenLabsServer):
+    print("Testing text-in TTS fallback")
+    print("="*50)
+
+    elevenlabs_service.tts_client = ElevenLabsClient("test", base_url=server.base_url)
+    elevenlabs_service.ELEVENLABS_API_KEY = "test"
+    elevenlabs_service.ELEVENLABS_CLIENT_CONFIG["base_url"] = server.base_url
+    elevenlabs_service.tts_cache = None
+    websocket_route.TTS_PIPELINE_CONFIG["binary_streaming"] = True
+    websocket_route.AudioStreamHandler = FakeAudioHandler
+    websocket_route.generate_gemini_response_stream = gemini_stream
+
+    # 1. The session accepts the whole turn, then errors instead of speaking the end of it
+    print("\n1. Server fails after accepting all the text...")
+    fake_elevenlabs_server.FAIL_AT_END = True
+    client = FakeClient()
+    client.send({"type": "audio_config", "tts_streaming": True, "tts_input": "text_stream"})
+    call = asyncio.create_task(websocket_route.websocket_endpoint(client))
+    while not any(m["type"] == "audio_config_ack" for m in client.messages):
+        await asyncio.sleep(0.01)
+    handler = FakeAudioHandler.instances[-1]
+    await handler.transcript_queue.put("Can you book me in for Tuesday?")
+
+    async def turn_complete():
+        while not any(m["type"] == "stream_complete" for m in client.messages):
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(turn_complete(), timeout=10)
+    client.incoming.put_nowait(None)
+    await call
+
+    complete = next(m for m in client.messages if m["type"] == "stream_complete")
+    assert not complete.get("interrupted") and complete["full_text"] == RESPONSE
+    session = next(record for kind, _, record, _ in server.requests if kind == "stream-input")
+    assert "".join(session["text"]) == RESPONSE
+    fallback = [body["text"] for kind, _, body, _ in server.requests if kind == "stream"]
+    assert fallback, "Unspoken text was not resubmitted"
+    spoken, resubmitted = "".join(session["spoken"]), words(" ".join(fallback))
+    # The fallback resumes at the start of the first word the session did not finish
+    assert words(RESPONSE)[-len(resubmitted):] == resubmitted, "Fallback is not the end of the response"
+    assert len(" ".join(resubmitted)) >= len(RESPONSE) - len(spoken), "Unspoken text dropped"
+    assert len(" ".join(resubmitted)) < len(RESPONSE) - len(spoken) + len(resubmitted[0]), "Spoken text repeated"
+    streams = {stream_id for _, stream_id, _ in client.frames}
+    assert len(streams) == 1 + len(fallback), f"Audio from {len(streams)} streams"
+    print(f"   ✓ {len(spoken)} characters spoken by the session, "
+          f"{len(fallback)} fallback segment(s): {fallback}")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    with FakeElevenLabsServer() as fake_server:
+        asyncio.run(test(fake_server))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test the shared batched VAD engine against inline evaluation"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+import webrtcvad
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from handlers.vad_engine import VADEngine, detect_speech
+from utils.voice_analysis import VoiceAnalyzer
+
+SESSIONS = 50
+MESSAGES = 40
+FRAMES_PER_MESSAGE = 3
+
+
+def make_session_audio(seed: int) -> np.ndarray:
+    """Alternating noise and voiced segments as (frames x samples) int16"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(240) / 8000
+    frames = []
+    for i in range(MESSAGES * FRAMES_PER_MESSAGE):
+        if (i // 20) % 2:
+            pitch = rng.uniform(100, 250)
+            signal = sum(2000 / h * np.sin(2 * np.pi * pitch * h * (t + i * 0.03)) for h in range(1, 8))
+        else:
+            signal = np.zeros(240)
+        frames.append(np.clip(signal + rng.normal(0, 50, 240), -32768, 32767).astype(np.int16))
+    return np.stack(frames)
+
+
+async def test():
+    print("Testing VADEngine")
+    print("="*50)
+
+    engine = VADEngine(8000, 240, max_queue_size=1024, max_batch_frames=256, max_batch_latency_ms=2.0)
+    analyzer = VoiceAnalyzer(240, 8000)
+    audio = [make_session_audio(seed) for seed in range(SESSIONS)]
+
+    async def run_session(index: int):
+        vad = webrtcvad.Vad(2)
+        speech, voice = [], []
+        for m in range(MESSAGES):
+            samples = audio[index][m * FRAMES_PER_MESSAGE:(m + 1) * FRAMES_PER_MESSAGE]
+            is_speech, is_voice_like = await engine.submit(vad, samples)
+            speech.append(is_speech)
+            voice.append(is_voice_like)
+            await asyncio.sleep(0.001)
+        return np.concatenate(speech), np.concatenate(voice)
+
+    # Measure event loop lag while the sessions run
+    lags = []
+
+    async def monitor():
+        while True:
+            start = loop.time()
+            await asyncio.sleep(0.005)
+            lags.append(loop.time() - start - 0.005)
+
+    loop = asyncio.get_running_loop()
+    monitor_task = asyncio.create_task(monitor())
+    print(f"\n1. Running {SESSIONS} sessions x {MESSAGES} messages...")
+    results = await asyncio.gather(*(run_session(i) for i in range(SESSIONS)))
+    monitor_task.cancel()
+    engine.stop()
+
+    print("\n2. Comparing with inline evaluation...")
+    for index, (is_speech, is_voice_like) in enumerate(results):
+        expected_speech = detect_speech(webrtcvad.Vad(2), audio[index], 8000)
+        expected_voice = np.zeros(len(expected_speech), dtype=bool)
+        expected_voice[expected_speech] = analyzer.voice_like(audio[index][expected_speech])
+        assert np.array_equal(is_speech, expected_speech), f"Session {index}: VAD differs"
+        assert np.array_equal(is_voice_like, expected_voice), f"Session {index}: voice flags differ"
+    print("   ✓ Identical decisions")
+
+    submissions = SESSIONS * MESSAGES
+    print(f"\n   Submissions: {submissions}, batches: {engine.batches} "
+          f"(avg {engine.frames / engine.batches:.1f} frames/batch), rejected: {engine.rejected}")
+    print(f"   Event loop lag: max {max(lags) * 1000:.1f}ms, mean {np.mean(lags) * 1000:.2f}ms")
+
+    print("\n" + "="*50)
+    print("Test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
@@ -0,0 +1,97 @@
+"""Bridge blocking iterators into asyncio without blocking the event loop"""
+import asyncio
+import concurrent.futures
+import threading
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Error:
+    """Exception raised by the iterator, carried across to the loop"""
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+async def iterate_in_thread(make_iterator: Callable[[], Iterator[T]], max_queue: int = 16,
+                            name: str = "iterator-bridge", executor: Optional[Executor] = None,
+                            cancel: Optional[Callable[[Iterator[T]], None]] = None) -> AsyncIterator[T]:
+    """Run a blocking iterator on its own thread (or an executor worker) and yield its items asynchronously.
+
+    The thread waits whenever ``max_queue`` items are pending, so a slow
+    consumer applies backpressure. Cancelling or closing the async iterator
+    stops the thread at the next item and closes the underlying iterator.
+    If the thread may be blocked waiting for that next item (e.g. on the
+    network), ``cancel(iterator)`` is called to abort the wait.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+    stopped = threading.Event()
+    started = []  # The iterator, once make_iterator() returned
+    finished = False
+
+    def put(item) -> bool:
+        """Hand one item to the loop, giving up if the consumer went away"""
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stopped.is_set() or loop.is_closed():
+                    future.cancel()
+                    return False
+            except concurrent.futures.CancelledError:
+                return False
+
+    def run():
+        iterator = None
+        try:
+            iterator = make_iterator()
+            started.append(iterator)
+            if stopped.is_set():
+                # Consumer left while the iterator was being created
+                if cancel:
+                    cancel(iterator)
+                return
+            for item in iterator:
+                if stopped.is_set() or not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            if not stopped.is_set():
+                put(_Error(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    if executor:
+        executor.submit(run)
+    else:
+        threading.Thread(target=run, name=name, daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE or isinstance(item, _Error):
+                finished = True
+            if item is _DONE:
+                return
+            if isinstance(item, _Error):
+                raise item.exception
+            yield item
+    finally:
+        stopped.set()
+        if cancel and started and not finished:
+            try:
+                cancel(started[0])
+            except Exception:
+                pass
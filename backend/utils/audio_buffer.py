@@ -0,0 +1,98 @@
+"""Preallocated ring buffer for PCM audio frames"""
+from typing import List, Optional
+
+
+class AudioRingBuffer:
+    """Circular byte buffer backed by a single preallocated bytearray.
+
+    When ``frame_size`` is given the capacity is rounded up to a whole number
+    of frames, so segments returned by ``read_frames`` never split a frame around the end
+    of the storage and can be handed out as zero-copy memoryviews. A view is
+    only valid until the buffer is written to again.
+    """
+
+    def __init__(self, capacity: int, frame_size: Optional[int] = None):
+        if frame_size:
+            capacity = -(-capacity // frame_size) * frame_size
+        self.capacity = capacity
+        self.frame_size = frame_size
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # Offset of the oldest byte
+        self._size = 0  # Number of valid bytes
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free(self) -> int:
+        """Bytes that can be written without overwriting unread data"""
+        return self.capacity - self._size
+
+    def _copy_in(self, data, offset: int):
+        """Copy data into storage starting at offset, wrapping if needed"""
+        first = min(len(data), self.capacity - offset)
+        self._view[offset:offset + first] = data[:first]
+        if first < len(data):
+            self._view[:len(data) - first] = data[first:]
+
+    def write(self, data) -> int:
+        """Append as much of data as fits, returning the number of bytes written"""
+        data = memoryview(data).cast("B")
+        count = min(len(data), self.free)
+        if count:
+            self._copy_in(data[:count], (self._start + self._size) % self.capacity)
+            self._size += count
+        return count
+
+    def overwrite(self, data):
+        """Append data, discarding the oldest bytes so only the newest capacity bytes remain"""
+        data = memoryview(data).cast("B")
+        if len(data) >= self.capacity:
+            self._view[:] = data[len(data) - self.capacity:]
+            self._start = 0
+            self._size = self.capacity
+            return
+        self._copy_in(data, (self._start + self._size) % self.capacity)
+        overflow = self._size + len(data) - self.capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % self.capacity
+            self._size = self.capacity
+        else:
+            self._size += len(data)
+
+    def frames_available(self) -> int:
+        """Number of complete frames ready to be read"""
+        return self._size // self.frame_size
+
+    def read_frames(self) -> List[memoryview]:
+        """Return views covering every complete frame and consume them.
+
+        The frames come back as at most two contiguous, frame-aligned segments
+        (two when the data wraps around the end of the storage).
+        """
+        count = self.frames_available() * self.frame_size
+        if not count:
+            return []
+        end = self._start + count
+        if end <= self.capacity:
+            segments = [self._view[self._start:end]]
+        else:
+            segments = [self._view[self._start:], self._view[:end - self.capacity]]
+        self._start = end % self.capacity
+        self._size -= count
+        return segments
+
+    def copy_to(self, target: bytearray):
+        """Extend target with the buffered bytes in order without consuming them"""
+        end = self._start + self._size
+        if end <= self.capacity:
+            target.extend(self._view[self._start:end])
+        else:
+            target.extend(self._view[self._start:])
+            target.extend(self._view[:end - self.capacity])
+
+    def clear(self):
+        """Discard all buffered data"""
+        self._start = 0
+        self._size = 0
@@ -0,0 +1,238 @@
+"""Two-tier (memory LRU + disk) cache for generated audio, keyed by content hash"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from utils.helpers import timestamp
+
+
+class AudioCache:
+    """Audio bytes keyed by a content hash.
+
+    The memory tier is an LRU bounded by total bytes. Every entry is also
+    written to ``disk_dir`` (capped at ``disk_bytes``, least recently used
+    files evicted first), so a memory eviction or a restart only costs a file
+    read. Keys are used as file names, so callers put the audio format in
+    the key. Disk I/O runs in the default executor.
+
+    Entries whose file has been handed out by URL can be pinned so disk
+    eviction skips them until ``release()`` or ``pin_seconds`` pass.
+    """
+
+    def __init__(self, disk_dir: Path, memory_bytes: int, disk_bytes: int, pin_seconds: float = 300.0):
+        self.disk_dir = Path(disk_dir)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.pin_seconds = pin_seconds
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> file size, least recent first
+        self._disk_size = 0
+        self._disk_lock = threading.Lock()
+        self._pins: Dict[str, List[float]] = {}  # key -> [pin count, expiry]
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        self._load_disk_index()
+
+    def _load_disk_index(self):
+        """Index files left by a previous run, oldest first"""
+        if not self.disk_dir.is_dir():
+            return  # Created on the first write
+        files = sorted((path for path in self.disk_dir.iterdir() if path.is_file() and ".tmp" not in path.name),
+                       key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._disk[path.name] = size
+            self._disk_size += size
+        self._trim_disk()
+
+    def path(self, key: str) -> Path:
+        """Location of a key's disk entry"""
+        return self.disk_dir / key
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio, promoting disk hits into memory"""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return audio
+
+        if key in self._disk:
+            loop = asyncio.get_event_loop()
+            audio = await loop.run_in_executor(None, self._read_disk, key)
+            if audio is not None:
+                self.disk_hits += 1
+                self._put_memory(key, audio)
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes, pin: bool = False) -> bool:
+        """Store audio in both tiers; returns whether it has a disk file (pinned if ``pin``)"""
+        if not audio:
+            return False
+        self._put_memory(key, audio)
+        if pin:
+            self.pin(key)
+        loop = asyncio.get_event_loop()
+        if await loop.run_in_executor(None, self._write_disk, key, audio):
+            return True
+        if pin:
+            self.release(key)
+        return False
+
+    async def get_file(self, key: str, pin: bool = False) -> Optional[Path]:
+        """Return the path of cached audio without reading it, rewriting the file from memory if needed.
+
+        With ``pin`` the file is kept until ``release()`` (or ``pin_seconds``),
+        for paths handed out as URLs that the client fetches later.
+        """
+        loop = asyncio.get_event_loop()
+        if pin:
+            self.pin(key)
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            if key in self._disk:
+                await loop.run_in_executor(None, self._touch_disk, key)
+                self.memory_hits += 1
+                return self.path(key)
+            if await loop.run_in_executor(None, self._write_disk, key, audio):
+                self.memory_hits += 1
+                return self.path(key)
+
+        elif key in self._disk:
+            await loop.run_in_executor(None, self._touch_disk, key)
+            if self.path(key).exists():
+                self.disk_hits += 1
+                return self.path(key)
+
+        if pin:
+            self.release(key)
+        self.misses += 1
+        return None
+
+    def pin(self, key: str):
+        """Keep a key's disk file through eviction until released (or pin_seconds pass)"""
+        with self._disk_lock:
+            pin = self._pins.setdefault(key, [0, 0.0])
+            pin[0] += 1
+            pin[1] = time.monotonic() + self.pin_seconds
+
+    def release(self, key: str):
+        """Drop one pin taken by ``pin()`` or ``get_file(pin=True)``"""
+        with self._disk_lock:
+            pin = self._pins.get(key)
+            if pin:
+                pin[0] -= 1
+                if pin[0] <= 0:
+                    del self._pins[key]
+
+    def _pinned(self, key: str, now: float) -> bool:
+        """Whether a key is pinned (caller holds the lock)"""
+        pin = self._pins.get(key)
+        if pin and pin[1] <= now:
+            del self._pins[key]  # Never fetched
+            return False
+        return pin is not None
+
+    def _put_memory(self, key: str, audio: bytes):
+        """Insert into the memory LRU and evict down to the byte budget"""
+        if len(audio) > self.memory_bytes:
+            return  # Would evict everything else - leave it on disk only
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_size -= len(previous)
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.memory_evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read a disk entry (executor thread)"""
+        try:
+            audio = self.path(key).read_bytes()
+        except OSError:
+            with self._disk_lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_size -= size
+            return None
+        self._touch_disk(key)
+        return audio
+
+    def _touch_disk(self, key: str):
+        """Mark a disk entry as recently used (executor thread)"""
+        with self._disk_lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+
+    def _write_disk(self, key: str, audio: bytes) -> bool:
+        """Write a disk entry atomically and evict down to the size cap (executor thread)"""
+        if len(audio) > self.disk_bytes:
+            return False
+        path = self.path(key)
+        temp_path = path.with_name(f"{path.name}.tmp{threading.get_ident()}")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"{timestamp()} ⚠️  Audio cache write failed: {e}")
+            return False
+        with self._disk_lock:
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_size -= previous
+            self._disk[key] = len(audio)
+            self._disk_size += len(audio)
+            self._trim_disk()
+        return True
+
+    def _trim_disk(self):
+        """Delete least recently used unpinned files until under the size cap (caller holds the lock)"""
+        if self._disk_size <= self.disk_bytes:
+            return
+        now = time.monotonic()
+        for key in [key for key in self._disk if not self._pinned(key, now)]:
+            if self._disk_size <= self.disk_bytes:
+                break
+            self._disk_size -= self._disk.pop(key)
+            self.disk_evictions += 1
+            try:
+                self.path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Counters and tier sizes"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_size,
+        }
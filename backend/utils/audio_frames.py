@@ -0,0 +1,47 @@
+"""Binary websocket framing for streamed agent audio
+
+Streamed TTS audio is sent to the client as binary websocket messages, each
+prefixed with a fixed header so the client can route it and drop audio from
+superseded generations:
+
+    uint32 generation_id   big-endian, the response this audio belongs to
+    uint32 stream_id       big-endian, one per synthesized text segment
+    bytes  payload         audio in the session's negotiated TTS format
+
+Each stream is bracketed by ``audio_stream_start`` / ``audio_stream_end``
+JSON messages carrying the same ids.
+"""
+import struct
+from typing import AsyncIterator
+
+AUDIO_FRAME_HEADER = struct.Struct(">II")
+
+
+def pack_audio_frame(generation_id: int, stream_id: int, payload: bytes) -> bytes:
+    """Prefix an audio payload with its generation and stream ids"""
+    return AUDIO_FRAME_HEADER.pack(generation_id, stream_id) + payload
+
+
+def unpack_audio_frame(frame: bytes):
+    """Split a frame into (generation_id, stream_id, payload) - the client-side decoding, used by tests"""
+    generation_id, stream_id = AUDIO_FRAME_HEADER.unpack_from(frame)
+    return generation_id, stream_id, frame[AUDIO_FRAME_HEADER.size:]
+
+
+async def align_frames(chunks: AsyncIterator[bytes], frame_bytes: int) -> AsyncIterator[bytes]:
+    """Re-chunk audio so every chunk holds whole samples (e.g. 2 bytes for 16-bit PCM).
+
+    HTTP chunk boundaries fall anywhere; a client decoding raw PCM per frame
+    would otherwise see split samples.
+    """
+    if frame_bytes <= 1:
+        async for chunk in chunks:
+            yield chunk
+        return
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk
+        usable = len(data) - len(data) % frame_bytes
+        remainder = data[usable:]
+        if usable:
+            yield data[:usable]
@@ -0,0 +1,236 @@
+"""In-process BM25 index over chunked text, with numpy array-backed postings"""
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "do", "does", "for", "from", "has", "have", "i",
+    "if", "in", "is", "it", "its", "me", "my", "of", "on", "or", "so", "that", "the", "their", "then", "there",
+    "this", "to", "was", "we", "were", "what", "when", "where", "which", "who", "will", "with", "you", "your",
+}
+
+
+def _normalize(token: str) -> str:
+    """Fold possessives and simple plurals (returns -> return, customer's -> customer)"""
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, lightly normalized word tokens without stopwords"""
+    tokens = (_normalize(token) for token in TOKEN.findall(text.lower()))
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def chunk_text(text: str, max_chars: int = 600) -> List[str]:
+    """Split text into passages of whole sentences, at most max_chars long where possible.
+
+    Paragraphs are kept together when they fit; longer ones are packed
+    sentence by sentence, and a single overlong sentence is split at words.
+    """
+    chunks = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        current = ""
+        for sentence in SENTENCE_BREAK.split(paragraph):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+class PackedTerms:
+    """Term counts of a list of chunks as flat arrays over a chunk-set-local vocabulary.
+
+    Chunk i's terms are ``words[term_ids[offsets[i]:offsets[i + 1]]]``.
+    Built wherever the text is tokenized (e.g. a worker process), it pickles
+    as a few buffers rather than millions of small objects.
+    """
+    __slots__ = ("words", "term_ids", "counts", "offsets", "lengths")
+
+    def __init__(self, words: List[str], term_ids: np.ndarray, counts: np.ndarray, offsets: np.ndarray,
+                 lengths: np.ndarray):
+        self.words = words
+        self.term_ids = term_ids
+        self.counts = counts
+        self.offsets = offsets
+        self.lengths = lengths
+
+    def __getstate__(self):
+        return (self.words, self.term_ids, self.counts, self.offsets, self.lengths)
+
+    def __setstate__(self, state):
+        self.words, self.term_ids, self.counts, self.offsets, self.lengths = state
+
+
+def pack_terms(chunks: List[str]) -> PackedTerms:
+    """Tokenize chunks into PackedTerms"""
+    vocabulary: Dict[str, int] = {}
+    term_ids, counts, offsets, lengths = [], [], [0], []
+    for chunk in chunks:
+        tokens = tokenize(chunk)
+        for word, count in Counter(tokens).items():
+            term_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+            counts.append(count)
+        offsets.append(len(term_ids))
+        lengths.append(len(tokens))
+    return PackedTerms(list(vocabulary), np.array(term_ids, dtype=np.int32), np.array(counts, dtype=np.float32),
+                       np.array(offsets, dtype=np.int64), np.array(lengths, dtype=np.int32))
+
+
+class _Chunk:
+    """A tokenized passage: unique term ids with their counts"""
+    __slots__ = ("text", "term_ids", "term_counts", "length")
+
+    def __init__(self, text: str, term_ids: np.ndarray, term_counts: np.ndarray, length: int):
+        self.text = text
+        self.term_ids = term_ids
+        self.term_counts = term_counts
+        self.length = length
+
+
+class _Snapshot:
+    """Immutable postings searched by readers while writers build the next one"""
+    __slots__ = ("idf", "indptr", "postings", "weights", "texts", "documents")
+
+    def __init__(self, idf, indptr, postings, weights, texts, documents):
+        self.idf = idf  # float32 per term
+        self.indptr = indptr  # Postings of term t are [indptr[t], indptr[t + 1])
+        self.postings = postings  # int32 chunk numbers, grouped by term
+        self.weights = weights  # float32 BM25 term-frequency weight per posting
+        self.texts = texts  # Chunk number -> passage text
+        self.documents = documents  # Chunk number -> document id
+
+
+class BM25Index:
+    """BM25 ranking over the chunks of a set of documents.
+
+    Documents are replaced or removed individually; chunks whose text did
+    not change keep their tokenization, so an update only tokenizes new
+    text before the postings arrays are rebuilt (a few vectorized passes).
+    Searches read an immutable snapshot and never wait for an update.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._vocabulary: Dict[str, int] = {}
+        self._documents: Dict[str, List[_Chunk]] = {}
+        self._lock = threading.Lock()  # Serializes writers
+        self._snapshot: Optional[_Snapshot] = None
+
+        # Statistics
+        self.chunks_tokenized = 0
+        self.chunks_reused = 0
+
+    def set_document(self, document_id: str, chunks: List[str], terms: Optional[PackedTerms] = None) -> int:
+        """Add or replace a document's chunks and rebuild the postings; returns how many chunks were reused.
+
+        ``terms`` optionally carries ``pack_terms(chunks)``, computed ahead of
+        time (e.g. in a worker process); otherwise new chunks are tokenized here.
+        """
+        with self._lock:
+            previous = {hashlib.sha1(chunk.text.encode("utf-8")).digest(): chunk
+                        for chunk in self._documents.get(document_id, [])}
+            tokenized = [previous.get(hashlib.sha1(text.encode("utf-8")).digest()) for text in chunks]
+            new = [i for i, chunk in enumerate(tokenized) if chunk is None]
+            if terms is None:
+                terms, positions = pack_terms([chunks[i] for i in new]), range(len(new))
+            else:
+                positions = new
+
+            # Map the chunks' local vocabulary onto the index's once, then slice per chunk
+            vocabulary_ids = np.fromiter((self._vocabulary.setdefault(word, len(self._vocabulary)) for word in terms.words),
+                                         dtype=np.int32, count=len(terms.words))
+            for i, position in zip(new, positions):
+                start, end = terms.offsets[position], terms.offsets[position + 1]
+                tokenized[i] = _Chunk(chunks[i], vocabulary_ids[terms.term_ids[start:end]], terms.counts[start:end],
+                                      int(terms.lengths[position]))
+
+            self.chunks_tokenized += len(new)
+            self.chunks_reused += len(chunks) - len(new)
+            self._documents[document_id] = tokenized
+            self._build()
+            return len(chunks) - len(new)
+
+    def remove_document(self, document_id: str) -> bool:
+        """Drop a document; returns whether it was indexed"""
+        with self._lock:
+            if self._documents.pop(document_id, None) is None:
+                return False
+            self._build()
+            return True
+
+    def _build(self):
+        chunks = [chunk for document in self._documents.values() for chunk in document]
+        if not chunks:
+            self._snapshot = None
+            return
+        documents = [document_id for document_id, document in self._documents.items() for _ in document]
+        lengths = np.array([chunk.length for chunk in chunks], dtype=np.float32)
+        sizes = [len(chunk.term_ids) for chunk in chunks]
+        term_ids = np.concatenate([chunk.term_ids for chunk in chunks])
+        counts = np.concatenate([chunk.term_counts for chunk in chunks])
+        chunk_numbers = np.repeat(np.arange(len(chunks), dtype=np.int32), sizes)
+
+        # Group postings by term (CSR layout)
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, counts, chunk_numbers = term_ids[order], counts[order], chunk_numbers[order]
+        document_frequency = np.bincount(term_ids, minlength=len(self._vocabulary))
+        indptr = np.zeros(len(document_frequency) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=indptr[1:])
+
+        n = len(chunks)
+        idf = np.log1p((n - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        average_length = max(float(lengths.mean()), 1.0)
+        norm = self.k1 * (1 - self.b + self.b * lengths[chunk_numbers] / average_length)
+        weights = (counts * (self.k1 + 1) / (counts + norm)).astype(np.float32)
+        self._snapshot = _Snapshot(idf, indptr, chunk_numbers, weights, [chunk.text for chunk in chunks], documents)
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[float, str, str]]:
+        """Top-k (score, passage, document_id) for the query, best first"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+        term_ids = {self._vocabulary.get(token) for token in tokenize(query)}
+        scores = np.zeros(len(snapshot.texts), dtype=np.float32)
+        for term_id in term_ids:
+            if term_id is None or term_id >= len(snapshot.idf):
+                continue  # Unknown, or added after this snapshot was built
+            start, end = snapshot.indptr[term_id], snapshot.indptr[term_id + 1]
+            scores[snapshot.postings[start:end]] += snapshot.idf[term_id] * snapshot.weights[start:end]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), snapshot.texts[i], snapshot.documents[i]) for i in top if scores[i] > 0]
+
+    @property
+    def chunk_count(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.texts) if snapshot else 0
+
+    def document_ids(self) -> List[str]:
+        return list(self._documents)
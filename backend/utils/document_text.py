@@ -0,0 +1,159 @@
+"""Plain text extraction for uploaded knowledge documents.
+
+Everything here is a pure function of the uploaded bytes so it can run in
+worker processes.
+"""
+import csv
+import io
+import json
+import re
+import unicodedata
+import zipfile
+from html.parser import HTMLParser
+from typing import List, Tuple
+from xml.etree import ElementTree
+from utils.bm25_index import PackedTerms, chunk_text, pack_terms
+
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".markdown", ".csv", ".json", ".html", ".htm", ".docx")
+
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKUP = re.compile(r"^\s{0,3}(?:#{1,6}\s+|>\s?|[-*+]\s+|\d+[.)]\s+)|[*_`~]+|^\s*(?:[-*_]\s*){3,}$", re.MULTILINE)
+CONTROL_CHARACTERS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+BLANK_LINES = re.compile(r"\n\s*\n\s*")
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedDocument(ValueError):
+    """The upload is not a document type we can extract text from"""
+
+
+def document_extension(filename: str) -> str:
+    """Lowercased extension of a supported document, or raise UnsupportedDocument"""
+    extension = "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise UnsupportedDocument(f"Unsupported document type '{extension or filename}' "
+                                  f"(supported: {', '.join(SUPPORTED_EXTENSIONS)})")
+    return extension
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+class _HTMLText(HTMLParser):
+    """Visible text of an HTML page, with block elements as paragraph breaks"""
+    BLOCKS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "table"}
+    HIDDEN = {"script", "style", "noscript", "head", "template"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self.hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.HIDDEN:
+            self.hidden += 1
+        elif tag in self.BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.HIDDEN:
+            self.hidden = max(self.hidden - 1, 0)
+        elif tag in self.BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if not self.hidden:
+            self.parts.append(data)
+
+
+def _html_text(data: bytes) -> str:
+    parser = _HTMLText()
+    parser.feed(_decode(data))
+    parser.close()
+    return "".join(parser.parts)
+
+
+def _markdown_text(data: bytes) -> str:
+    # Symbols would be read out loud, so keep only the words
+    text = MARKDOWN_LINK.sub(r"\1", _decode(data))
+    return MARKDOWN_MARKUP.sub("", text)
+
+
+def _csv_text(data: bytes) -> str:
+    """One paragraph per row, as "column: value" pairs"""
+    rows = list(csv.reader(io.StringIO(_decode(data))))
+    if not rows:
+        return ""
+    header, paragraphs = rows[0], []
+    for row in rows[1:]:
+        pairs = [f"{column}: {value}" for column, value in zip(header, row) if value.strip()]
+        paragraphs.append("; ".join(pairs) + ".")
+    return "\n\n".join(paragraphs)
+
+
+def _json_text(data: bytes) -> str:
+    """Every string or number value, labelled with its key path"""
+    lines = []
+
+    def walk(value, path):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(item, f"{path} {key}".strip())
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, path)
+        elif value is not None:
+            lines.append(f"{path}: {value}." if path else f"{value}.")
+
+    try:
+        walk(json.loads(_decode(data)), "")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    return "\n\n".join(lines)
+
+
+def _docx_text(data: bytes) -> str:
+    """Paragraph text of a Word document"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ValueError(f"Invalid Word document: {e}")
+    paragraphs = ("".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t"))
+                  for paragraph in root.iter(f"{WORD_NAMESPACE}p"))
+    return "\n\n".join(paragraphs)
+
+
+EXTRACTORS = {
+    ".txt": _decode,
+    ".md": _markdown_text,
+    ".markdown": _markdown_text,
+    ".csv": _csv_text,
+    ".json": _json_text,
+    ".html": _html_text,
+    ".htm": _html_text,
+    ".docx": _docx_text,
+}
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalized text with single spaces and blank-line paragraph breaks"""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = CONTROL_CHARACTERS.sub(" ", text)
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def extract_text(data: bytes, filename: str) -> str:
+    """Normalized plain text of an uploaded document"""
+    return normalize_text(EXTRACTORS[document_extension(filename)](data))
+
+
+def prepare_document(data: bytes, filename: str, chunk_chars: int) -> Tuple[List[str], PackedTerms]:
+    """Extract, chunk and tokenize a document: its passages and their terms"""
+    chunks = chunk_text(extract_text(data, filename), chunk_chars)
+    return chunks, pack_terms(chunks)
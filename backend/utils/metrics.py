@@ -0,0 +1,44 @@
+"""Lightweight in-process latency metrics"""
+import bisect
+from typing import Sequence
+
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (bucket bounds in milliseconds)"""
+
+    def __init__(self, name: str, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        """Record one observation given in seconds"""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> float:
+        """Upper bucket bound containing the p-th percentile (max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets_ms, self.counts):
+            seen += count
+            if seen >= target:
+                return float(bound)
+        return self.max_ms
+
+    def summary(self) -> str:
+        """One-line summary for logs"""
+        if not self.count:
+            return f"{self.name}: no samples"
+        return (f"{self.name}: n={self.count} mean={self.total_ms / self.count:.0f}ms "
+                f"p50≤{self.percentile(50):.0f}ms p95≤{self.percentile(95):.0f}ms max={self.max_ms:.0f}ms")
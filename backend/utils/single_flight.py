@@ -0,0 +1,115 @@
+"""Coalesce concurrent identical requests into one in-flight operation"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _SharedStream:
+    """One producer task feeding any number of subscribers.
+
+    Subscribers replay every chunk from the start, so joining late still
+    yields the complete stream. The producer keeps running when a
+    subscriber leaves and is only cancelled once nobody is listening.
+    """
+
+    def __init__(self, make_iterator: Callable[[], AsyncIterator[bytes]]):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.abandoned = False  # Producer cancelled because every subscriber left
+        self._waiter = asyncio.get_running_loop().create_future()
+        self.task = asyncio.create_task(self._produce(make_iterator))
+
+    async def _produce(self, make_iterator: Callable[[], AsyncIterator[bytes]]):
+        try:
+            async for chunk in make_iterator():
+                self.chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self):
+        """Wake every subscriber waiting for the next chunk"""
+        waiter, self._waiter = self._waiter, asyncio.get_running_loop().create_future()
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                waiter = self._waiter
+                while index < len(self.chunks):
+                    yield self.chunks[index]
+                    index += 1
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await waiter
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self.abandoned = True
+                self.task.cancel()
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution.
+
+    The first caller for a key starts the operation; callers arriving
+    while it is in flight await the same result instead of starting their
+    own. Once it finishes the key is forgotten, so later calls run again
+    (pair this with a cache to serve repeats).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+
+        # Statistics
+        self.executions = 0  # Operations actually started
+        self.coalesced = 0  # Callers that joined an in-flight operation
+
+    async def do(self, key: str, make_coroutine: Callable[[], Awaitable[T]]) -> T:
+        """Run make_coroutine() once for all concurrent callers with this key"""
+        task = self._calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(make_coroutine())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(self._calls, key, task))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the operation for the others
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, make_iterator: Callable[[], AsyncIterator[bytes]]) -> AsyncIterator[bytes]:
+        """Subscribe to the in-flight stream for this key, starting it if needed"""
+        shared = self._streams.get(key)
+        if shared is None or shared.abandoned:
+            self.executions += 1
+            shared = _SharedStream(make_iterator)
+            self._streams[key] = shared
+            shared.task.add_done_callback(lambda _: self._forget(self._streams, key, shared))
+        else:
+            self.coalesced += 1
+        return shared.subscribe()
+
+    @staticmethod
+    def _forget(entries: dict, key: str, entry):
+        """Drop a finished entry unless a newer one already replaced it"""
+        if entries.get(key) is entry:
+            del entries[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._streams)
@@ -0,0 +1,100 @@
+"""Incremental sentence/clause segmentation of streamed LLM text for TTS"""
+import re
+from typing import List, Optional
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+SENTENCE_END = re.compile(r'[.!?]+["\'”’)\]]*\s+')
+# Clause end: comma, semicolon, colon or dash followed by whitespace
+CLAUSE_END = re.compile(r'[,;:—–]\s+')
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "st", "vs", "jr", "sr", "e.g", "i.e", "no"}
+
+
+class SentenceSegmenter:
+    """Splits a token stream into speakable segments as soon as they are complete.
+
+    The first segment may be a short clause so audio can start early; after
+    that, sentences shorter than ``min_chars`` are merged with the next one
+    to avoid tiny TTS requests, and run-on sentences are split at a clause
+    (or word) boundary once they exceed ``max_chars``.
+    """
+
+    def __init__(self, first_clause_min_chars: int = 20, min_chars: int = 40, max_chars: int = 250):
+        self.first_clause_min_chars = first_clause_min_chars
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.segments_emitted = 0
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any segments that are now complete"""
+        self._buffer += text
+        segments = []
+        while True:
+            segment = self._next_segment()
+            if segment is None:
+                return segments
+            segments.append(segment)
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream has ended"""
+        segment = self._buffer.strip()
+        self._buffer = ""
+        if not segment or segment == ".":
+            return None
+        self.segments_emitted += 1
+        return segment
+
+    def _next_segment(self) -> Optional[str]:
+        buffer = self._buffer
+        first = self.segments_emitted == 0
+        cut = None
+
+        # Sentence boundary - any length for the first segment, merged up to min_chars after
+        min_length = 0 if first else self.min_chars
+        for match in SENTENCE_END.finditer(buffer):
+            if self._is_abbreviation(buffer, match.start()):
+                continue
+            if match.start() + 1 >= min_length:
+                cut = match.end()
+                break
+
+        # The first segment may stop at a clause once it is long enough to sound natural
+        if cut is None and first:
+            for match in CLAUSE_END.finditer(buffer):
+                if match.start() + 1 >= self.first_clause_min_chars:
+                    cut = match.end()
+                    break
+
+        # Run-on text: split at the last sentence, clause, or word before max_chars
+        if cut is None and len(buffer) > self.max_chars:
+            window = buffer[:self.max_chars]
+            sentences = [match for match in SENTENCE_END.finditer(window)
+                         if not self._is_abbreviation(window, match.start())]
+            clauses = list(CLAUSE_END.finditer(window))
+            if sentences:
+                cut = sentences[-1].end()
+            elif clauses:
+                cut = clauses[-1].end()
+            else:
+                space = window.rfind(" ")
+                cut = space + 1 if space > 0 else self.max_chars
+
+        if cut is None:
+            return None
+        segment = buffer[:cut].strip()
+        self._buffer = buffer[cut:]
+        if not segment:
+            return self._next_segment()
+        self.segments_emitted += 1
+        return segment
+
+    @staticmethod
+    def _is_abbreviation(buffer: str, period_index: int) -> bool:
+        """Whether the punctuation at period_index follows a known abbreviation"""
+        if buffer[period_index] != ".":
+            return False
+        start = period_index
+        while start > 0 and (buffer[start - 1].isalpha() or buffer[start - 1] == "."):
+            start -= 1
+        return buffer[start:period_index].lower() in ABBREVIATIONS
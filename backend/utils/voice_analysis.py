@@ -0,0 +1,105 @@
+"""Spectral voice-likeness analysis for fixed-size PCM frames"""
+import numpy as np
+
+
+def _band(freqs: np.ndarray, mask: np.ndarray) -> slice:
+    """Convert a boolean frequency mask into the equivalent contiguous slice"""
+    indices = np.flatnonzero(mask)
+    if len(indices) == 0:
+        return slice(0, 0)
+    assert indices[-1] - indices[0] + 1 == len(indices), "Frequency band is not contiguous"
+    return slice(int(indices[0]), int(indices[-1]) + 1)
+
+
+class VoiceAnalyzer:
+    """Precomputed analysis kernel for one frame size and sample rate.
+
+    The frequency vector and band slices are computed once, and the float
+    scratch arrays are preallocated and reused between calls, so analysing a
+    batch only costs the FFT and a handful of in-place reductions.
+    """
+
+    def __init__(self, frame_samples: int, sample_rate: int, max_frames: int = 32):
+        self.frame_samples = frame_samples
+        self.sample_rate = sample_rate
+
+        # Frequency vector and voice frequency bands (rfftfreq is sorted, so every band is a slice)
+        self.freqs = np.fft.rfftfreq(frame_samples, 1 / sample_rate)
+        freqs = self.freqs
+        self.fundamental_band = _band(freqs, (freqs >= 85) & (freqs <= 255))  # 85-255Hz adult voices
+        self.formant1_band = _band(freqs, (freqs >= 300) & (freqs <= 900))  # First formant
+        self.formant2_band = _band(freqs, (freqs >= 900) & (freqs <= 2500))  # Second formant
+        self.formant3_band = _band(freqs, (freqs >= 2500) & (freqs <= 3400))  # Higher formants
+        self.high_band = _band(freqs, freqs > 3400)  # Clicking, banging
+        self.low_band = _band(freqs, freqs < 85)  # Rumbling, thumps
+
+        self._allocate(max_frames)
+
+    def _allocate(self, max_frames: int):
+        """Preallocate scratch arrays for up to max_frames frames"""
+        self.max_frames = max_frames
+        self._audio = np.empty((max_frames, self.frame_samples), dtype=np.float32)
+        self._scratch = np.empty((max_frames, self.frame_samples), dtype=np.float32)
+        self._crossings = np.empty((max_frames, self.frame_samples - 1), dtype=bool)
+        self._magnitude = np.empty((max_frames, len(self.freqs)), dtype=np.float32)
+        self._weighted = np.empty((max_frames, len(self.freqs)), dtype=np.float64)
+
+    def voice_like(self, samples: np.ndarray) -> np.ndarray:
+        """Return one voice-likeness decision per row of a (frames x samples) int16 array"""
+        count = samples.shape[0]
+        if count > self.max_frames:
+            self._allocate(count)
+        audio = self._audio[:count]
+        scratch = self._scratch[:count]
+        crossings = self._crossings[:count]
+        magnitude = self._magnitude[:count]
+        weighted = self._weighted[:count]
+        np.copyto(audio, samples, casting="unsafe")
+
+        # 1. Energy checks - voice should have moderate energy levels
+        np.multiply(audio, audio, out=scratch)
+        energy = scratch.mean(axis=1)
+        # Increased minimum threshold to filter out quiet background noise, upper bound is too loud for normal voice
+        is_voice = (energy >= 500) & (energy <= 50000000)
+
+        # 2. Check for reasonable amplitude range (voice is usually not clipping)
+        np.abs(audio, out=scratch)
+        is_voice &= scratch.max(axis=1) <= 28000  # Close to clipping, likely not voice
+
+        # 3. Zero-crossing rate - voice has moderate ZCR, not too high (like fricatives) or too low (like tones)
+        np.sign(audio, out=scratch)
+        np.not_equal(scratch[:, 1:], scratch[:, :-1], out=crossings)
+        zcr = np.count_nonzero(crossings, axis=1) / self.frame_samples
+        is_voice &= (zcr >= 0.02) & (zcr <= 0.4)  # Voice typically has ZCR between 0.02-0.4
+
+        # 4. Frequency analysis using FFT
+        np.abs(np.fft.rfft(audio, axis=1), out=magnitude)
+
+        fundamental = magnitude[:, self.fundamental_band].sum(axis=1)
+        formant1 = magnitude[:, self.formant1_band].sum(axis=1)
+        formant2 = magnitude[:, self.formant2_band].sum(axis=1)
+        formant3 = magnitude[:, self.formant3_band].sum(axis=1)
+        high_freq_energy = magnitude[:, self.high_band].sum(axis=1)
+        low_freq_energy = magnitude[:, self.low_band].sum(axis=1)
+        total_energy = magnitude.sum(axis=1)
+        is_voice &= total_energy != 0
+
+        # 5. Spectral centroid - voice typically has centroid in mid-range
+        np.multiply(magnitude, self.freqs, out=weighted)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            voice_ratio = (fundamental + formant1 + formant2 + formant3) / total_energy
+            high_freq_ratio = high_freq_energy / total_energy
+            low_freq_ratio = low_freq_energy / total_energy
+            spectral_centroid = weighted.sum(axis=1) / total_energy
+
+        # Voice characteristics:
+        # - At least 40% energy in voice frequencies (increased from 30%)
+        # - Less than 40% energy in high frequencies (reduced from 60%)
+        # - Less than 30% energy in very low frequencies
+        # - Spectral centroid between 500-2500 Hz
+        is_voice &= ((voice_ratio > 0.4) &
+                     (high_freq_ratio < 0.4) &
+                     (low_freq_ratio < 0.3) &
+                     (500 < spectral_centroid) & (spectral_centroid < 2500))
+        return is_voice
@@ -3,10 +3,12 @@ export class AudioPlayer {
   private audioContext: AudioContext | null = null;
   private isUnlocked = false;
   private activeSources: Set<AudioBufferSourceNode> = new Set();
-  private onComplete: (() => void) | null = null;
-  private playbackQueue: Array<{ url: string; text: string }> = [];
+  private sourceControls: Map<AudioBufferSourceNode, { kind: string; gain: GainNode }> = new Map();
+  private onComplete: ((kind: string) => void) | null = null;
+  private playbackQueue: Array<{ url: string; text: string; kind: string }> = [];
   private isProcessingQueue = false;
   private currentGeneration = 0; // Track generation to ignore old audio
+  private lastKind = "response"; // Kind of the last clip played, reported on completion
 
   constructor() {
     console.log("AudioPlayer constructor called");
@@ -42,9 +44,28 @@ export class AudioPlayer {
       }
     }
     this.activeSources.clear();
+    this.sourceControls.clear();
   }
 
-  async addToQueue(url: string, text: string) {
+  // Fade out playing audio of one kind (e.g. a filler clip) and drop any still queued
+  stopKind(kind: string, fadeSeconds = 0.08) {
+    this.playbackQueue = this.playbackQueue.filter((item) => item.kind !== kind);
+    if (!this.audioContext) return;
+    const endTime = this.audioContext.currentTime + fadeSeconds;
+    for (const [source, control] of this.sourceControls) {
+      if (control.kind !== kind) continue;
+      console.log(`[AudioPlayer] Fading out ${kind} audio`);
+      try {
+        control.gain.gain.setValueAtTime(control.gain.gain.value, this.audioContext.currentTime);
+        control.gain.gain.linearRampToValueAtTime(0, endTime);
+        source.stop(endTime);
+      } catch (e) {
+        // Source might have already ended
+      }
+    }
+  }
+
+  async addToQueue(url: string, text: string, kind = "response") {
     const generation = this.currentGeneration;
     console.log(
       `[AudioPlayer] Adding to queue - Generation: ${generation}, URL: ${url}`
@@ -55,7 +76,7 @@ export class AudioPlayer {
       this.unlock();
     }
 
-    this.playbackQueue.push({ url, text });
+    this.playbackQueue.push({ url, text, kind });
 
     // Process queue if not already processing
     if (!this.isProcessingQueue && this.isUnlocked) {
@@ -83,7 +104,7 @@ export class AudioPlayer {
       const item = this.playbackQueue.shift()!;
 
       try {
-        await this.playAudio(item.url, item.text, generation);
+        await this.playAudio(item.url, item.text, item.kind, generation);
       } catch (error) {
         console.error("[AudioPlayer] Error playing audio:", error);
         // Continue with next item on error
@@ -100,7 +121,7 @@ export class AudioPlayer {
     ) {
       console.log("[AudioPlayer] All audio finished for current generation");
       if (this.onComplete) {
-        this.onComplete();
+        this.onComplete(this.lastKind);
       }
     }
   }
@@ -108,6 +129,7 @@ export class AudioPlayer {
   private async playAudio(
     url: string,
     text: string,
+    kind: string,
     generation: number
   ): Promise<void> {
     // Double-check generation before playing
@@ -160,16 +182,22 @@ export class AudioPlayer {
 
       const source = this.audioContext.createBufferSource();
       source.buffer = audioBuffer;
-      source.connect(this.audioContext.destination);
+      // Route through a gain node so the clip can be faded out early
+      const gain = this.audioContext.createGain();
+      source.connect(gain);
+      gain.connect(this.audioContext.destination);
 
       // Track this source
       this.activeSources.add(source);
+      this.sourceControls.set(source, { kind, gain });
+      this.lastKind = kind;
 
       // Create a promise that resolves when playback ends
       return new Promise<void>((resolve) => {
         source.onended = () => {
           console.log("[AudioPlayer] Audio chunk finished");
           this.activeSources.delete(source);
+          this.sourceControls.delete(source);
           resolve();
         };
 
@@ -181,7 +209,7 @@ export class AudioPlayer {
     }
   }
 
-  setOnComplete(callback: () => void) {
+  setOnComplete(callback: (kind: string) => void) {
     this.onComplete = callback;
   }
 
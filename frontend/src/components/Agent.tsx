@@ -65,8 +65,8 @@ function Agent({ agentId, onBack }: AgentProps) {
 
     // Initialize audio player
     audioPlayerRef.current = new AudioPlayer();
-    audioPlayerRef.current.setOnComplete(() => {
-      console.log("[FRONTEND] All audio finished playing");
+    audioPlayerRef.current.setOnComplete((kind) => {
+      console.log("[FRONTEND] All audio finished playing, last:", kind);
       setIsProcessing(false);
       isProcessingRef.current = false;
       setIsAgentSpeaking(false);
@@ -74,8 +74,10 @@ function Agent({ agentId, onBack }: AgentProps) {
       
       // Notify backend that audio playback is complete
       if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+        // A filler clip finishing before its response does not end the agent's turn
         wsRef.current.send(JSON.stringify({
-          type: "audio_playback_complete"
+          type: "audio_playback_complete",
+          kind
         }));
       }
     });
@@ -139,6 +141,8 @@ function Agent({ agentId, onBack }: AgentProps) {
     };
 
     wsRef.current.onmessage = async (event) => {
+      // Audio arrives as URLs in JSON messages; this client never enables binary audio frames
+      if (typeof event.data !== "string") return;
       const data = JSON.parse(event.data);
 
       switch (data.type) {
@@ -154,7 +158,7 @@ function Agent({ agentId, onBack }: AgentProps) {
           // Play greeting audio
           if (audioPlayerRef.current) {
             const audioUrl = `${API_URL}${data.audio_url}`;
-            audioPlayerRef.current.addToQueue(audioUrl, data.text || "");
+            audioPlayerRef.current.addToQueue(audioUrl, data.text || "", "greeting");
           }
           break;
 
@@ -238,11 +242,19 @@ function Agent({ agentId, onBack }: AgentProps) {
           console.log("[FRONTEND] Received audio_chunk:", audioUrl, "text:", data.text);
           
           if (audioPlayerRef.current) {
-            audioPlayerRef.current.addToQueue(audioUrl, data.text);
+            audioPlayerRef.current.addToQueue(audioUrl, data.text, data.kind || "response");
             console.log("[FRONTEND] Added audio to queue");
           }
           break;
         }
+
+        case "filler_stop":
+          // Response audio is arriving - cut the latency-masking clip short
+          console.log("[FRONTEND] Received filler_stop");
+          if (audioPlayerRef.current) {
+            audioPlayerRef.current.stopKind("filler");
+          }
+          break;
           
         case "stream_complete":
           console.log("[FRONTEND] Received stream_complete:", data.full_text);